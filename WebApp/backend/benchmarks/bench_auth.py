@@ -0,0 +1,42 @@
+"""
+Micro-benchmark of JWT authentication: full verification on every request
+versus the in-process verified-token cache used by @require_auth.
+
+Usage (from WebApp/backend):
+    python -m benchmarks.bench_auth [--iterations 20000]
+"""
+import argparse
+import timeit
+from unittest.mock import patch
+
+from commonUtil.auth import generate_jwt, validate_jwt, validate_jwt_cached, clear_jwt_cache, require_auth
+
+SECRET = "benchmark-secret-K8pEr3Vx7Qz9JyB2sT5nM4cF"
+
+
+def run(iterations):
+    token = generate_jwt({"user_id": "b613bb6c-77e8-439d-890c-f9203f6bc70a", "username": "bench"}, SECRET)
+    event = {"headers": {"Authorization": f"Bearer {token}"}}
+
+    @require_auth
+    def handler(event, context):
+        return None
+
+    clear_jwt_cache()
+    results = {
+        "validate_jwt (uncached)": timeit.timeit(lambda: validate_jwt(token, SECRET), number=iterations),
+        "validate_jwt_cached (warm)": timeit.timeit(lambda: validate_jwt_cached(token, SECRET), number=iterations),
+    }
+    with patch("commonUtil.auth.config.JWT_SECRET", SECRET):
+        results["@require_auth (warm)"] = timeit.timeit(lambda: handler(event, None), number=iterations)
+
+    baseline = results["validate_jwt (uncached)"]
+    print(f"{'path':<30}{'us/call':>10}{'speedup':>10}")
+    for name, total in results.items():
+        print(f"{name:<30}{total / iterations * 1e6:>10.2f}{baseline / total:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    run(parser.parse_args().iterations)
@@ -0,0 +1,73 @@
+"""
+Benchmark POST /tasks/batch against the equivalent N single-task calls.
+Both paths run the real handlers in-process against the database configured
+through DB_* (see tables.sh for a local Postgres in Docker).
+
+Usage (from WebApp/backend):
+    python -m benchmarks.bench_batch_tasks [--sizes 10 100 1000]
+"""
+import argparse
+import json
+import time
+
+from benchmarks.events import ensure_user, make_event, make_token
+from handlers.tasks import batch_tasks, create_task, delete_task, update_task
+
+DUE_DATE = "2099-01-01"
+
+
+def run_single(token, n):
+    """N creates, N updates and N deletes through the single-task handlers."""
+    start = time.perf_counter()
+    task_ids = []
+    for i in range(n):
+        response = create_task.lambda_handler(make_event(
+            "POST", "/task-management/tasks", token, body={"description": f"Task {i}", "due_date": DUE_DATE}
+        ), None)
+        task_ids.append(json.loads(response["body"])["task"]["task_id"])
+    for task_id in task_ids:
+        update_task.lambda_handler(make_event(
+            "PUT", "/task-management/tasks/{task_id}", token,
+            body={"status": "completed"}, path_parameters={"task_id": task_id},
+        ), None)
+    for task_id in task_ids:
+        delete_task.lambda_handler(make_event(
+            "DELETE", "/task-management/tasks/{task_id}", token, path_parameters={"task_id": task_id}
+        ), None)
+    return time.perf_counter() - start
+
+
+def run_batch(token, n):
+    """The same N creates, updates and deletes as three batch calls."""
+    start = time.perf_counter()
+    response = batch_tasks.lambda_handler(make_event(
+        "POST", "/task-management/tasks/batch", token,
+        body={"operations": [{"op": "create", "description": f"Task {i}", "due_date": DUE_DATE} for i in range(n)]},
+    ), None)
+    task_ids = [result["task"]["task_id"] for result in json.loads(response["body"])["results"]]
+    for operations in (
+        [{"op": "update", "task_id": task_id, "status": "completed"} for task_id in task_ids],
+        [{"op": "delete", "task_id": task_id} for task_id in task_ids],
+    ):
+        batch_tasks.lambda_handler(make_event(
+            "POST", "/task-management/tasks/batch", token, body={"operations": operations}
+        ), None)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    ensure_user()
+    token = make_token()
+    print(f"{'tasks':>8}{'single (s)':>14}{'batch (s)':>12}{'speedup':>10}")
+    for n in args.sizes:
+        single = run_single(token, n)
+        batch = run_batch(token, n)
+        print(f"{n:>8}{single:>14.3f}{batch:>12.3f}{single / batch:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
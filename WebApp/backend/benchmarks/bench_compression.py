@@ -0,0 +1,56 @@
+"""
+Size and CPU trade-off of response compression for typical GET /tasks
+pages: gzip levels and brotli qualities on the serialized body, against
+the identity response. Sizes are what goes over the wire (after API
+Gateway decodes the base64 body); times are per response on this machine.
+
+Usage (from WebApp/backend):
+    python -m benchmarks.bench_compression [--pages 20 100 500 2000]
+"""
+import argparse
+import timeit
+import zlib
+
+from benchmarks.bench_serialization import make_rows
+from commonUtil import compression
+from commonUtil.serialization import Rows, dumps
+from commonUtil.task_repository import TaskRepository
+
+GZIP_LEVELS = [1, 4, 6, 9]
+BROTLI_QUALITIES = [1, 4, 5, 11]
+
+
+def gzip_compress(data, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def measure(compress_fn, data):
+    number = max(1, int(2000000 / len(data)))
+    seconds = min(timeit.repeat(lambda: compress_fn(data), number=number, repeat=5)) / number
+    return len(compress_fn(data)), seconds
+
+
+def run(pages):
+    codecs = [(f"gzip -{level}", lambda data, level=level: gzip_compress(data, level)) for level in GZIP_LEVELS]
+    if compression.brotli is not None:
+        codecs += [
+            (f"br q{quality}", lambda data, quality=quality: compression.brotli.compress(data, quality=quality))
+            for quality in BROTLI_QUALITIES
+        ]
+    else:
+        print("brotli not installed; gzip only")
+
+    for n in pages:
+        body = dumps({"tasks": Rows(TaskRepository.TASK_FIELDS, make_rows(n)), "next_cursor": None}).encode("utf-8")
+        print(f"\n{n} tasks, identity {len(body)} bytes")
+        print(f"{'codec':<10}{'bytes':>10}{'ratio':>8}{'ms':>9}{'MB/s':>9}")
+        for name, compress_fn in codecs:
+            size, seconds = measure(compress_fn, body)
+            print(f"{name:<10}{size:>10}{size / len(body):>8.3f}{seconds * 1000:>9.3f}{len(body) / seconds / 1e6:>9.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[20, 100, 500, 2000])
+    run(parser.parse_args().pages)
@@ -0,0 +1,103 @@
+"""
+Peak memory of exporting every task of a user by task count: one fetchall()
+and one JSON document (what a full export through GET /tasks amounts to)
+versus POST /tasks/export streaming from a server-side cursor into a
+multipart upload. Seeds the benchmark user with each --tasks count in the
+database configured through DB_* (see tables.sh). Each (path, count) runs
+in a fresh subprocess whose peak RSS (VmHWM) is reset just before the
+export. S3 is replaced by a client that discards what it receives. Linux
+only.
+
+Usage (from WebApp/backend):
+    python -m benchmarks.bench_export_memory [--tasks 10000 100000 1000000] [--format ndjson]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from benchmarks.bench_upload_memory import NullS3Client, peak_rss_kib, reset_peak_rss
+from benchmarks.events import BENCH_USER_ID, ensure_user
+
+TASK_COUNTS = [10000, 100000, 1000000]
+
+SEED_SQL = """
+    INSERT INTO tasks (task_id, user_id, description, due_date, status, created_at)
+    SELECT gen_random_uuid(), %(user_id)s, 'Exported task number ' || i, CURRENT_DATE + i %% 365,
+           (ARRAY['pending', 'in_progress', 'completed', 'overdue'])[i %% 4 + 1],
+           now() - i * interval '1 second'
+    FROM generate_series(1, %(count)s) i
+"""
+
+
+def seed(count):
+    from commonUtil.db import get_cursor
+
+    ensure_user()
+    with get_cursor() as cursor:
+        cursor.execute(SEED_SQL, {"user_id": BENCH_USER_ID, "count": count})
+        cursor.execute("ANALYZE tasks")
+        cursor.connection.commit()
+
+
+def fetchall_export():
+    """Every row in one fetchall, one serialized document, one put_object."""
+    from commonUtil.db import get_cursor
+    from commonUtil.serialization import Rows, dumps
+    from commonUtil.task_repository import TaskRepository
+
+    with get_cursor() as cursor:
+        cursor.execute(TaskRepository.EXPORT_TASKS_SQL, (BENCH_USER_ID,))
+        body = dumps({"tasks": Rows(TaskRepository.TASK_FIELDS, cursor.fetchall())}).encode("utf-8")
+    NullS3Client().put_object(Bucket="bench", Key="bench.json", Body=body, ContentType="application/json")
+
+
+def child(path, export_format):
+    from benchmarks.events import make_event, make_token
+    from commonUtil import s3
+    from handlers.tasks import export_tasks
+
+    event = make_event("POST", "/task-management/tasks/export", make_token(), query={"format": export_format})
+    s3._s3_client = NullS3Client()
+    reset_peak_rss()
+    baseline_rss = peak_rss_kib()
+    tracemalloc.start()
+    start = time.perf_counter()
+    if path == "fetchall":
+        fetchall_export()
+    else:
+        response = export_tasks.lambda_handler(event, None)
+        assert response["statusCode"] == 200, response
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(json.dumps({
+        "seconds": elapsed, "peak_alloc_mb": peak / 2**20, "rss_growth_mb": (peak_rss_kib() - baseline_rss) / 1024,
+    }))
+
+
+def run(counts, export_format):
+    print(f"{'tasks':>9}{'path':>10}{'seconds':>9}{'peak alloc MiB':>16}{'RSS growth MiB':>16}")
+    for count in counts:
+        seed(count)
+        for path in ("fetchall", "export"):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_export_memory", "--child", path, export_format],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{count:>9}{path:>10}{result['seconds']:>9.2f}{result['peak_alloc_mb']:>16.1f}{result['rss_growth_mb']:>16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, nargs="+", default=TASK_COUNTS)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--child", nargs=2, metavar=("PATH", "FORMAT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child[0], args.child[1])
+    else:
+        run(args.tasks, args.format)
@@ -0,0 +1,204 @@
+"""
+Hash-partitioned tasks against the plain table at scale. Builds two copies
+of the tasks schema side by side in the database configured through DB_*
+(see tables.sh): bench_tasks_plain, keyed on task_id like tasks, and
+bench_tasks_hash, PARTITION BY HASH (user_id) into --partitions partitions
+as migrations/partition_tasks.py builds it. Both get the same --users x
+--tasks-per-user rows and the indexes of tasks, then:
+
+  * each hot query of TaskRepository runs --iterations times as a prepared
+    statement for random users, reporting mean latency, planning time and
+    how many partitions the plan reads;
+  * --churn of the rows are updated and each table is vacuumed, reporting
+    the vacuum time and the largest unit autovacuum has to process.
+
+The benchmark tables are dropped at the end.
+
+Usage (from WebApp/backend):
+    python -m benchmarks.bench_partitioning [--users 20000] [--tasks-per-user 100]
+        [--partitions 16] [--iterations 500] [--churn 0.05]
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import random
+import re
+import time
+import uuid
+
+from benchmarks.check_plans import scanned
+from commonUtil.db import execute_prepared, get_cursor
+from commonUtil.task_repository import TaskRepository
+
+PLAIN = "bench_tasks_plain"
+HASHED = "bench_tasks_hash"
+SAMPLE_TASKS = 2000
+
+CREATE_TABLE_SQL = """
+    CREATE TABLE {table} (
+        LIKE tasks INCLUDING DEFAULTS INCLUDING GENERATED,
+        PRIMARY KEY {key}
+    ){partition_by}
+"""
+CREATE_PARTITION_SQL = "CREATE TABLE {table}_p{remainder} PARTITION OF {table} FOR VALUES WITH (MODULUS {modulus}, REMAINDER {remainder})"
+# The indexes of tasks after tables.sh and the numbered migrations in migrations/
+INDEXES = [
+    "(user_id, created_at, task_id)",
+    "(user_id, status, created_at, task_id)",
+    "(user_id, due_date, task_id)",
+    "(due_date, task_id) WHERE status IN ('pending', 'in_progress')",
+    "USING GIN (user_id, search_vector)",
+]
+SEED_SQL = """
+    INSERT INTO {table} (task_id, user_id, description, due_date, status, created_at)
+    SELECT gen_random_uuid(),
+           md5('bench-partition-user-' || (i %% %(users)s))::uuid,
+           (ARRAY['weekly report', 'pay invoice', 'review budget', 'call client', 'book dentist'])[i %% 5 + 1] || ' ' || i,
+           CURRENT_DATE + (i %% 1000) - 500,
+           (ARRAY['pending', 'in_progress', 'completed', 'overdue'])[i %% 4 + 1],
+           now() - i * interval '1 second'
+    FROM generate_series(1, %(users)s * %(tasks_per_user)s) i
+"""
+COPY_SQL = "INSERT INTO {target} (task_id, user_id, description, due_date, status, created_at) SELECT task_id, user_id, description, due_date, status, created_at FROM {source}"
+SAMPLE_SQL = "SELECT user_id, task_id FROM {table} TABLESAMPLE SYSTEM (1) LIMIT %s"
+# Status changes touch indexed columns, so every row leaves dead index entries behind as real edits do
+CHURN_SQL = """
+    UPDATE {table}
+    SET status = CASE status WHEN 'pending' THEN 'in_progress' ELSE 'pending' END, updated_at = CURRENT_TIMESTAMP
+    WHERE (hashtext(task_id::text) & 1023) < %s
+"""
+SIZE_SQL = "SELECT COALESCE(SUM(pg_total_relation_size(relid)), 0), COALESCE(MAX(pg_total_relation_size(relid)), 0) FROM pg_partition_tree(%s)"
+
+
+def user_id(i):
+    """The user_id SEED_SQL gives user ``i``."""
+    return str(uuid.UUID(hashlib.md5(f"bench-partition-user-{i}".encode()).hexdigest()))
+
+
+def on_table(sql, table):
+    """A TaskRepository statement run against ``table`` instead of tasks."""
+    return re.sub(r"\btasks\b", table, sql)
+
+
+def hot_queries(rng, users, sample):
+    """(name, sql, params factory) of the statements the handlers run most."""
+    page = TaskRepository.LIST_TASKS_SQL + " ORDER BY created_at, task_id LIMIT %s"
+    status_page = TaskRepository.LIST_TASKS_SQL + " AND status = %s ORDER BY created_at, task_id LIMIT %s"
+    search = TaskRepository.SEARCH_TASKS_SQL.format(filters="") + " ORDER BY rank DESC, task_id LIMIT %s"
+    # Deletes are rolled back after each run, so the sample can be reused
+    deletes = itertools.cycle(rng.sample(sample, len(sample)))
+    return [
+        ("tasks page", page, lambda: (user_id(rng.randrange(users)), 51)),
+        ("status page", status_page, lambda: (user_id(rng.randrange(users)), "pending", 51)),
+        ("search", search, lambda: (TaskRepository.prefix_query("weekly rep"), user_id(rng.randrange(users)), 21)),
+        ("update own task", TaskRepository.UPDATE_TASK_SQL,
+         lambda: (None, None, "completed", *reversed(rng.choice(sample)))),
+        ("delete own task", TaskRepository.DELETE_TASK_SQL, lambda: tuple(reversed(next(deletes)))),
+        ("overdue chunk", TaskRepository.MARK_OVERDUE_SQL.format(after=""), lambda: (time.strftime("%Y-%m-%d"), 1000)),
+    ]
+
+
+def create_tables(cursor, users, tasks_per_user, partitions):
+    cursor.execute(CREATE_TABLE_SQL.format(table=PLAIN, key="(task_id)", partition_by=""))
+    cursor.execute(CREATE_TABLE_SQL.format(table=HASHED, key="(user_id, task_id)", partition_by=" PARTITION BY HASH (user_id)"))
+    for remainder in range(partitions):
+        cursor.execute(CREATE_PARTITION_SQL.format(table=HASHED, modulus=partitions, remainder=remainder))
+    cursor.execute(SEED_SQL.format(table=PLAIN), {"users": users, "tasks_per_user": tasks_per_user})
+    cursor.execute(COPY_SQL.format(target=HASHED, source=PLAIN))
+    for table in (PLAIN, HASHED):
+        for i, index in enumerate(INDEXES):
+            using = "" if index.startswith("USING") else "USING btree "
+            cursor.execute(f"CREATE INDEX {table}_idx{i} ON {table} {using}{index}")
+        cursor.execute(f"ANALYZE {table}")
+
+
+def drop_tables(cursor):
+    cursor.execute(f"DROP TABLE IF EXISTS {PLAIN}, {HASHED}")
+
+
+def explain(cursor, sql, params):
+    """Planning ms and the relations the plan reads."""
+    cursor.execute("EXPLAIN (ANALYZE, SUMMARY, FORMAT JSON) " + sql, params)
+    plan = cursor.fetchone()[0]
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+    return plan[0]["Planning Time"], {relation for _, relation in scanned(plan[0]["Plan"])}
+
+
+def measure(cursor, sql, params, iterations):
+    """Mean seconds per prepared execution; writes are rolled back afterwards."""
+    # Postgres switches to a cached generic plan after five custom-planned executions
+    for _ in range(6):
+        execute_prepared(cursor, sql, params())
+    start = time.perf_counter()
+    for _ in range(iterations):
+        execute_prepared(cursor, sql, params())
+        if cursor.description:
+            cursor.fetchall()
+    elapsed = (time.perf_counter() - start) / iterations
+    cursor.connection.rollback()
+    return elapsed
+
+
+def churn_and_vacuum(table, share):
+    """Update ``share`` of the rows, then VACUUM; returns (vacuum seconds, total bytes, largest unit bytes)."""
+    with get_cursor() as cursor:
+        cursor.execute(CHURN_SQL.format(table=table), (int(share * 1024),))
+        cursor.connection.commit()
+    with get_cursor(autocommit=True) as cursor:
+        start = time.perf_counter()
+        cursor.execute(f"VACUUM {table}")
+        elapsed = time.perf_counter() - start
+        cursor.execute(SIZE_SQL, (table,))
+        total, largest = cursor.fetchone()
+    return elapsed, total, largest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--tasks-per-user", type=int, default=100)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--iterations", type=int, default=500, help="Timed executions per query and table")
+    parser.add_argument("--churn", type=float, default=0.05, help="Share of rows updated before VACUUM")
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    with get_cursor() as cursor:
+        drop_tables(cursor)
+        start = time.perf_counter()
+        create_tables(cursor, args.users, args.tasks_per_user, args.partitions)
+        cursor.connection.commit()
+        print(f"{args.users * args.tasks_per_user} tasks for {args.users} users, {args.partitions} partitions, "
+              f"built in {time.perf_counter() - start:.0f} s\n")
+        cursor.execute(SAMPLE_SQL.format(table=PLAIN), (SAMPLE_TASKS,))
+        sample = [(str(user), str(task)) for user, task in cursor.fetchall()]
+        cursor.connection.commit()
+
+    try:
+        print(f"{'query':<17}{'plain ms':>10}{'hash ms':>9}{'plan ms':>9}{'hash plan':>11}{'parts read':>12}")
+        for name, sql, params in hot_queries(rng, args.users, sample):
+            results = {}
+            with get_cursor() as cursor:
+                for table in (PLAIN, HASHED):
+                    statement = on_table(sql, table)
+                    planning, relations = explain(cursor, statement, params())
+                    cursor.connection.rollback()
+                    partitions = len([relation for relation in relations if relation.startswith(f"{HASHED}_p")])
+                    results[table] = (measure(cursor, statement, params, args.iterations), planning, partitions)
+            (plain, plain_plan, _), (hashed, hash_plan, partitions) = results[PLAIN], results[HASHED]
+            print(f"{name:<17}{plain * 1000:>10.3f}{hashed * 1000:>9.3f}{plain_plan:>9.3f}{hash_plan:>11.3f}"
+                  f"{partitions:>7}/{args.partitions}")
+
+        print(f"\n{'table':<20}{'vacuum s':>10}{'total MB':>10}{'largest unit MB':>17}")
+        for table in (PLAIN, HASHED):
+            elapsed, total, largest = churn_and_vacuum(table, args.churn)
+            print(f"{table:<20}{elapsed:>10.2f}{total / 2 ** 20:>10.0f}{largest / 2 ** 20:>17.0f}")
+    finally:
+        with get_cursor() as cursor:
+            drop_tables(cursor)
+            cursor.connection.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Server-side prepared statements against plain execute for the hot queries:
+a GET /tasks page, the tasks version lookup, the profile join, the login
+user lookup and the ownership-checked task update. For each one it reports
+the server's planning time (EXPLAIN ANALYZE of the plain statement against
+EXPLAIN ANALYZE EXECUTE of the prepared one) and the client round trip per
+call. Runs against the database configured through DB_* (see tables.sh);
+updates are rolled back.
+
+Usage (from WebApp/backend):
+    python -m benchmarks.bench_prepared [--iterations 2000] [--seed-tasks 500]
+"""
+import argparse
+import json
+import time
+
+from benchmarks.events import BENCH_USER_ID, ensure_user
+from commonUtil.db import _prepared_statement, execute_prepared, get_cursor
+from commonUtil.profile_repository import ProfileRepository
+from commonUtil.task_repository import TaskRepository
+from commonUtil.versions import DataVersionRepository
+
+DUE_DATE = "2099-01-01"
+
+
+def hot_queries(task_id):
+    """(name, sql, params) of the statements every request path runs."""
+    page_sql = TaskRepository.LIST_TASKS_SQL + " ORDER BY created_at, task_id LIMIT %s"
+    return [
+        ("tasks page", page_sql, (BENCH_USER_ID, 101)),
+        ("tasks version", DataVersionRepository.GET_VERSION_SQL.format(column=DataVersionRepository.TASKS), (BENCH_USER_ID,)),
+        ("profile join", ProfileRepository.GET_PROFILE_SQL, (BENCH_USER_ID,)),
+        ("user by username", "SELECT user_id, username, password_hash FROM users WHERE lower(username) = lower(%s)", ("bench_user",)),
+        ("update own task", TaskRepository.UPDATE_TASK_SQL, (None, None, "completed", task_id, BENCH_USER_ID)),
+    ]
+
+
+def planning_ms(cursor, statement):
+    """Planning Time the server reports for one EXPLAIN (ANALYZE) run."""
+    cursor.execute("EXPLAIN (ANALYZE, SUMMARY, FORMAT JSON) " + statement[0], statement[1])
+    plan = cursor.fetchone()[0]
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+    return plan[0]["Planning Time"]
+
+
+def measure(cursor, sql, params, iterations, prepared):
+    run = (lambda: execute_prepared(cursor, sql, params)) if prepared else (lambda: cursor.execute(sql, params))
+    run()  # prepares the statement on the prepared path
+    start = time.perf_counter()
+    for _ in range(iterations):
+        run()
+        if cursor.description:
+            cursor.fetchall()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--seed-tasks", type=int, default=500, help="Tasks the benchmark user owns")
+    args = parser.parse_args()
+
+    ensure_user()
+    with get_cursor() as cursor:
+        tasks = TaskRepository(cursor).create_many(BENCH_USER_ID, [
+            (f"Task {i}", DUE_DATE, "pending") for i in range(args.seed_tasks)
+        ])
+        cursor.connection.commit()
+    task_id = str(tasks[0]["task_id"])
+
+    print(f"{'query':<18}{'plan ms':>9}{'prepared':>10}{'call us':>10}{'prepared':>10}{'saved':>8}")
+    with get_cursor() as cursor:
+        for name, sql, params in hot_queries(task_id):
+            execute_prepared(cursor, sql, params)
+            # Postgres switches to a cached generic plan after five custom-planned executions
+            for _ in range(6):
+                execute_prepared(cursor, sql, params)
+            _, _, execute = _prepared_statement(sql)
+            plain_plan = min(planning_ms(cursor, (sql, params)) for _ in range(20))
+            prepared_plan = min(planning_ms(cursor, (execute, params)) for _ in range(20))
+
+            plain = measure(cursor, sql, params, args.iterations, prepared=False)
+            prepared = measure(cursor, sql, params, args.iterations, prepared=True)
+            print(
+                f"{name:<18}{plain_plan:>9.3f}{prepared_plan:>10.3f}"
+                f"{plain * 1e6:>10.1f}{prepared * 1e6:>10.1f}{1 - prepared / plain:>8.0%}"
+            )
+        cursor.connection.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark GET /tasks?q= on a large synthetic task list against what clients
+do without it: page through every task and filter on the client. Seeds the
+benchmark user with --tasks generated descriptions in the database
+configured through DB_* (see tables.sh), then times the real handler for
+whole words and for a type-ahead sequence of growing prefixes, and prints
+the plan of one search to show it reads idx_tasks_search.
+
+Usage (from WebApp/backend):
+    python -m benchmarks.bench_search [--tasks 100000] [--repeat 50] [--limit 20]
+"""
+import argparse
+import json
+import random
+import time
+
+from benchmarks.events import BENCH_USER_ID, ensure_user, make_event, make_token
+from commonUtil.constants.app_constants import app_constants
+from commonUtil.db import get_cursor
+from commonUtil.task_repository import TaskRepository
+from handlers.tasks.get_tasks import lambda_handler
+
+DUE_DATE = "2099-01-01"
+SEED_CHUNK = 5000
+
+VERBS = ["write", "review", "prepare", "send", "update", "fix", "plan", "call", "book", "renew", "clean", "submit"]
+OBJECTS = [
+    "report", "invoice", "budget", "presentation", "contract", "newsletter", "roadmap", "dentist",
+    "insurance", "passport", "garage", "backlog", "release", "proposal", "timesheet", "expenses",
+]
+QUALIFIERS = ["weekly", "quarterly", "annual", "draft", "final", "urgent", "team", "client", "personal", "q3"]
+
+SEARCHES = ["report", "weekly report", "quarterly budget review", "passport renew"]
+TYPE_AHEAD = ["r", "re", "rep", "repo", "report", "report w", "report we", "report weekly"]
+
+
+def description(rng):
+    words = [rng.choice(VERBS), rng.choice(QUALIFIERS), rng.choice(OBJECTS)]
+    if rng.random() < 0.5:
+        words += ["for", rng.choice(QUALIFIERS), rng.choice(OBJECTS)]
+    return " ".join(words)
+
+
+def seed(count):
+    rng = random.Random(42)
+    ensure_user()
+    with get_cursor() as cursor:
+        repository = TaskRepository(cursor)
+        for start in range(0, count, SEED_CHUNK):
+            repository.create_many(BENCH_USER_ID, [
+                (description(rng), DUE_DATE, "pending") for _ in range(min(SEED_CHUNK, count - start))
+            ])
+        cursor.execute("ANALYZE tasks")
+        cursor.connection.commit()
+
+
+def time_search(token, text, repeat, limit):
+    """Mean and worst latency of the first page of results, and the number of tasks on it."""
+    event = make_event("GET", "/task-management/tasks", token, query={"q": text, "limit": str(limit)})
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = lambda_handler(event, None)
+        samples.append(time.perf_counter() - start)
+    return sum(samples) / repeat, max(samples), len(json.loads(response["body"])["tasks"])
+
+
+def client_side_filter(token, text):
+    """Download every page of GET /tasks and filter it the way a client would; returns (seconds, matches)."""
+    words = text.lower().split()
+    start = time.perf_counter()
+    matches, cursor = 0, None
+    while True:
+        query = {"limit": str(app_constants.MAX_TASK_PAGE_SIZE)}
+        if cursor:
+            query["cursor"] = cursor
+        body = json.loads(lambda_handler(make_event("GET", "/task-management/tasks", token, query=query), None)["body"])
+        matches += sum(1 for task in body["tasks"] if all(word in task["description"].lower() for word in words))
+        cursor = body["next_cursor"]
+        if not cursor:
+            return time.perf_counter() - start, matches
+
+
+def search_plan(text, limit):
+    with get_cursor() as cursor:
+        sql = TaskRepository.SEARCH_TASKS_SQL.format(filters="") + " ORDER BY rank DESC, task_id LIMIT %s"
+        cursor.execute("EXPLAIN (ANALYZE, COSTS OFF) " + sql, (TaskRepository.prefix_query(text), BENCH_USER_ID, limit))
+        return "\n".join(row[0] for row in cursor.fetchall())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=100000, help="Tasks seeded for the benchmark user")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed requests per search")
+    parser.add_argument("--limit", type=int, default=20, help="Results per page")
+    args = parser.parse_args()
+
+    seed(args.tasks)
+    token = make_token()
+
+    print(f"{args.tasks} tasks\n")
+    print(f"{'search':<26}{'mean ms':>10}{'max ms':>10}{'results':>9}")
+    for text in SEARCHES + TYPE_AHEAD:
+        mean, worst, results = time_search(token, text, args.repeat, args.limit)
+        print(f"{text!r:<26}{mean * 1000:>10.2f}{worst * 1000:>10.2f}{results:>9}")
+
+    elapsed, matches = client_side_filter(token, SEARCHES[1])
+    print(f"\nClient-side filter of {SEARCHES[1]!r}: {elapsed * 1000:.0f} ms for {matches} matches")
+    print(f"\nPlan of {SEARCHES[1]!r}:\n{search_plan(SEARCHES[1], args.limit)}")
+
+
+if __name__ == "__main__":
+    main()
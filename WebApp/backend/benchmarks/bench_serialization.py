@@ -0,0 +1,74 @@
+"""
+Serialize a GET /tasks response of 10k tasks: the original path (to_dict per
+row, stdlib json.dumps, headers rebuilt per call) versus Rows through
+commonUtil.serialization, with orjson and with the stdlib fallback.
+
+Usage (from WebApp/backend):
+    python -m benchmarks.bench_serialization [--tasks 10000] [--repeat 20]
+"""
+import argparse
+import json
+import timeit
+import uuid
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+from commonUtil import serialization
+from commonUtil.constants.http_status import http_status
+from commonUtil.response_helpers import create_success_response
+from commonUtil.task_repository import TaskRepository
+from commonUtil.serialization import Rows
+
+
+def make_rows(n):
+    start = datetime(2024, 1, 1, 9, 0, 0, 123456)
+    return [
+        (str(uuid.uuid4()), f"Task number {i}", date(2030, 1, 1) + timedelta(days=i % 365), "pending", start + timedelta(seconds=i))
+        for i in range(n)
+    ]
+
+
+def legacy_headers():
+    return {
+        "Content-Type": "application/json",
+        "Access-Control-Allow-Origin": "http://localhost:3001",
+        "Access-Control-Allow-Credentials": "true",
+        "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
+        "Access-Control-Allow-Headers": "Content-Type, Authorization, X-Requested-With, Cookie"
+    }
+
+
+def legacy_response(rows):
+    tasks = [TaskRepository.to_dict(row) for row in rows]
+    return {"statusCode": 200, "body": json.dumps({"tasks": tasks, "next_cursor": None}), "headers": legacy_headers()}
+
+
+def rows_response(rows):
+    return create_success_response(http_status.OK, {"tasks": Rows(TaskRepository.TASK_FIELDS, rows), "next_cursor": None})
+
+
+def run(n, repeat):
+    rows = make_rows(n)
+    assert json.loads(legacy_response(rows)["body"]) == json.loads(rows_response(rows)["body"])
+
+    results = {"legacy (to_dict + json.dumps)": min(timeit.repeat(lambda: legacy_response(rows), number=1, repeat=repeat))}
+    with patch.object(serialization, "orjson", None):
+        results["Rows + stdlib fallback"] = min(timeit.repeat(lambda: rows_response(rows), number=1, repeat=repeat))
+    if serialization.orjson is not None:
+        results["Rows + orjson"] = min(timeit.repeat(lambda: rows_response(rows), number=1, repeat=repeat))
+    else:
+        print("orjson not installed; skipping")
+
+    baseline = results["legacy (to_dict + json.dumps)"]
+    print(f"{n} tasks, best of {repeat}")
+    print(f"{'path':<32}{'ms':>10}{'speedup':>10}")
+    for name, seconds in results.items():
+        print(f"{name:<32}{seconds * 1000:>10.2f}{baseline / seconds:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.tasks, args.repeat)
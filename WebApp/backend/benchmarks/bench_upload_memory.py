@@ -0,0 +1,147 @@
+"""
+Peak memory of POST /user/profile/image by image size: the original
+decode-everything path versus the chunked streaming upload, which also
+builds the thumbnails. The payload is a JPEG of random pixels of about the
+given size. Each (path, size) runs in a fresh subprocess whose peak RSS
+(VmHWM) is reset after the event is built, so it reports what handling the
+request added on top of the event itself. S3 is replaced by a client that
+discards what it receives and holds no objects, and the database update is
+skipped. Linux only.
+
+Usage (from WebApp/backend):
+    python -m benchmarks.bench_upload_memory [--sizes-mb 1 4 16 32]
+"""
+import argparse
+import base64
+import io
+import json
+import math
+import os
+import subprocess
+import sys
+import tracemalloc
+from unittest.mock import patch
+
+SIZES_MB = [1, 4, 16, 32]
+
+
+class NullS3Client:
+    """Accepts uploads and drops the bytes; every object looks missing and nothing is really signed."""
+
+    def head_object(self, **kwargs):
+        from botocore.exceptions import ClientError
+
+        raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+
+    def put_object(self, Body, **kwargs):
+        return {}
+
+    def copy_object(self, **kwargs):
+        return {}
+
+    def delete_object(self, **kwargs):
+        return {}
+
+    def create_multipart_upload(self, **kwargs):
+        return {"UploadId": "bench"}
+
+    def upload_part(self, Body, PartNumber, **kwargs):
+        return {"ETag": str(PartNumber)}
+
+    def complete_multipart_upload(self, **kwargs):
+        return {}
+
+    def abort_multipart_upload(self, **kwargs):
+        return {}
+
+    def generate_presigned_url(self, *args, **kwargs):
+        return "https://bench"
+
+
+def legacy_upload(event):
+    """The handler's original body: parse JSON, split, decode all, put_object."""
+    body = json.loads(event["body"])
+    image_bytes = base64.b64decode(body["image"].split(",")[1])
+    NullS3Client().put_object(Bucket="bench", Key="bench.jpg", Body=image_bytes, ContentType="image/jpeg")
+
+
+def make_jpeg(size_bytes):
+    """A JPEG of random pixels of about size_bytes; noise barely compresses."""
+    from PIL import Image
+
+    # About 2 bytes per pixel at quality 95; one correction pass gets within a few percent
+    side = int(math.sqrt(size_bytes / 2))
+    for _ in range(2):
+        output = io.BytesIO()
+        Image.frombytes("RGB", (side, side), os.urandom(side * side * 3)).save(output, format="JPEG", quality=95)
+        side = int(side * math.sqrt(size_bytes / output.tell()))
+    return output.getvalue()
+
+
+def peak_rss_kib():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+
+
+def reset_peak_rss():
+    with open("/proc/self/clear_refs", "w") as clear_refs:
+        clear_refs.write("5")
+
+
+def child(path, size_mb):
+    from benchmarks.events import make_event, make_token
+    from commonUtil import s3
+    from commonUtil.config import config
+    from handlers.auth import upload_profile_image
+
+    image = make_jpeg(size_mb * 1024 * 1024)
+    encoded = base64.b64encode(image).decode()
+    del image
+    token = make_token()
+    if path == "raw":
+        event = make_event("POST", "/task-management/user/profile/image", token, headers={"Content-Type": "image/jpeg"})
+        event["body"], event["isBase64Encoded"] = encoded, True
+    else:
+        event = make_event("POST", "/task-management/user/profile/image", token, body={"image": "data:image/jpeg;base64," + encoded})
+    del encoded
+
+    config.MAX_PROFILE_IMAGE_BYTES = 2 * size_mb * 1024 * 1024
+    s3._s3_client = NullS3Client()
+    reset_peak_rss()
+    baseline_rss = peak_rss_kib()
+    tracemalloc.start()
+    if path == "legacy":
+        legacy_upload(event)
+    else:
+        with patch.object(upload_profile_image, "update_profile_image_url"):
+            response = upload_profile_image.lambda_handler(event, None)
+        assert response["statusCode"] == 200, response
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    peak_rss = peak_rss_kib()
+    print(json.dumps({"peak_alloc_mb": peak / 2**20, "rss_growth_mb": (peak_rss - baseline_rss) / 1024}))
+
+
+def run(sizes):
+    print(f"{'size':>6}{'path':>8}{'peak alloc MiB':>16}{'RSS growth MiB':>16}")
+    for size_mb in sizes:
+        for path in ("legacy", "json", "raw"):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_upload_memory", "--child", path, str(size_mb)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{size_mb:>5}M{path:>8}{result['peak_alloc_mb']:>16.1f}{result['rss_growth_mb']:>16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=SIZES_MB)
+    parser.add_argument("--child", nargs=2, metavar=("PATH", "SIZE_MB"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child[0], int(args.child[1]))
+    else:
+        run(args.sizes_mb)
@@ -0,0 +1,275 @@
+"""
+Check that no handler query would sequentially scan a large table. Seeds
+--users users with --tasks-per-user tasks each into the database configured
+through DB_* (tables.sh plus every migration applied), runs ANALYZE, then
+invokes each handler in-process with its cursor swapped for one that runs
+EXPLAIN instead of every query (S3 is replaced by a client that drops
+uploads). Exits 1, listing the offenders, if any plan
+has a Seq Scan on one of CHECKED_TABLES or a query cannot be planned; on a
+partitioned tasks, also if a per-user query is not pruned to one partition.
+Everything happens in one transaction that is rolled back, so the database
+is left as it was.
+
+Usage (from WebApp/backend):
+    python -m benchmarks.check_plans [--users 2000] [--tasks-per-user 100]
+"""
+import argparse
+import hashlib
+import importlib
+import re
+import sys
+import uuid
+from contextlib import ExitStack, contextmanager
+from unittest.mock import patch
+
+import psycopg2
+
+from benchmarks.bench_upload_memory import NullS3Client
+from benchmarks.events import make_event, make_token
+from commonUtil.config import config
+from commonUtil.db import db_connection
+from commonUtil.task_summary_repository import TaskSummaryRepository
+
+# Tables that grow with users or tasks; job_watermarks and the like are tiny by design
+CHECKED_TABLES = {"tasks", "users", "user_profiles", "user_data_versions", "user_task_summaries"}
+# Partitions of a hash-partitioned tasks (see migrations/partition_tasks.py)
+_TASKS_PARTITION = re.compile(r"^tasks_p\d+$")
+# Handlers whose queries span every user, so may read every partition
+CROSS_USER_HANDLERS = {"handlers.tasks.mark_overdue_tasks"}
+
+_EXPLAINABLE = re.compile(rb"^\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\b", re.IGNORECASE)
+
+SEED_SQL = """
+    INSERT INTO users (user_id, username, email, password_hash)
+    SELECT md5('plan-user-' || i)::uuid, 'plan_user_' || i, 'plan_user_' || i || '@example.com', 'x'
+    FROM generate_series(1, %(users)s) i;
+
+    INSERT INTO user_profiles (profile_id, user_id)
+    SELECT md5('plan-profile-' || i)::uuid, md5('plan-user-' || i)::uuid
+    FROM generate_series(1, %(users)s) i;
+
+    INSERT INTO tasks (task_id, user_id, description, due_date, status, created_at)
+    SELECT gen_random_uuid(),
+           md5('plan-user-' || (i %% %(users)s + 1))::uuid,
+           (ARRAY['weekly report', 'pay invoice', 'review budget', 'call client', 'book dentist'])[i %% 5 + 1] || ' ' || i,
+           CURRENT_DATE + (i %% 1000) - 500,
+           (ARRAY['pending', 'in_progress', 'completed', 'overdue'])[i %% 4 + 1],
+           now() - i * interval '1 minute'
+    FROM generate_series(1, %(users)s * %(tasks_per_user)s) i;
+
+    ANALYZE users, user_profiles, tasks, user_data_versions, user_task_summaries;
+"""
+
+
+def seed_user_id(i=1):
+    """The user_id SEED_SQL gives seeded user ``i``."""
+    return str(uuid.UUID(hashlib.md5(f"plan-user-{i}".encode()).hexdigest()))
+
+
+class _Connection:
+    """
+    What handlers use of a connection; commits and rollbacks are left to the
+    check, and every cursor, named or not, is the explaining one.
+    """
+
+    def __init__(self, encoding, cursor):
+        self.encoding = encoding
+        self._cursor = cursor
+
+    def cursor(self, name=None):
+        return self._cursor
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class ExplainingCursor:
+    """
+    Stands in for a handler's cursor: each query is EXPLAINed on the real
+    cursor instead of run, and every fetch comes back empty unless
+    ``results`` queues rows for the query, one list per execution.
+    """
+
+    def __init__(self, cursor, results=None):
+        self._cursor = cursor
+        self.results = results or {}
+        self._rows = []
+        self.connection = _Connection(cursor.connection.encoding, self)
+        self.rowcount = 0
+        self.itersize = None
+        self.description = None
+        self.plans = []  # (handler, query, plan)
+        self.errors = []  # (handler, query, error)
+        self.handler = None
+
+    def execute(self, query, vars=None):
+        queued = self.results.get(query)
+        self._rows = queued.pop(0) if queued else []
+        sql = query if isinstance(query, bytes) else query.encode(self.connection.encoding)
+        if not _EXPLAINABLE.match(sql):
+            return  # SET, LOCK and the like
+        if vars is not None:
+            sql = self._cursor.mogrify(sql, vars)
+        query = sql.decode(self.connection.encoding)
+        # A failed EXPLAIN must not abort the transaction the next handlers run in
+        self._cursor.execute("SAVEPOINT plan_check")
+        try:
+            self._cursor.execute(b"EXPLAIN (FORMAT JSON) " + sql)
+        except psycopg2.Error as e:
+            self._cursor.execute("ROLLBACK TO SAVEPOINT plan_check")
+            self.errors.append((self.handler, query, str(e).strip()))
+            raise
+        self.plans.append((self.handler, query, self._cursor.fetchone()[0][0]["Plan"]))
+        self._cursor.execute("RELEASE SAVEPOINT plan_check")
+
+    def mogrify(self, query, vars=None):
+        return self._cursor.mogrify(query, vars)
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return self._rows
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+def handler_calls(token):
+    """(handler module, event) pairs covering every query shape the handlers run."""
+    task_id = str(uuid.uuid4())
+    tasks = "/task-management/tasks"
+    return [
+        ("handlers.auth.login", make_event("POST", "/task-management/login", None, body={"username": "Plan_User_1", "password": "x"})),
+        ("handlers.auth.get_user_profile", make_event("GET", "/task-management/user/profile", token)),
+        ("handlers.tasks.get_tasks", make_event("GET", tasks, token, query={"limit": "50"})),
+        ("handlers.tasks.get_tasks", make_event("GET", tasks, token, query={"status": "pending"})),
+        ("handlers.tasks.get_tasks", make_event("GET", tasks, token, query={"due_before": "2030-01-01", "due_after": "2020-01-01"})),
+        ("handlers.tasks.get_tasks", make_event("GET", tasks, token, query={"q": "report"})),
+        ("handlers.tasks.get_task_summary", make_event("GET", f"{tasks}/summary", token)),
+        ("handlers.tasks.create_task", make_event("POST", tasks, token, body={"description": "Plan check", "due_date": "2030-01-01"})),
+        ("handlers.tasks.update_task", make_event(
+            "PUT", f"{tasks}/{{task_id}}", token, body={"status": "completed"}, path_parameters={"task_id": task_id})),
+        ("handlers.tasks.update_task", make_event(
+            "PUT", f"{tasks}/{{task_id}}", token, body={"status": "completed"}, path_parameters={"task_id": task_id},
+            headers={"If-Match": '"tasks.1"'})),
+        ("handlers.tasks.delete_task", make_event(
+            "DELETE", f"{tasks}/{{task_id}}", token, path_parameters={"task_id": task_id})),
+        ("handlers.tasks.batch_tasks", make_event("POST", f"{tasks}/batch", token, body={"operations": [
+            {"op": "create", "description": "Plan check", "due_date": "2030-01-01"},
+            {"op": "update", "task_id": task_id, "status": "completed"},
+            {"op": "delete", "task_id": task_id},
+        ]})),
+        ("handlers.tasks.export_tasks", make_event("POST", f"{tasks}/export", token, query={"format": "csv"})),
+        ("handlers.tasks.mark_overdue_tasks", {"chunk_size": 1000}),
+        ("handlers.tasks.reconcile_task_summaries", {"dry_run": True}),
+    ]
+
+
+def scanned(plan):
+    """(node type, relation) of every scan anywhere in ``plan``."""
+    found = []
+    if plan.get("Relation Name"):
+        found.append((plan["Node Type"], plan["Relation Name"]))
+    for child in plan.get("Plans", []):
+        found.extend(scanned(child))
+    return found
+
+
+def seq_scans(plan):
+    """Relations in CHECKED_TABLES read by a Seq Scan anywhere in ``plan``; partitions count as tasks."""
+    return [
+        relation for node, relation in scanned(plan)
+        if node == "Seq Scan" and (relation in CHECKED_TABLES or _TASKS_PARTITION.match(relation))
+    ]
+
+
+def tasks_partitions(plan):
+    """The partitions of tasks ``plan`` reads."""
+    return sorted({relation for _, relation in scanned(plan) if _TASKS_PARTITION.match(relation)})
+
+
+def explain_handlers(cursor):
+    """
+    Run every handler call with its queries EXPLAINed on ``cursor``. Returns
+    the ExplainingCursor, holding the plans and any EXPLAIN errors.
+    """
+    explaining = ExplainingCursor(cursor, results={
+        # One seeded user for reconcile_task_summaries to lock and recount, then no more
+        TaskSummaryRepository.LIST_USERS_SQL: [[(seed_user_id(),)]],
+        TaskSummaryRepository.ACTUAL_COUNTS_SQL: [[(1, 0, 0, 0)]],
+    })
+
+    @contextmanager
+    def get_cursor(*args, **kwargs):
+        yield explaining
+
+    @contextmanager
+    def get_db_session(*args, **kwargs):
+        yield explaining.connection
+
+    token = make_token(seed_user_id())
+    with patch("commonUtil.s3._s3_client", NullS3Client()):
+        for module_name, event in handler_calls(token):
+            module = importlib.import_module(module_name)
+            explaining.handler = module_name
+            with ExitStack() as stack:
+                for name, replacement in (("get_cursor", get_cursor), ("get_db_session", get_db_session)):
+                    if hasattr(module, name):
+                        stack.enter_context(patch.object(module, name, replacement))
+                module.lambda_handler(event, None)
+    return explaining
+
+
+def check_plans(connection, users, tasks_per_user):
+    """
+    Seed, EXPLAIN every handler query and roll back. Returns the plans and
+    the offenders as (handler, query, problem) tuples.
+    """
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(SEED_SQL, {"users": users, "tasks_per_user": tasks_per_user})
+            explained = explain_handlers(cursor)
+    finally:
+        connection.rollback()
+    offenders = [
+        (handler, query, f"Seq Scan on {', '.join(tables)}")
+        for handler, query, plan in explained.plans if (tables := seq_scans(plan))
+    ]
+    offenders += [
+        (handler, query, f"{len(partitions)} partitions of tasks read")
+        for handler, query, plan in explained.plans
+        if handler not in CROSS_USER_HANDLERS and len(partitions := tasks_partitions(plan)) > 1
+    ]
+    offenders += [(handler, query, f"EXPLAIN failed: {error}") for handler, query, error in explained.errors]
+    return explained.plans, offenders
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--tasks-per-user", type=int, default=100)
+    args = parser.parse_args()
+
+    with db_connection(config.DB_HOST, config.DB_NAME, config.DB_USER, config.DB_PASSWORD, config.DB_PORT) as connection:
+        plans, offenders = check_plans(connection, args.users, args.tasks_per_user)
+
+    print(f"{len(plans)} queries explained on {args.users * args.tasks_per_user} tasks")
+    for handler, query, problem in offenders:
+        print(f"\n{problem} in {handler}:\n{' '.join(query.split())}")
+    if offenders:
+        sys.exit(1)
+    print("No sequential scans or unpruned partitions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Helpers shared by the benchmarks: API Gateway events, auth tokens and a
+seeded benchmark user. Database benchmarks read the usual DB_* environment
+variables and expect the schema from tables.sh plus every migration applied.
+"""
+import json
+import os
+import uuid
+
+from commonUtil.auth import generate_jwt
+from commonUtil.config import config
+from commonUtil.db import get_cursor
+
+BENCH_USER_ID = "5f0c6b1e-2d1b-4c37-9b59-00000b000001"
+
+
+def ensure_jwt_secret():
+    """Benchmarks run handlers in-process; give them a secret if none is configured."""
+    if not config.JWT_SECRET:
+        config.JWT_SECRET = os.environ.get("JWT_SECRET", "benchmark-secret-K8pEr3Vx7Qz9JyB2sT5nM4cF")
+    return config.JWT_SECRET
+
+
+def make_token(user_id=BENCH_USER_ID):
+    return generate_jwt({"user_id": user_id, "username": "bench"}, ensure_jwt_secret())
+
+
+def make_event(method, resource, token, body=None, path_parameters=None, query=None, headers=None):
+    """Build an API Gateway (REST, proxy integration) event."""
+    event_headers = {"Authorization": f"Bearer {token}"} if token else {}
+    event_headers.update(headers or {})
+    return {
+        "httpMethod": method,
+        "resource": resource,
+        "path": resource,
+        "headers": event_headers,
+        "pathParameters": path_parameters,
+        "queryStringParameters": query,
+        "body": json.dumps(body) if body is not None else None,
+        "isBase64Encoded": False,
+    }
+
+
+def ensure_user(user_id=BENCH_USER_ID, username="bench_user"):
+    """Create the benchmark user (and profile) if missing and clear its tasks."""
+    with get_cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO users (user_id, username, email, password_hash) VALUES (%s, %s, %s, %s) "
+            "ON CONFLICT (user_id) DO NOTHING",
+            (user_id, username, f"{username}@example.com", "bench"),
+        )
+        cursor.execute(
+            "INSERT INTO user_profiles (profile_id, user_id) SELECT %s, %s "
+            "WHERE NOT EXISTS (SELECT 1 FROM user_profiles WHERE user_id = %s)",
+            (str(uuid.uuid4()), user_id, user_id),
+        )
+        cursor.execute("DELETE FROM tasks WHERE user_id = %s", (user_id,))
+        cursor.connection.commit()
+    return user_id
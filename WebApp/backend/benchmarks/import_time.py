@@ -0,0 +1,148 @@
+"""
+Import cost of every Lambda entry point, as measured by `python -X importtime`
+in a fresh interpreter: roughly what each function pays in the init phase of
+a cold start before its handler runs. Each module is imported REPEAT times in
+separate processes and the fastest run is reported, with the heaviest
+top-level dependencies it pulled in.
+
+Usage (from WebApp/backend):
+    python -m benchmarks.import_time [--repeat 5] [--top 5] [handlers.tasks.get_tasks ...]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def handler_modules(root=BACKEND_DIR):
+    """Dotted names of the modules under handlers/ that define a lambda_handler."""
+    modules = []
+    handlers_dir = os.path.join(root, "handlers")
+    # handlers/router.py, then handlers/<package>/<module>.py
+    for dirpath, prefix in [(handlers_dir, "handlers")] + [
+        (os.path.join(handlers_dir, package), f"handlers.{package}") for package in sorted(os.listdir(handlers_dir))
+        if os.path.isdir(os.path.join(handlers_dir, package))
+    ]:
+        for filename in sorted(os.listdir(dirpath)):
+            if not filename.endswith(".py") or filename == "__init__.py":
+                continue
+            with open(os.path.join(dirpath, filename)) as f:
+                if "def lambda_handler" in f.read():
+                    modules.append(f"{prefix}.{filename[:-3]}")
+    return modules
+
+
+def subprocess_env(root=BACKEND_DIR):
+    """Environment for a child interpreter that resolves imports the way the Lambda layers do."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([root, os.path.join(root, "commonUtil")])
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def parse_importtime(output):
+    """
+    Parse `-X importtime` output into (name, depth, self_us, cumulative_us)
+    tuples, in the order the interpreter reported them.
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def import_profile(module, root=BACKEND_DIR):
+    """
+    Import ``module`` in a fresh interpreter and return its importtime entries.
+    Compile the tree first (main() does) so bytecode compilation is not
+    counted, just as it is not on Lambda when the package ships .pyc files.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root, env=subprocess_env(root), capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+    return parse_importtime(result.stderr)
+
+
+def import_time_ms(module, repeat=3, root=BACKEND_DIR):
+    """
+    Fastest cumulative import time of ``module`` over ``repeat`` fresh
+    interpreters, in milliseconds, and the entries of that run.
+    """
+    best = None
+    for _ in range(repeat):
+        entries = import_profile(module, root)
+        total = next(cumulative for name, _, _, cumulative in reversed(entries) if name == module)
+        if best is None or total < best[0]:
+            best = (total, entries)
+    return best[0] / 1000, best[1]
+
+
+def loaded_modules(module, root=BACKEND_DIR):
+    """The set of top-level packages in sys.modules after importing ``module`` in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys, {module}; print(' '.join(sys.modules))"],
+        cwd=root, env=subprocess_env(root), capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+    return {name.partition(".")[0] for name in result.stdout.split()}
+
+
+def dependencies_of(entries, module):
+    """
+    The entries imported while importing ``module``. The interpreter reports
+    a module after everything it imported, so these are the deeper entries
+    directly before it, back to the previous top-level one.
+    """
+    end = max(index for index, entry in enumerate(entries) if entry[0] == module)
+    depth = entries[end][1]
+    start = end
+    while start > 0 and entries[start - 1][1] > depth:
+        start -= 1
+    return entries[start:end]
+
+
+def heaviest_dependencies(entries, module, top):
+    """The ``top`` most expensive third-party or stdlib packages imported below ``module``."""
+    costs = {}
+    for name, _, _, cumulative in dependencies_of(entries, module):
+        package = name.partition(".")[0]
+        if package in ("handlers", "commonUtil"):
+            continue
+        # The outermost entry of a package already includes its submodules
+        costs[package] = max(costs.get(package, 0), cumulative)
+    return sorted(costs.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", help="Handler modules to measure (default: all)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="Heaviest dependencies to list per handler")
+    args = parser.parse_args()
+
+    subprocess.run([sys.executable, "-m", "compileall", "-q", "handlers", "commonUtil"], cwd=BACKEND_DIR, check=True)
+
+    results = []
+    for module in args.modules or handler_modules():
+        milliseconds, entries = import_time_ms(module, args.repeat)
+        results.append((module, milliseconds, heaviest_dependencies(entries, module, args.top)))
+
+    width = max(len(module) for module, _, _ in results)
+    print(f"{'handler':<{width}}  {'import ms':>9}  heaviest dependencies (cumulative ms)")
+    for module, milliseconds, heaviest in sorted(results, key=lambda result: result[1], reverse=True):
+        dependencies = ", ".join(f"{name} {cost / 1000:.1f}" for name, cost in heaviest)
+        print(f"{module:<{width}}  {milliseconds:>9.1f}  {dependencies}")
+
+
+if __name__ == "__main__":
+    main()
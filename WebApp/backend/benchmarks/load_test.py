@@ -0,0 +1,231 @@
+"""
+In-process load test of the API handlers. Each route's lambda_handler is
+driven with API Gateway events from a pool of worker threads against the
+database configured through DB_* (see commands.sh for a local Postgres in
+Docker and tables.sh for the schema), and reported with throughput,
+p50/p95/p99 latency and database statements per request.
+
+Results can be saved as a baseline JSON and later runs compared against it,
+e.g. on the commit before a change and then on the change itself:
+
+    python -m benchmarks.load_test --save baseline.json
+    python -m benchmarks.load_test --compare baseline.json
+
+The S3-backed image upload routes are not included; bench_upload_memory
+covers them without a bucket.
+
+Usage (from WebApp/backend):
+    python -m benchmarks.load_test [--routes get_tasks create_task ...] [--requests 500]
+        [--concurrency 4] [--seed-tasks 200] [--save FILE] [--compare FILE] [--threshold 0.1]
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.events import BENCH_USER_ID, ensure_user, make_event, make_token
+from commonUtil.config import config
+from commonUtil.db import TimedCursor, get_cursor, get_pool
+from commonUtil.task_repository import TaskRepository
+from handlers.router import API_PREFIX, resolve
+
+DUE_DATE = "2099-01-01"
+
+_statements = threading.local()
+
+
+class CountingCursor(TimedCursor):
+    """Counts the statements run on the current thread, execute_values pages included."""
+
+    def execute(self, query, vars=None):
+        _statements.count = getattr(_statements, "count", 0) + 1
+        return super().execute(query, vars)
+
+    def executemany(self, query, vars_list):
+        _statements.count = getattr(_statements, "count", 0) + 1
+        return super().executemany(query, vars_list)
+
+
+def statement_count():
+    return getattr(_statements, "count", 0)
+
+
+class Fixture:
+    """Tasks seeded for the benchmark user, handed out to the routes that need one."""
+
+    def __init__(self, token, seed_tasks, deletable):
+        self.token = token
+        with get_cursor() as cursor:
+            repository = TaskRepository(cursor)
+            tasks = repository.create_many(BENCH_USER_ID, [(f"Seed task {i}", DUE_DATE, "pending") for i in range(seed_tasks)])
+            doomed = repository.create_many(BENCH_USER_ID, [(f"Doomed task {i}", DUE_DATE, "pending") for i in range(deletable)])
+            cursor.connection.commit()
+        self.task_ids = [str(task["task_id"]) for task in tasks]
+        self._deletable = [str(task["task_id"]) for task in doomed]
+        self._lock = threading.Lock()
+
+    def task_id(self, i):
+        return self.task_ids[i % len(self.task_ids)]
+
+    def deletable_task_id(self):
+        with self._lock:
+            return self._deletable.pop()
+
+
+# name -> (method, resource, event factory taking (fixture, request index))
+ROUTES = {
+    "login": ("POST", "/login", lambda f, i: make_event(
+        "POST", "/login", None, body={"username": "bench_user", "password": "benchPass1!"})),
+    "logout": ("POST", "/logout", lambda f, i: make_event("POST", "/logout", f.token)),
+    "get_user_profile": ("GET", "/user/profile", lambda f, i: make_event("GET", "/user/profile", f.token)),
+    "get_tasks": ("GET", "/tasks", lambda f, i: make_event("GET", "/tasks", f.token, query={"limit": "50"})),
+    "create_task": ("POST", "/tasks", lambda f, i: make_event(
+        "POST", "/tasks", f.token, body={"description": f"Load task {i}", "due_date": DUE_DATE})),
+    "update_task": ("PUT", "/tasks/{task_id}", lambda f, i: make_event(
+        "PUT", "/tasks/{task_id}", f.token, body={"status": "completed" if i % 2 else "pending"},
+        path_parameters={"task_id": f.task_id(i)})),
+    "delete_task": ("DELETE", "/tasks/{task_id}", lambda f, i: make_event(
+        "DELETE", "/tasks/{task_id}", f.token, path_parameters={"task_id": f.deletable_task_id()})),
+    "batch_tasks": ("POST", "/tasks/batch", lambda f, i: make_event(
+        "POST", "/tasks/batch", f.token, body={"operations": [
+            {"op": "update", "task_id": f.task_id(i * 10 + j), "status": "completed"} for j in range(10)
+        ]})),
+}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values), max(1, math.ceil(fraction * len(sorted_values)))) - 1
+    return sorted_values[index]
+
+
+def run_route(name, fixture, requests, concurrency):
+    """Send ``requests`` events for one route from ``concurrency`` threads and summarize them."""
+    method, resource, build_event = ROUTES[name]
+    handler = resolve(method, API_PREFIX + resource)
+    # Built up front so event construction is not timed
+    events = [build_event(fixture, i) for i in range(requests)]
+    for event in events:
+        event["resource"] = event["path"] = API_PREFIX + event["resource"]
+
+    def send(event):
+        statements = statement_count()
+        start = time.perf_counter()
+        response = handler(event, None)
+        return time.perf_counter() - start, statement_count() - statements, response["statusCode"]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        samples = list(executor.map(send, events))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _, _ in samples)
+    return {
+        "requests": requests,
+        "errors": sum(1 for _, _, status in samples if status >= 400),
+        "throughput_rps": requests / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "statements_per_request": sum(statements for _, statements, _ in samples) / requests,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results):
+    print(f"{'route':<18}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'stmts/req':>11}{'errors':>8}")
+    for name, result in results.items():
+        print(
+            f"{name:<18}{result['throughput_rps']:>10.1f}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+            f"{result['p99_ms']:>10.2f}{result['statements_per_request']:>11.2f}{result['errors']:>8}"
+        )
+
+
+def compare(results, baseline, threshold):
+    """
+    Print each route's change against a saved baseline. Returns the names of
+    routes whose p95 latency grew, or throughput fell, by more than
+    ``threshold``, or that now run more statements per request.
+    """
+    regressions = []
+    print(f"\nAgainst baseline {baseline.get('commit') or '(unknown commit)'}:")
+    print(f"{'route':<18}{'req/s':>10}{'p95 ms':>10}{'stmts/req':>11}")
+    for name, result in results.items():
+        before = baseline["routes"].get(name)
+        if before is None:
+            print(f"{name:<18}{'(new)':>10}")
+            continue
+        throughput = result["throughput_rps"] / before["throughput_rps"] - 1
+        p95 = result["p95_ms"] / before["p95_ms"] - 1
+        statements = result["statements_per_request"] - before["statements_per_request"]
+        regressed = throughput < -threshold or p95 > threshold or statements > 0
+        print(f"{name:<18}{throughput:>+10.1%}{p95:>+10.1%}{statements:>+11.2f}{'  REGRESSION' if regressed else ''}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--routes", nargs="+", choices=sorted(ROUTES), default=list(ROUTES))
+    parser.add_argument("--requests", type=int, default=500, help="Requests per route")
+    parser.add_argument("--concurrency", type=int, default=4, help="Worker threads sharing the connection pool")
+    parser.add_argument("--seed-tasks", type=int, default=200, help="Tasks the benchmark user starts with")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed requests per route first")
+    parser.add_argument("--save", help="Write the results to this baseline JSON file")
+    parser.add_argument("--compare", help="Compare against a baseline JSON file; exit 1 on regression")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed relative change before a regression")
+    args = parser.parse_args()
+
+    # Every worker needs its own connection, or they would queue on the pool instead of the database
+    config.DB_POOL_SIZE = max(config.DB_POOL_SIZE, args.concurrency)
+    get_pool()._connect_kwargs["cursor_factory"] = CountingCursor
+
+    ensure_user()
+    deletable = (args.requests + args.warmup) if "delete_task" in args.routes else 0
+    fixture = Fixture(make_token(), args.seed_tasks, deletable)
+
+    results = {}
+    for name in args.routes:
+        if args.warmup:
+            run_route(name, fixture, args.warmup, args.concurrency)
+        results[name] = run_route(name, fixture, args.requests, args.concurrency)
+    print_results(results)
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "seed_tasks": args.seed_tasks,
+        "routes": results,
+    }
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved baseline to {os.path.abspath(args.save)}")
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
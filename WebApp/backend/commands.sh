@@ -4,3 +4,14 @@ docker run -d -e POSTGRES_DB=tasks-db -e POSTGRES_USER=postgres -e POSTGRES_PASS
 # connect to the PostgreSQL database
 docker exec -it task_management_db psql -U postgres -d tasks-db
 
+
+# Optional read replica for get_cursor(readonly=True): a streaming standby of task_management_db.
+# Allow replication connections on the primary, then clone it into the replica container.
+docker exec task_management_db bash -c 'echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"'
+docker exec task_management_db psql -U postgres -c "SELECT pg_reload_conf()"
+docker run -d --name task_management_db_replica --network task_management_network -p 5433:5432 --user postgres -e PGPASSWORD=password postgres:latest \
+  bash -c 'pg_basebackup -h task_management_db -U postgres -D "$PGDATA" -R -X stream && chmod 700 "$PGDATA" && exec postgres'
+
+# Replica routing tests against both containers (from WebApp/backend)
+DB_HOST=localhost DB_NAME=tasks-db DB_USER=postgres DB_PASSWORD=password DB_REPLICA_HOST=localhost DB_REPLICA_PORT=5433 \
+  PYTHONPATH=.:commonUtil python -m pytest tests/test_replica_integration.py
@@ -1,6 +1,16 @@
 import jwt
 import time
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from commonUtil.config import config
 from commonUtil.constants.app_constants import app_constants
+from commonUtil.constants.error_messages import error_messages
+from commonUtil.constants.http_status import http_status
+from commonUtil.response_helpers import create_error_response
+from commonUtil.metrics import TOKEN_PARSE, JWT_VALIDATE, phase
 
 
 def generate_jwt(payload, secret) -> str:
@@ -19,6 +29,43 @@ def validate_jwt(payload, secret):
     return jwt.decode(payload, secret, algorithms=[app_constants.JWT_ALGORITHM])
 
 
+# Verified claims keyed by token digest, in least-recently-used order.
+# Lives at module level so it survives warm invocations of the container.
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+def validate_jwt_cached(token, secret):
+    """
+    Validates a JWT like validate_jwt, but remembers the decoded claims of
+    verified tokens so repeat requests skip the decode and HMAC check.
+    Entries are dropped at the token's exp; invalid tokens are never cached.
+    """
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    now = time.time()
+    with _token_cache_lock:
+        claims = _token_cache.get(key)
+        if claims is not None:
+            if claims["exp"] > now:
+                _token_cache.move_to_end(key)
+                return dict(claims)
+            del _token_cache[key]
+
+    # Cache miss or expired entry: full verification (raises on expired/invalid tokens)
+    claims = validate_jwt(token, secret)
+    if "exp" in claims:
+        with _token_cache_lock:
+            _token_cache[key] = claims
+            _token_cache.move_to_end(key)
+            while len(_token_cache) > app_constants.JWT_CACHE_MAX_SIZE:
+                _token_cache.popitem(last=False)
+    return dict(claims)
+
+def clear_jwt_cache():
+    """Drops every cached token."""
+    with _token_cache_lock:
+        _token_cache.clear()
+
+
 def extract_token_from_cookie(headers):
     """Extract JWT token from request cookies or Authorization header."""
     # Check if token is in cookies
@@ -34,3 +81,51 @@ def extract_token_from_cookie(headers):
         return auth_header[7:]  # Remove "Bearer " prefix
     
     return None
+
+
+def require_auth(handler):
+    """
+    Decorator for Lambda handlers that need an authenticated user.
+    Validates the JWT from the cookie or Authorization header and stores the
+    user_id in event["requestContext"]["authorizer"] before calling the
+    handler; returns a 401 response when the token is missing or invalid.
+
+    Example:
+        @require_auth
+        def lambda_handler(event, context):
+            user_id = get_user_id(event)
+    """
+    @wraps(handler)
+    def wrapper(event, context):
+        try:
+            with phase(TOKEN_PARSE):
+                token = extract_token_from_cookie(event.get("headers") or {})
+            if not token:
+                return create_error_response(http_status.UNAUTHORIZED, error_messages.MISSING_AUTH_TOKEN)
+
+            try:
+                with phase(JWT_VALIDATE):
+                    payload = validate_jwt_cached(token, config.JWT_SECRET)
+            except jwt.ExpiredSignatureError:
+                return create_error_response(http_status.UNAUTHORIZED, error_messages.JWT_EXPIRED)
+            except jwt.InvalidTokenError:
+                return create_error_response(http_status.UNAUTHORIZED, error_messages.JWT_INVALID)
+
+            user_id = payload.get("user_id")
+            if not user_id:
+                return create_error_response(http_status.UNAUTHORIZED, error_messages.INVALID_CREDENTIALS)
+        except Exception as e:
+            return create_error_response(http_status.INTERNAL_SERVER_ERROR, error_messages.INTERNAL_ERROR.format(str(e)))
+
+        request_context = event.get("requestContext") or {}
+        authorizer = request_context.get("authorizer") or {}
+        authorizer["user_id"] = user_id
+        request_context["authorizer"] = authorizer
+        event["requestContext"] = request_context
+        return handler(event, context)
+
+    return wrapper
+
+def get_user_id(event):
+    """Returns the user_id stored on the event by require_auth."""
+    return event["requestContext"]["authorizer"]["user_id"]
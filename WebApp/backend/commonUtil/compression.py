@@ -0,0 +1,64 @@
+import zlib
+
+try:
+    import brotli
+except ImportError:  # gzip only when brotli is not in the layer
+    brotli = None
+
+from commonUtil.config import config
+
+GZIP = "gzip"
+BROTLI = "br"
+
+# Content types worth compressing; images and other binary formats already are
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def supported_encodings():
+    """Encodings this container can produce, in order of preference."""
+    return (BROTLI, GZIP) if brotli is not None else (GZIP,)
+
+
+def negotiate_encoding(accept_encoding):
+    """
+    Pick the encoding for a response from the request's Accept-Encoding
+    header: the supported coding with the highest q-value, brotli winning
+    ties. Returns None for identity.
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in supported_encodings():
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type):
+    return (content_type or "").startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(data, encoding):
+    """
+    Compress bytes at the cheap levels from config (RESPONSE_GZIP_LEVEL,
+    RESPONSE_BROTLI_QUALITY); on JSON these get most of the size reduction
+    of the maximum levels for a fraction of the CPU.
+    """
+    if encoding == BROTLI:
+        return brotli.compress(data, quality=config.RESPONSE_BROTLI_QUALITY)
+    # wbits=31 writes a gzip header and trailer rather than a raw zlib stream
+    compressor = zlib.compressobj(config.RESPONSE_GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
@@ -0,0 +1,39 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import config
+from .metrics import bind_invocation
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Returns the container-wide worker pool, creating it on first use. It
+    runs blocking I/O (S3 calls, mostly) while the handler's own thread
+    waits on the database, so a request costs the slower of the two rather
+    than their sum. The threads outlive the invocation like any other warm
+    container state.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=config.IO_WORKER_THREADS, thread_name_prefix="io")
+    return _executor
+
+
+def submit(fn, *args, **kwargs):
+    """
+    Runs fn(*args, **kwargs) on the worker pool and returns its Future. Time
+    it spends in phase() and record_phase() counts towards the submitting
+    invocation's metrics.
+
+    Example:
+        prefetch = submit(get_s3_client)
+        with get_cursor() as cursor:
+            ...
+        client = prefetch.result()
+    """
+    return get_executor().submit(bind_invocation(fn), *args, **kwargs)
@@ -10,9 +10,62 @@ class Config:
     DB_PASSWORD = os.environ.get("DB_PASSWORD")
     DB_PORT = os.environ.get("DB_PORT", "5432")  # Default to 5432 if not set
 
+    # Connection pool settings (per Lambda container)
+    DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "2"))  # Max open connections per container
+    DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "5"))  # Seconds to wait for a free connection
+    DB_POOL_PING_INTERVAL = float(os.environ.get("DB_POOL_PING_INTERVAL", "30"))  # Ping connections idle longer than this
+    DB_CONNECT_TIMEOUT = int(os.environ.get("DB_CONNECT_TIMEOUT", "5"))  # Seconds for the TCP/auth handshake
+    # Prepare hot statements once per connection; set to false behind a transaction-mode pooler (PgBouncer)
+    DB_PREPARED_STATEMENTS = os.environ.get("DB_PREPARED_STATEMENTS", "true").lower() == "true"
+
+    # Read replica for get_cursor(readonly=True); reads use the primary when unset
+    DB_REPLICA_HOST = os.environ.get("DB_REPLICA_HOST")
+    DB_REPLICA_PORT = os.environ.get("DB_REPLICA_PORT", DB_PORT)
+    DB_REPLICA_CONNECT_TIMEOUT = int(os.environ.get("DB_REPLICA_CONNECT_TIMEOUT", "2"))  # Fail over to the primary quickly
+    DB_REPLICA_RETRY_INTERVAL = float(os.environ.get("DB_REPLICA_RETRY_INTERVAL", "30"))  # Seconds to skip an unreachable replica
+
     JWT_SECRET = os.environ.get("JWT_SECRET")
 
     S3_BUCKET_NAME = os.environ.get("S3_BUCKET_NAME")
+    S3_ENDPOINT_URL = os.environ.get("S3_ENDPOINT_URL") or None  # S3-compatible stand-in (LocalStack, MinIO) for local runs
+
+    # Profile images are served as presigned GET URLs unless "inline" (base64 in the JSON body)
+    PROFILE_IMAGE_MODE = os.environ.get("PROFILE_IMAGE_MODE", "presigned")
+    PRESIGNED_URL_EXPIRATION = int(os.environ.get("PRESIGNED_URL_EXPIRATION", "3600"))  # Seconds a presigned URL stays valid
+    PRESIGNED_URL_REFRESH_MARGIN = int(os.environ.get("PRESIGNED_URL_REFRESH_MARGIN", "300"))  # Re-sign this long before expiry
+
+    # Profile image uploads
+    MAX_PROFILE_IMAGE_BYTES = int(os.environ.get("MAX_PROFILE_IMAGE_BYTES", str(5 * 1024 * 1024)))  # Largest accepted image
+    S3_MULTIPART_PART_SIZE = int(os.environ.get("S3_MULTIPART_PART_SIZE", str(8 * 1024 * 1024)))  # Bytes per multipart part (S3 minimum is 5 MiB)
+    PROFILE_IMAGE_UPLOAD_EXPIRATION = int(os.environ.get("PROFILE_IMAGE_UPLOAD_EXPIRATION", "300"))  # Seconds a presigned POST stays valid
+
+    # Task export (see handlers/tasks/export_tasks.py)
+    EXPORT_ITERSIZE = int(os.environ.get("EXPORT_ITERSIZE", "2000"))  # Rows the server-side cursor fetches per round trip
+
+    # Worker threads overlapping S3 calls with database work (see commonUtil/concurrency.py)
+    IO_WORKER_THREADS = int(os.environ.get("IO_WORKER_THREADS", "4"))
+
+    # Response compression (see commonUtil/compression.py)
+    RESPONSE_COMPRESSION_MIN_BYTES = int(os.environ.get("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))  # Smaller bodies are sent as-is
+    RESPONSE_GZIP_LEVEL = int(os.environ.get("RESPONSE_GZIP_LEVEL", "1"))  # 1-9; higher levels barely shrink JSON further
+    RESPONSE_BROTLI_QUALITY = int(os.environ.get("RESPONSE_BROTLI_QUALITY", "1"))  # 0-11
+
+    # Overdue sweep (see handlers/tasks/mark_overdue_tasks.py)
+    OVERDUE_SWEEP_CHUNK_SIZE = int(os.environ.get("OVERDUE_SWEEP_CHUNK_SIZE", "1000"))  # Tasks marked per transaction
+    OVERDUE_SWEEP_LOCK_TIMEOUT_MS = int(os.environ.get("OVERDUE_SWEEP_LOCK_TIMEOUT_MS", "2000"))  # Give up a chunk rather than queue behind a lock
+    OVERDUE_SWEEP_TIME_MARGIN_MS = int(os.environ.get("OVERDUE_SWEEP_TIME_MARGIN_MS", "10000"))  # Stop with this much Lambda time left
+
+    # Task summary reconciliation (see handlers/tasks/reconcile_task_summaries.py)
+    SUMMARY_RECONCILE_BATCH_SIZE = int(os.environ.get("SUMMARY_RECONCILE_BATCH_SIZE", "1000"))  # Users listed per query
+    SUMMARY_RECONCILE_TIME_MARGIN_MS = int(os.environ.get("SUMMARY_RECONCILE_TIME_MARGIN_MS", "10000"))  # Stop with this much Lambda time left
+
+    # Per-invocation phase timings as CloudWatch Embedded Metric Format (see commonUtil/metrics.py)
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "false").lower() == "true"
+    METRICS_NAMESPACE = os.environ.get("METRICS_NAMESPACE", "TaskManagement")
+
+    # Slow-query log (see TimedCursor in commonUtil/db.py)
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get("SLOW_QUERY_THRESHOLD_MS", "200"))  # Log statements at least this slow; 0 disables
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(os.environ.get("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0"))  # Share of slow SELECTs re-run under EXPLAIN ANALYZE
 
     @classmethod
     def get_db_connection_string(cls):
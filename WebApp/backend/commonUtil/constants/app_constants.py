@@ -4,12 +4,53 @@ import enum
 class AppConstants:
     JWT_EXPIRATION_TIME = 86400  # 24 hours in seconds
     JWT_ALGORITHM = "HS256"  # JWT signing algorithm
+    JWT_CACHE_MAX_SIZE = 1024  # Verified tokens kept in memory per container
     MIN_USERNAME_LENGTH = 3  # Minimum length for usernames
     MAX_USERNAME_LENGTH = 20  # Maximum length for usernames
     MIN_PASSWORD_LENGTH = 8  # Minimum length for passwords
     MAX_PASSWORD_LENGTH = 20  # Maximum length for passwords
     COOKIE_PATH = "/"  # Path for the cookie
     COOKIE_SAMESITE = "None"  # SameSite attribute for the cookie - None for cross-origin requests
+    DEFAULT_TASK_PAGE_SIZE = 100  # Tasks returned per page when no limit is given
+    MAX_TASK_PAGE_SIZE = 500  # Upper bound for the limit query parameter
+    MAX_SEARCH_QUERY_LENGTH = 100  # Characters accepted in the q query parameter of GET /tasks
+    MAX_BATCH_OPERATIONS = 5000  # Operations accepted per POST /tasks/batch call
+    BATCH_CHUNK_SIZE = 500  # Operations sent to the database per multi-row statement
+    ALLOWED_IMAGE_TYPES = ("image/jpeg", "image/png", "image/webp")  # Content types accepted for profile images
+    BASE64_DECODE_CHUNK_SIZE = 1024 * 1024  # Decoded bytes produced per base64 chunk during uploads
+    PROFILE_IMAGE_SIZES = (64, 128, 256)  # Square thumbnail edges, in pixels, generated for every profile image
+    PROFILE_IMAGE_FORMAT = "WEBP"  # Pillow format of the thumbnails
+    PROFILE_IMAGE_QUALITY = 80  # Lossy encoder quality of the thumbnails
+    DEFAULT_PROFILE_IMAGE_SIZE = 128  # Thumbnail edge returned by GET /profile when no image_size is given
+    MAX_PROFILE_IMAGE_SIZE = 1024  # Upper bound for the image_size query parameter
+    CONSISTENCY_HEADER = "X-Consistency"  # Request header a client sets to read its own writes
+    STRONG_CONSISTENCY = "strong"  # X-Consistency value that sends reads to the primary instead of the replica
+    EXPORT_ENCODE_BATCH_ROWS = 500  # Rows encoded into one chunk of an export before it is handed to the upload
+
+
+class BatchOperation(enum.Enum):
+    """
+    Enum for the operations accepted by POST /tasks/batch.
+    """
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class ProfileImageMode(enum.Enum):
+    """
+    Enum for how GET /profile returns the profile image.
+    """
+    PRESIGNED = "presigned"  # Short-lived presigned S3 GET URL
+    INLINE = "inline"  # Base64 data URL embedded in the response body
+
+
+class ExportFormat(enum.Enum):
+    """
+    Enum for the file formats of POST /tasks/export.
+    """
+    NDJSON = "ndjson"  # One JSON object per line
+    CSV = "csv"  # Header row, then one row per task
 
 
 class TaskStatus(enum.Enum):
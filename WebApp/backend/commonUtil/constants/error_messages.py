@@ -35,6 +35,24 @@ class ErrorMessages:
     MISSING_IMAGE_DATA = "Profile image is required"
     INVALID_IMAGE_DATA = "Invalid image data"
     PROFILE_UPDATE_FAILED = "Profile update failed"
+    INVALID_PAGE_LIMIT = "Limit must be an integer between 1 and 500"
+    INVALID_CURSOR = "Invalid pagination cursor"
+    INVALID_SEARCH_QUERY = "Search query must contain a word and be at most 100 characters"
+    INVALID_TASK_ID = "Task ID must be a valid UUID"
+    INVALID_BATCH = "Operations must be a non-empty list of at most 5000 items"
+    INVALID_BATCH_OPERATION = "Operation must be one of: create, update, delete"
+    INVALID_BATCH_ITEMS = "One or more batch operations are invalid"
+    DUPLICATE_BATCH_TASK = "Each task may appear only once per batch"
+    BATCH_FAILED = "Batch operation failed"
+    INVALID_IMAGE_MODE = "Image mode must be one of: presigned, inline"
+    IMAGE_TOO_LARGE = "Profile image must be at most {} bytes"
+    UNSUPPORTED_IMAGE_TYPE = "Profile image must be one of: image/jpeg, image/png, image/webp"
+    INVALID_IMAGE_SIZE = "Image size must be an integer between 1 and 1024"
+    INVALID_EXPORT_FORMAT = "Export format must be one of: ndjson, csv"
+    EXPORT_FAILED = "Task export failed"
+    TASKS_MODIFIED = "Tasks were modified since the given ETag"
+    ROUTE_NOT_FOUND = "No route for {} {}"
+    METHOD_NOT_ALLOWED = "Method {} is not allowed for {}"
 
 # Singleton instance for convenience
 error_messages = ErrorMessages()
\ No newline at end of file
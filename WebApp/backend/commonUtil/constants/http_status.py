@@ -5,12 +5,16 @@ class HttpStatus:
     CREATED = 201
     ACCEPTED = 202
     NO_CONTENT = 204
+    NOT_MODIFIED = 304
     BAD_REQUEST = 400
     UNAUTHORIZED = 401
     FORBIDDEN = 403
     NOT_FOUND = 404
     METHOD_NOT_ALLOWED = 405
     CONFLICT = 409
+    PRECONDITION_FAILED = 412
+    PAYLOAD_TOO_LARGE = 413
+    UNSUPPORTED_MEDIA_TYPE = 415
     INTERNAL_SERVER_ERROR = 500
     SERVICE_UNAVAILABLE = 503
 
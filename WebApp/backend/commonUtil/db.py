@@ -1,6 +1,17 @@
+import hashlib
+import itertools
+import json
+import logging
+import random
+import re
+import threading
+import time
 import psycopg2
 from contextlib import contextmanager
 from .config import config # Import config
+from .metrics import DB_CONNECT, DB_QUERY, DB_STATEMENTS, increment, phase, record_phase
+
+logger = logging.getLogger()
 
 def get_db_connection(host, database, user, password, port=5432):
     """
@@ -41,39 +52,493 @@ def db_connection(host, database, user, password, port=5432):
         if conn:
             conn.close()
 
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes free within the pool timeout."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of PostgreSQL connections.
+
+    The pool lives at module level, so it survives warm Lambda invocations and
+    each request reuses an open connection instead of paying the TCP + TLS +
+    auth handshake again. Connections idle for longer than ``ping_interval``
+    are pinged before being handed out (a frozen container can come back with
+    a dead socket), and broken connections are replaced transparently.
+    """
+
+    def __init__(self, connect_kwargs, max_size, timeout, ping_interval):
+        self._connect_kwargs = connect_kwargs
+        self._max_size = max_size
+        self._timeout = timeout
+        self._ping_interval = ping_interval
+        self._idle = []  # (conn, last_used) pairs, most recently used last
+        self._size = 0  # Open connections, idle or checked out
+        self._cond = threading.Condition()
+
+    def getconn(self):
+        """
+        Check out a live connection, opening a new one if the pool has room.
+        Waits up to ``timeout`` seconds when every connection is in use.
+        """
+        deadline = time.monotonic() + self._timeout
+        conn, last_used = None, None
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._size < self._max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(f"No database connection available after {self._timeout}s")
+                self._cond.wait(remaining)
+
+        # Connect and ping outside the lock so other threads are not blocked on I/O
+        try:
+            if conn is not None and not self._is_alive(conn, last_used):
+                self._close(conn)
+                conn = None
+            if conn is None:
+                conn = psycopg2.connect(**self._connect_kwargs)
+        except Exception:
+            self._release_slot()
+            raise
+        return conn
+
+    def putconn(self, conn, discard=False):
+        """
+        Return a connection to the pool.
+        Any transaction left open by the caller is rolled back so it cannot
+        leak into the next invocation; connections that cannot be reset are
+        closed instead of being reused.
+        """
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error as e:
+                logger.warning(f"Discarding connection that failed to roll back: {e}")
+                discard = True
+
+        if discard or conn.closed:
+            self._close(conn)
+            self._release_slot()
+            return
+
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def closeall(self):
+        """Close every idle connection. Checked-out connections are closed when returned."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._close(conn)
+
+    def _is_alive(self, conn, last_used):
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self._ping_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+            logger.info(f"Reconnecting stale database connection: {e}")
+            return False
+
+    def _release_slot(self):
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+
+# Literals and placeholders in SQL text, replaced by "?" when normalizing
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_PLACEHOLDER = re.compile(r"%(?:\([^)]+\))?s")
+# Runs of VALUES tuples, as inlined by execute_values
+_TUPLE_RUN = re.compile(r"(\((?:[^()]|\([^()]*\))*\))(?:\s*,\s*\((?:[^()]|\([^()]*\))*\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(query):
+    """
+    Returns the shape of a statement: literals and placeholders become "?",
+    runs of VALUES tuples collapse to the first one and whitespace is
+    squeezed, so the same statement with different values (or batch sizes)
+    normalizes to the same text.
+    """
+    if isinstance(query, bytes):
+        query = query.decode("utf-8", "replace")
+    query = _STRING_LITERAL.sub("?", query)
+    query = _PLACEHOLDER.sub("?", query)
+    query = _NUMBER_LITERAL.sub("?", query)
+    query = _TUPLE_RUN.sub(r"\1, ...", query)
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+def fingerprint(text):
+    """Short stable hash used to group slow queries and plans."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def param_shape(vars):
+    """The types of a statement's parameters, without their values (which may be personal data)."""
+    if vars is None:
+        return None
+    if isinstance(vars, dict):
+        return {key: param_shape(value) for key, value in vars.items()}
+    if isinstance(vars, (list, tuple)):
+        return [param_shape(value) if isinstance(value, (list, tuple, dict)) else type(value).__name__ for value in vars]
+    return type(vars).__name__
+
+
+def plan_fingerprint(plan):
+    """
+    Fingerprint of an EXPLAIN (FORMAT JSON) plan's structure: node types and
+    the relations and indexes they read, ignoring costs, row counts and
+    timings, so the same plan hashes the same on every run.
+    """
+    def shape(node):
+        return [
+            node.get("Node Type"), node.get("Relation Name"), node.get("Index Name"),
+            [shape(child) for child in node.get("Plans", [])],
+        ]
+    return fingerprint(json.dumps([shape(entry["Plan"]) for entry in plan]))
+
+
+def explain_query(connection, query, vars):
+    """
+    Runs EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) for a SELECT on the same
+    connection and returns the plan, or None for other statements, which
+    ANALYZE would execute a second time. Inside a transaction the EXPLAIN runs
+    under a savepoint, so a failure cannot abort the caller's transaction.
+    """
+    if isinstance(query, bytes):
+        query = query.decode("utf-8")
+    # EXPLAIN ANALYZE EXECUTE works for prepared statements too
+    if not statement_sql(query).lstrip().upper().startswith("SELECT"):
+        return None
+    in_transaction = not connection.autocommit
+    # A plain cursor, so the EXPLAIN is neither timed nor logged itself
+    with connection.cursor(cursor_factory=psycopg2.extensions.cursor) as cursor:
+        if in_transaction:
+            cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query, vars)
+            plan = cursor.fetchone()[0]
+        except psycopg2.Error:
+            if in_transaction:
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            raise
+        if in_transaction:
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+def log_slow_query(connection, query, vars, seconds, succeeded=True):
+    """
+    Logs a statement that took at least SLOW_QUERY_THRESHOLD_MS as one JSON
+    line: fingerprint, normalized SQL, parameter shapes and duration. A
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE share of successful SELECTs also gets its
+    EXPLAIN (ANALYZE, BUFFERS) plan and a plan fingerprint.
+    """
+    sql = normalize_sql(statement_sql(query))
+    record = {
+        "slow_query": fingerprint(sql),
+        "duration_ms": round(seconds * 1000, 3),
+        "sql": sql,
+        "params": param_shape(vars),
+        "succeeded": succeeded,
+    }
+    if succeeded and random.random() < config.SLOW_QUERY_EXPLAIN_SAMPLE_RATE:
+        try:
+            plan = explain_query(connection, query, vars)
+        except psycopg2.Error as e:
+            logger.warning(f"EXPLAIN of slow query {record['slow_query']} failed: {e}")
+            plan = None
+        if plan is not None:
+            record["plan_fingerprint"] = plan_fingerprint(plan)
+            record["plan"] = plan
+    logger.warning(json.dumps(record, default=str))
+
+
+def record_statement(connection, query, vars, seconds, succeeded=True):
+    """Counts and times one statement for the invocation's metrics and logs it if slow."""
+    record_phase(DB_QUERY, seconds)
+    increment(DB_STATEMENTS)
+    threshold = config.SLOW_QUERY_THRESHOLD_MS
+    if threshold > 0 and seconds * 1000 >= threshold:
+        log_slow_query(connection, query, vars, seconds, succeeded)
+
+
+class TimedCursor(psycopg2.extensions.cursor):
+    """
+    Cursor that times every statement: each one counts towards the
+    invocation's db_query phase and db_statements counter (see
+    commonUtil/metrics.py), and statements slower than
+    SLOW_QUERY_THRESHOLD_MS are logged by log_slow_query. Results are
+    fetched during execute, so the time covers the full round trip.
+    """
+
+    def execute(self, query, vars=None):
+        start = time.perf_counter()
+        try:
+            result = super().execute(query, vars)
+        except Exception:
+            record_statement(self.connection, query, vars, time.perf_counter() - start, succeeded=False)
+            raise
+        record_statement(self.connection, query, vars, time.perf_counter() - start)
+        return result
+
+    def executemany(self, query, vars_list):
+        vars_list = list(vars_list)
+        start = time.perf_counter()
+        try:
+            result = super().executemany(query, vars_list)
+        except Exception:
+            record_statement(self.connection, query, vars_list[:1], time.perf_counter() - start, succeeded=False)
+            raise
+        # Parameter shapes of the first row stand for the rest
+        record_statement(self.connection, query, vars_list[:1], time.perf_counter() - start)
+        return result
+
+
+class PreparingConnection(psycopg2.extensions.connection):
+    """
+    Connection that remembers the statements it has prepared (see
+    execute_prepared). Prepared statements last as long as the server
+    session, so a pooled connection prepares each one once and reuses it
+    across warm invocations.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+
+_PLACEHOLDER_PARAMETER = re.compile(r"%s")
+_INVALID_STATEMENT_NAME = "26000"  # SQLSTATE of EXECUTE on a statement the session does not have
+
+# SQL text -> (name, PREPARE statement, EXECUTE statement), shared by all connections
+_prepared_statements = {}
+# Statement name -> SQL text, so the slow-query log shows the SQL rather than the EXECUTE
+_prepared_sql = {}
+
+def _prepared_statement(sql):
+    statement = _prepared_statements.get(sql)
+    if statement is None:
+        name = f"ps_{fingerprint(sql)}"
+        numbers = itertools.count(1)
+        body = _PLACEHOLDER_PARAMETER.sub(lambda match: f"${next(numbers)}", sql)
+        arity = next(numbers) - 1
+        execute = f"EXECUTE {name} ({', '.join(['%s'] * arity)})" if arity else f"EXECUTE {name}"
+        statement = _prepared_statements[sql] = (name, f"PREPARE {name} AS {body}", execute)
+        _prepared_sql[name] = sql
+    return statement
+
+def statement_sql(query):
+    """The SQL behind an EXECUTE of a statement prepared by execute_prepared, else ``query`` itself."""
+    if isinstance(query, bytes):
+        query = query.decode("utf-8", "replace")
+    if query.startswith("EXECUTE ps_"):
+        return _prepared_sql.get(query.split()[1], query)
+    return query
+
+def execute_prepared(cursor, sql, params=()):
+    """
+    Executes ``sql`` as a server-side prepared statement. The first run on a
+    connection PREPAREs it, so the server parses and analyzes it once; later
+    runs EXECUTE it by name, and after a few runs Postgres may switch to a
+    cached generic plan and skip planning as well. ``sql`` must use
+    positional %s placeholders; every distinct text is its own statement.
+
+    Runs a plain execute when DB_PREPARED_STATEMENTS is off (required behind
+    a transaction-mode pooler such as PgBouncer, where statements may reach
+    different server sessions) or the cursor's connection is not pooled.
+
+    Example:
+        execute_prepared(cursor, "SELECT * FROM tasks WHERE user_id = %s", (user_id,))
+    """
+    connection = cursor.connection
+    if not config.DB_PREPARED_STATEMENTS or not isinstance(connection, PreparingConnection):
+        return cursor.execute(sql, params)
+
+    name, prepare, execute = _prepared_statement(sql)
+    if name not in connection.prepared:
+        cursor.execute(prepare)
+        connection.prepared.add(name)
+    try:
+        return cursor.execute(execute, params)
+    except psycopg2.Error as e:
+        if e.pgcode == _INVALID_STATEMENT_NAME:
+            # The session lost its statements (e.g. DISCARD ALL); prepare them again from now on
+            connection.prepared.clear()
+        raise
+
+
+_pool = None
+_replica_pool = None
+_pool_lock = threading.Lock()
+
+# time.monotonic() until which the replica is skipped after failing to connect
+_replica_down_until = 0.0
+
+def get_pool():
+    """
+    Returns the container-wide connection pool, creating it on first use.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    connect_kwargs={
+                        'host': config.DB_HOST,
+                        'database': config.DB_NAME,
+                        'user': config.DB_USER,
+                        'password': config.DB_PASSWORD,
+                        'port': config.DB_PORT,
+                        'connect_timeout': config.DB_CONNECT_TIMEOUT,
+                        'cursor_factory': TimedCursor,
+                        'connection_factory': PreparingConnection,
+                    },
+                    max_size=config.DB_POOL_SIZE,
+                    timeout=config.DB_POOL_TIMEOUT,
+                    ping_interval=config.DB_POOL_PING_INTERVAL,
+                )
+    return _pool
+
+def get_replica_pool():
+    """
+    Returns the container-wide pool of read replica connections (DB_REPLICA_HOST),
+    creating it on first use. Its sessions are read-only, so a write sent
+    there by mistake fails instead of reaching a server that rejects it anyway.
+    """
+    global _replica_pool
+    if _replica_pool is None:
+        with _pool_lock:
+            if _replica_pool is None:
+                _replica_pool = ConnectionPool(
+                    connect_kwargs={
+                        'host': config.DB_REPLICA_HOST,
+                        'database': config.DB_NAME,
+                        'user': config.DB_USER,
+                        'password': config.DB_PASSWORD,
+                        'port': config.DB_REPLICA_PORT,
+                        'connect_timeout': config.DB_REPLICA_CONNECT_TIMEOUT,
+                        'options': '-c default_transaction_read_only=on',
+                        'cursor_factory': TimedCursor,
+                        'connection_factory': PreparingConnection,
+                    },
+                    max_size=config.DB_POOL_SIZE,
+                    timeout=config.DB_POOL_TIMEOUT,
+                    ping_interval=config.DB_POOL_PING_INTERVAL,
+                )
+    return _replica_pool
+
+def _mark_replica_down(error):
+    global _replica_down_until
+    _replica_down_until = time.monotonic() + config.DB_REPLICA_RETRY_INTERVAL
+    logger.warning(f"Read replica unavailable, reading from the primary for {config.DB_REPLICA_RETRY_INTERVAL}s: {error}")
+
+def _checkout(readonly):
+    """
+    Returns (pool, connection, on_replica) for a session: the replica for
+    read-only sessions when one is configured and reachable, the primary otherwise.
+    """
+    if readonly and config.DB_REPLICA_HOST and time.monotonic() >= _replica_down_until:
+        replica_pool = get_replica_pool()
+        try:
+            with phase(DB_CONNECT):
+                return replica_pool, replica_pool.getconn(), True
+        except psycopg2.OperationalError as e:
+            _mark_replica_down(e)
+        except PoolTimeoutError as e:
+            # Busy rather than down: this request reads from the primary, the next tries the replica again
+            logger.warning(f"No read replica connection free, reading from the primary: {e}")
+    pool = get_pool()
+    with phase(DB_CONNECT):
+        return pool, pool.getconn(), False
+
 # Database session context manager with automatic config
 @contextmanager
-def get_db_session():
+def get_db_session(autocommit=False, readonly=False):
     """
-    Provides a database connection using application config.
-    
+    Provides a pooled database connection using application config.
+    The connection goes back to the pool on exit, with any uncommitted
+    transaction rolled back.
+
+    With autocommit=True each statement commits on its own, which saves the
+    BEGIN and COMMIT round trips for single-statement writes.
+
+    With readonly=True the session is read-only and, when DB_REPLICA_HOST is
+    set, served by the read replica. A replica that cannot be reached is
+    skipped for DB_REPLICA_RETRY_INTERVAL seconds and reads fail over to the
+    primary. Replicas lag behind the primary, so a read that must see the
+    caller's own recent write should not use readonly=True.
+
     Example:
         with get_db_session() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("SELECT * FROM users")
                 results = cursor.fetchall()
     """
-    db_params = {
-        'host': config.DB_HOST,
-        'database': config.DB_NAME,
-        'user': config.DB_USER,
-        'password': config.DB_PASSWORD,
-        'port': config.DB_PORT,
-    }
-    
-    with db_connection(**db_params) as conn:
+    pool, conn, on_replica = _checkout(readonly)
+    # Replica sessions are read-only from connect options; on the primary it is set per session
+    readonly_primary = readonly and not on_replica
+    discard = False
+    try:
+        if autocommit:
+            conn.autocommit = True
+        if readonly_primary:
+            conn.readonly = True
         yield conn
+    except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+        # The socket broke mid-request; drop it so the next request reconnects
+        discard = True
+        if on_replica:
+            _mark_replica_down(e)
+        raise
+    finally:
+        if (autocommit or readonly_primary) and not conn.closed:
+            try:
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                conn.autocommit = False
+                conn.readonly = None
+            except psycopg2.Error:
+                discard = True
+        pool.putconn(conn, discard=discard)
 
 @contextmanager
-def get_cursor():
+def get_cursor(autocommit=False, readonly=False):
     """
     Provides a database cursor with automatic connection handling.
+    readonly=True reads from the replica when one is configured (see get_db_session).
     
     Example:
         with get_cursor() as cursor:
             cursor.execute("SELECT * FROM users")
             results = cursor.fetchall()
     """
-    with get_db_session() as conn:
+    with get_db_session(autocommit=autocommit, readonly=readonly) as conn:
         with conn.cursor() as cursor:
-            yield cursor
\ No newline at end of file
+            yield cursor
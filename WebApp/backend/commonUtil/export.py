@@ -0,0 +1,63 @@
+import csv
+import io
+from datetime import datetime
+from itertools import islice
+
+from .constants.app_constants import app_constants, ExportFormat
+from .serialization import dumps
+
+CONTENT_TYPES = {
+    ExportFormat.NDJSON.value: "application/x-ndjson",
+    ExportFormat.CSV.value: "text/csv",
+}
+
+
+class CountingRows:
+    """Iterates over rows once, counting them as they go by."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.count = 0
+
+    def __iter__(self):
+        for row in self.rows:
+            self.count += 1
+            yield row
+
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def iter_ndjson(rows, fields, batch_rows=app_constants.EXPORT_ENCODE_BATCH_ROWS):
+    """Encodes rows as NDJSON, one object per line, yielding bytes a batch of rows at a time."""
+    for batch in _batches(rows, batch_rows):
+        yield "".join(dumps(dict(zip(fields, row))) + "\n" for row in batch).encode("utf-8")
+
+
+def _csv_cell(value):
+    # str() of a datetime uses a space; match the ISO 8601 of the JSON responses
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def iter_csv(rows, fields, batch_rows=app_constants.EXPORT_ENCODE_BATCH_ROWS):
+    """Encodes rows as CSV under a header row, yielding bytes a batch of rows at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for batch in _batches(rows, batch_rows):
+        writer.writerows([_csv_cell(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():  # header only: no rows
+        yield buffer.getvalue().encode("utf-8")
+
+
+def encode_rows(rows, fields, export_format):
+    """Returns the chunk iterator writing rows in ``export_format`` (an ExportFormat value)."""
+    if export_format == ExportFormat.CSV.value:
+        return iter_csv(rows, fields)
+    return iter_ndjson(rows, fields)
@@ -0,0 +1,237 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import uuid
+
+from .config import config
+from .constants.app_constants import app_constants
+from .s3 import get_s3_client, upload_stream
+
+# Keys are content-addressed, so an object never changes once written
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class S3ImageStore:
+    """Image objects in the configured S3 bucket."""
+
+    def __init__(self, bucket=None):
+        self.bucket = bucket or config.S3_BUCKET_NAME
+
+    def exists(self, key):
+        from botocore.exceptions import ClientError
+
+        try:
+            get_s3_client().head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def get(self, key):
+        return get_s3_client().get_object(Bucket=self.bucket, Key=key)["Body"].read()
+
+    def put(self, key, body, content_type):
+        get_s3_client().put_object(
+            Bucket=self.bucket, Key=key, Body=body, ContentType=content_type, CacheControl=IMMUTABLE_CACHE_CONTROL,
+        )
+
+    def put_stream(self, key, chunks, content_type):
+        upload_stream(chunks, key, content_type, bucket=self.bucket)
+
+    def copy(self, source, key, content_type):
+        # Server-side copy: the bytes never pass through the function
+        get_s3_client().copy_object(
+            Bucket=self.bucket, Key=key, CopySource={"Bucket": self.bucket, "Key": source},
+            ContentType=content_type, CacheControl=IMMUTABLE_CACHE_CONTROL, MetadataDirective="REPLACE",
+        )
+
+    def delete(self, key):
+        get_s3_client().delete_object(Bucket=self.bucket, Key=key)
+
+
+class LocalImageStore:
+    """Image objects as files under a directory; a stand-in for S3 in tests and local runs."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, key):
+        return os.path.join(self.root, *key.split("/"))
+
+    def exists(self, key):
+        return os.path.exists(self._path(key))
+
+    def get(self, key):
+        with open(self._path(key), "rb") as f:
+            return f.read()
+
+    def put(self, key, body, content_type):
+        self.put_stream(key, [body], content_type)
+
+    def put_stream(self, key, chunks, content_type):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+
+    def copy(self, source, key, content_type):
+        os.makedirs(os.path.dirname(self._path(key)), exist_ok=True)
+        shutil.copyfile(self._path(source), self._path(key))
+
+    def delete(self, key):
+        if os.path.exists(self._path(key)):
+            os.remove(self._path(key))
+
+
+def get_image_store():
+    """Returns the store profile images are written to."""
+    return S3ImageStore()
+
+
+def content_hash(image_bytes):
+    """Returns the sha256 hex digest that keys every object derived from an image."""
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+def original_key(digest):
+    return f"profile_images/{digest}/original"
+
+
+def derivative_key(digest, size):
+    return f"profile_images/{digest}/{size}.{app_constants.PROFILE_IMAGE_FORMAT.lower()}"
+
+
+def build_derivative(image, size):
+    """Returns a size x size center-cropped thumbnail of an opened image, encoded as PROFILE_IMAGE_FORMAT."""
+    from PIL import Image, ImageOps
+
+    thumbnail = ImageOps.fit(image, (size, size), method=Image.Resampling.LANCZOS)
+    output = io.BytesIO()
+    thumbnail.save(output, format=app_constants.PROFILE_IMAGE_FORMAT, quality=app_constants.PROFILE_IMAGE_QUALITY)
+    return output.getvalue()
+
+
+def staging_key():
+    """Returns a new key an upload is streamed to before its content hash is known."""
+    return f"profile_images/staging/{uuid.uuid4().hex}"
+
+
+def _store_image_set(image_file, digest, store, put_original):
+    """
+    Writes the original (through put_original(key, content_type)) and the
+    thumbnails of the image in the seekable file image_file, unless the
+    objects for digest already exist. Returns the image record.
+    """
+    # Pillow is only needed once an image is actually processed; importing it
+    # lazily keeps it out of the cold start of every handler using this layer
+    from PIL import Image, ImageOps
+
+    sizes = sorted(app_constants.PROFILE_IMAGE_SIZES)
+    derivatives = {size: derivative_key(digest, size) for size in sizes}
+    record = {"original": original_key(digest), "derivatives": derivatives}
+
+    if store.exists(derivatives[sizes[-1]]):
+        return record
+
+    try:
+        image = Image.open(image_file)
+        content_type = Image.MIME.get(image.format)
+        # JPEGs can be decoded at a reduced scale, skipping most of the full-size raster
+        image.draft("RGB", (sizes[-1], sizes[-1]))
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    except Exception as e:
+        raise ValueError(f"Invalid image: {e}")
+    if content_type not in app_constants.ALLOWED_IMAGE_TYPES:
+        raise ValueError(f"Unsupported image type: {content_type}")
+
+    put_original(record["original"], content_type)
+    derivative_type = f"image/{app_constants.PROFILE_IMAGE_FORMAT.lower()}"
+    for size in sizes:
+        store.put(derivatives[size], build_derivative(image, size), derivative_type)
+    return record
+
+
+def process_profile_image(image_bytes, store):
+    """
+    Stores an image and its thumbnails under its content hash and returns the
+    record to keep in user_profiles.profile_image_url.
+
+    If the objects for this hash already exist (the same image was uploaded
+    before, by anyone) nothing is decoded, resized or written. The largest
+    thumbnail is written last, so its presence means the set is complete.
+
+    Raises ValueError if the bytes are not an image of an allowed type.
+    """
+    return _store_image_set(
+        io.BytesIO(image_bytes), content_hash(image_bytes), store,
+        lambda key, content_type: store.put(key, image_bytes, content_type),
+    )
+
+
+def process_profile_image_stream(chunks, content_type, store):
+    """
+    Like process_profile_image, for an image arriving as an iterable of byte
+    chunks, without ever holding it in memory whole.
+
+    The chunks are streamed to a staging object as they arrive (see
+    upload_stream), hashed on the way and spooled to a temporary file. Once
+    the hash is known the staging object is copied to the original's key on
+    the store's side and the thumbnails are built from the file, with the
+    same reduced-scale decode. The staging object is always deleted.
+
+    Raises ValueError if the bytes are not an image of an allowed type;
+    errors from the chunks themselves (e.g. binascii.Error) propagate.
+    """
+    digest = hashlib.sha256()
+    staging = staging_key()
+    with tempfile.TemporaryFile() as spool:
+        def tee():
+            for chunk in chunks:
+                digest.update(chunk)
+                spool.write(chunk)
+                yield chunk
+
+        try:
+            store.put_stream(staging, tee(), content_type)
+            spool.seek(0)
+            return _store_image_set(
+                spool, digest.hexdigest(), store,
+                lambda key, detected_type: store.copy(staging, key, detected_type),
+            )
+        finally:
+            store.delete(staging)
+
+
+def encode_image_record(record):
+    """Serializes an image record for the profile_image_url column."""
+    return json.dumps({
+        "original": record["original"],
+        "derivatives": {str(size): key for size, key in record["derivatives"].items()},
+    }, separators=(",", ":"))
+
+
+def parse_image_record(value):
+    """
+    Returns the image record stored in profile_image_url, or None when the
+    column holds a plain URL written before thumbnails existed.
+    """
+    if not value or not value.startswith("{"):
+        return None
+    record = json.loads(value)
+    record["derivatives"] = {int(size): key for size, key in record["derivatives"].items()}
+    return record
+
+
+def select_derivative(record, size):
+    """Returns the key of the smallest thumbnail at least size pixels wide, else the largest one."""
+    sizes = sorted(record["derivatives"])
+    for candidate in sizes:
+        if candidate >= size:
+            return record["derivatives"][candidate]
+    return record["derivatives"][sizes[-1]]
@@ -0,0 +1,53 @@
+class JobWatermarkRepository:
+    """
+    Data access for job_watermarks, where batch jobs record how far they got
+    so an interrupted run (a Lambda timeout, a lock timeout) resumes instead
+    of starting over. Saving the watermark in the same transaction as a
+    chunk's writes keeps the two in step.
+    """
+
+    GET_WATERMARK_SQL = """
+        SELECT run_date, last_due_date, last_task_id, finished
+        FROM job_watermarks WHERE job_name = %s
+    """
+    SAVE_WATERMARK_SQL = """
+        INSERT INTO job_watermarks (job_name, run_date, last_due_date, last_task_id, finished)
+        VALUES (%s, %s, %s, %s, %s)
+        ON CONFLICT (job_name) DO UPDATE SET
+            run_date = EXCLUDED.run_date,
+            last_due_date = EXCLUDED.last_due_date,
+            last_task_id = EXCLUDED.last_task_id,
+            finished = EXCLUDED.finished,
+            updated_at = CURRENT_TIMESTAMP
+    """
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def resume_position(self, job_name, run_date):
+        """
+        Return the (due_date, task_id) position an unfinished run of
+        ``job_name`` for ``run_date`` stopped at, or None to start from the
+        beginning (no earlier run, a finished one, or one for another day).
+        """
+        self.cursor.execute(self.GET_WATERMARK_SQL, (job_name,))
+        row = self.cursor.fetchone()
+        if not row or row[0] != run_date or row[3] or row[1] is None:
+            return None
+        return row[1], str(row[2])
+
+    def last_run(self, job_name):
+        """
+        Return (run_date, position, finished) as last saved for ``job_name``,
+        position being (due_date, task_id) or None, or None if it never ran.
+        """
+        self.cursor.execute(self.GET_WATERMARK_SQL, (job_name,))
+        row = self.cursor.fetchone()
+        if not row:
+            return None
+        return row[0], (row[1], str(row[2])) if row[2] is not None else None, row[3]
+
+    def save(self, job_name, run_date, position, finished):
+        """Record the position a run of ``job_name`` has reached; commits with the caller's transaction."""
+        due_date, task_id = position or (None, None)
+        self.cursor.execute(self.SAVE_WATERMARK_SQL, (job_name, run_date, due_date, task_id, finished))
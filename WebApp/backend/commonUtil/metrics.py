@@ -0,0 +1,207 @@
+import sys
+import threading
+import time
+from functools import wraps
+
+from .config import config
+from .serialization import dumps
+
+# Phases timed by the shared code; handlers may add their own names
+TOKEN_PARSE = "token_parse"
+JWT_VALIDATE = "jwt_validate"
+DB_CONNECT = "db_connect"
+DB_QUERY = "db_query"
+S3 = "s3"
+SERIALIZE = "serialize"
+COMPRESS = "compress"
+
+# Counters
+DB_STATEMENTS = "db_statements"
+
+
+class _InvocationState(threading.local):
+    # Phase durations of the invocation running on this thread, or None outside
+    # an instrumented invocation (and always when metrics are disabled). A class
+    # default keeps the disabled check a plain attribute read: a missing
+    # thread-local attribute costs an AttributeError on every lookup.
+    phases = None
+    counts = None
+    # Guards phases and counts, which worker threads running bind_invocation
+    # work update alongside the handler's own thread
+    lock = None
+
+
+_local = _InvocationState()
+
+# The first invocation in a container is its cold start
+_cold_start = True
+
+
+class _Phase:
+    __slots__ = ("phases", "lock", "name", "start")
+
+    def __init__(self, phases, lock, name):
+        self.phases = phases
+        self.lock = lock
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        with self.lock:
+            self.phases[self.name] = self.phases.get(self.name, 0.0) + elapsed
+        return False
+
+
+class _NoopPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopPhase()
+
+
+def phase(name):
+    """
+    Context manager adding the time spent in its block to phase ``name`` of
+    the current invocation. Phases entered more than once (one per query,
+    say) add up. Outside an instrumented invocation it does nothing.
+
+    Example:
+        with phase(DB_QUERY):
+            cursor.execute(sql, params)
+    """
+    phases = _local.phases
+    if phases is None:
+        return _NOOP
+    return _Phase(phases, _local.lock, name)
+
+
+def record_phase(name, seconds):
+    """Adds a duration measured elsewhere (e.g. by an SDK callback) to phase ``name``."""
+    phases = _local.phases
+    if phases is not None:
+        with _local.lock:
+            phases[name] = phases.get(name, 0.0) + seconds
+
+
+def increment(name, amount=1):
+    """Adds ``amount`` to counter ``name`` of the current invocation, if any."""
+    counts = _local.counts
+    if counts is not None:
+        with _local.lock:
+            counts[name] = counts.get(name, 0) + amount
+
+
+def bind_invocation(fn):
+    """
+    Returns ``fn`` wrapped to record its phases and counters against the
+    invocation running on the calling thread, for work handed to another
+    thread (see commonUtil/concurrency.py).
+    """
+    phases, counts, lock = _local.phases, _local.counts, _local.lock
+    if phases is None:
+        return fn
+
+    @wraps(fn)
+    def bound(*args, **kwargs):
+        _local.phases, _local.counts, _local.lock = phases, counts, lock
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _local.phases = _local.counts = _local.lock = None
+
+    return bound
+
+
+def instrument(handler):
+    """
+    Decorator for Lambda handlers that emits one CloudWatch Embedded Metric
+    Format line per invocation when METRICS_ENABLED is set: route, status,
+    cold start flag, total duration, the time spent in each phase() and
+    every counter passed to increment().
+
+    When metrics are disabled the handler is called straight through and
+    every phase() is a no-op. Handlers reached through another instrumented
+    handler (the router) are not reported twice.
+
+    Example:
+        @instrument
+        @require_auth
+        def lambda_handler(event, context):
+            ...
+    """
+    @wraps(handler)
+    def wrapper(event, context):
+        global _cold_start
+        cold_start, _cold_start = _cold_start, False
+        if not config.METRICS_ENABLED or _local.phases is not None:
+            return handler(event, context)
+
+        _local.phases = phases = {}
+        _local.counts = counts = {}
+        _local.lock = lock = threading.Lock()
+        status = None
+        start = time.perf_counter()
+        try:
+            response = handler(event, context)
+            if isinstance(response, dict):
+                status = response.get("statusCode")
+            return response
+        finally:
+            duration = time.perf_counter() - start
+            _local.phases = _local.counts = _local.lock = None
+            # Work submitted without waiting for its result may still be recording
+            with lock:
+                phases, counts = dict(phases), dict(counts)
+            emit(route_name(event, context, handler), status, cold_start, duration, phases, counts)
+
+    return wrapper
+
+
+def route_name(event, context, handler):
+    """"GET /task-management/tasks" for API events, else the function (or module) name."""
+    if isinstance(event, dict) and event.get("resource"):
+        return f"{event.get('httpMethod')} {event['resource']}"
+    return getattr(context, "function_name", None) or handler.__module__
+
+
+def emit(route, status, cold_start, duration, phases, counts=None):
+    """
+    Write an EMF record to stdout, where Lambda forwards it to CloudWatch
+    Logs and CloudWatch extracts the metrics. Route is the only dimension;
+    status and cold start are properties, so they can be queried in Logs
+    Insights without multiplying metric cardinality.
+    """
+    metrics = {"Duration": round(duration * 1000, 3)}
+    units = {"Duration": "Milliseconds"}
+    for name, seconds in phases.items():
+        metrics[name] = round(seconds * 1000, 3)
+        units[name] = "Milliseconds"
+    for name, count in (counts or {}).items():
+        metrics[name] = count
+        units[name] = "Count"
+    record = {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": config.METRICS_NAMESPACE,
+                "Dimensions": [["Route"]],
+                "Metrics": [{"Name": name, "Unit": units[name]} for name in metrics],
+            }],
+        },
+        "Route": route,
+        "Status": status,
+        "ColdStart": cold_start,
+        **metrics,
+    }
+    sys.stdout.write(dumps(record) + "\n")
+    sys.stdout.flush()
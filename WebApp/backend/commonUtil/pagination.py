@@ -0,0 +1,49 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+
+
+def encode_cursor(created_at, task_id):
+    """
+    Encode the keyset position of the last task on a page into an opaque,
+    URL-safe cursor string.
+    """
+    raw = json.dumps([created_at.isoformat(), str(task_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor.
+    :return: A (created_at, task_id) tuple.
+    :raises ValueError: If the cursor is malformed or has been tampered with.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), str(uuid.UUID(task_id))
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+def encode_rank_cursor(rank, task_id):
+    """
+    Encode the position of the last task on a page of search results, ranked
+    by relevance, into an opaque, URL-safe cursor string.
+    """
+    raw = json.dumps([rank, str(task_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_rank_cursor(cursor):
+    """
+    Decode a cursor produced by encode_rank_cursor.
+    :return: A (rank, task_id) tuple.
+    :raises ValueError: If the cursor is malformed or has been tampered with.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, task_id = json.loads(base64.urlsafe_b64decode(padded))
+        if isinstance(rank, bool) or not isinstance(rank, (int, float)):
+            raise ValueError("Invalid rank")
+        return float(rank), str(uuid.UUID(task_id))
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
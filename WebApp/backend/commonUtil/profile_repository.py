@@ -0,0 +1,29 @@
+from commonUtil.db import execute_prepared
+
+
+class ProfileRepository:
+    """
+    Data access for users and user_profiles.
+
+    Example:
+        with get_cursor() as cursor:
+            profile = ProfileRepository(cursor).get(user_id)
+    """
+
+    GET_PROFILE_SQL = """SELECT u.email, u.username, up.profile_image_url 
+                FROM users u LEFT JOIN user_profiles up ON u.user_id = up.user_id
+                WHERE u.user_id = %s"""
+    SET_IMAGE_URL_SQL = "UPDATE user_profiles SET profile_image_url = %s WHERE user_id = %s"
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def get(self, user_id):
+        """Return (email, username, profile_image_url) or None if the user does not exist."""
+        execute_prepared(self.cursor, self.GET_PROFILE_SQL, (user_id,))
+        return self.cursor.fetchone()
+
+    def set_image_url(self, user_id, image_url):
+        """Record the profile image URL; returns False if the user has no profile row."""
+        execute_prepared(self.cursor, self.SET_IMAGE_URL_SQL, (image_url, user_id))
+        return self.cursor.rowcount > 0
@@ -0,0 +1,34 @@
+import base64
+
+from commonUtil.constants.app_constants import app_constants
+
+
+def get_header(headers, name):
+    """
+    Case-insensitive header lookup; clients and API Gateway disagree on case
+    """
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is None:
+        name = name.lower()
+        value = next((v for k, v in headers.items() if k.lower() == name), None)
+    return value
+
+def requires_primary(headers):
+    """
+    True if the client asked to read from the primary ("X-Consistency: strong"),
+    e.g. right after its own write, which a replica may not have replayed yet
+    """
+    value = get_header(headers, app_constants.CONSISTENCY_HEADER)
+    return (value or "").strip().lower() == app_constants.STRONG_CONSISTENCY
+
+def get_body(event):
+    """
+    Get the request body as text. API Gateway base64-encodes bodies whose
+    Content-Type matches one of the API's binary media types
+    """
+    body = event.get("body")
+    if body is not None and event.get("isBase64Encoded"):
+        return base64.b64decode(body).decode("utf-8")
+    return body
@@ -1,43 +1,126 @@
-import json
+import base64
+from commonUtil.config import config
 from commonUtil.constants.app_constants import app_constants
 from commonUtil.constants.http_status import http_status
+from commonUtil.serialization import dumps
+from commonUtil.compression import negotiate_encoding, is_compressible, compress
+from commonUtil.metrics import SERIALIZE, COMPRESS, phase
 
-def create_error_response(status_code, error_message):
+
+class FrozenHeaders(dict):
+    """
+    A read-only dict, so one precomputed header mapping can be shared by every
+    response. It stays a real dict because the Lambda runtime serializes the
+    response with the stdlib json module.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Default headers are shared and cannot be modified; pass additional_headers instead")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = _readonly
+
+
+DEFAULT_HEADERS = FrozenHeaders({
+    "Content-Type": "application/json",
+    "Access-Control-Allow-Origin": "http://localhost:3001",  # Match exact frontend origin
+    "Access-Control-Allow-Credentials": "true",
+    "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization, X-Requested-With, Cookie, If-Match, If-None-Match, X-Consistency",
+    "Access-Control-Expose-Headers": "ETag"
+})
+
+# Browsers keep the response but revalidate it with If-None-Match every time
+CACHE_CONTROL_REVALIDATE = "private, no-cache"
+
+def create_error_response(status_code, error_message, details=None):
     """
     Create a standardized error response
     """
+    body = {"error": error_message}
+    if details is not None:
+        body["details"] = details
     return {
         "statusCode": status_code,
-        "body": json.dumps({"error": error_message}),
-        "headers": get_default_headers()
+        "body": dumps(body),
+        "headers": DEFAULT_HEADERS
     }
 
-def create_success_response(status_code, body, additional_headers=None):
+def create_success_response(status_code, body, additional_headers=None, accept_encoding=None):
     """
-    Create a standardized success response
+    Create a standardized success response.
+    The body may contain dates, datetimes, UUIDs and Rows; see commonUtil.serialization.
+    Pass the request's Accept-Encoding to have bodies of at least
+    RESPONSE_COMPRESSION_MIN_BYTES compressed (see compress_response).
     """
-    headers = get_default_headers()
-    if additional_headers:
-        headers.update(additional_headers)
+    headers = {**DEFAULT_HEADERS, **additional_headers} if additional_headers else DEFAULT_HEADERS
     
-    return {
+    with phase(SERIALIZE):
+        serialized = dumps(body)
+    response = {
         "statusCode": status_code,
-        "body": json.dumps(body),
+        "body": serialized,
         "headers": headers
     }
+    if accept_encoding is not None:
+        response = compress_response(response, accept_encoding)
+    return response
 
-def get_default_headers():
+def compress_response(response, accept_encoding):
     """
-    Get default headers for API responses including CORS settings
+    Compress a response body with the encoding negotiated from Accept-Encoding.
+    The compressed body is returned base64-encoded with isBase64Encoded, which
+    API Gateway decodes before sending it to the client (the API must list the
+    response content type under binary media types). Small bodies, bodies
+    that are already encoded or not compressible, and bodies that would not
+    shrink are left untouched. A compressed response gets a weak ETag, since
+    its bytes differ from the identity representation.
     """
+    headers = response["headers"]
+    if len(response["body"]) < config.RESPONSE_COMPRESSION_MIN_BYTES:
+        return response
+    if "Content-Encoding" in headers or not is_compressible(headers.get("Content-Type")):
+        return response
+
+    headers = {**headers, "Vary": "Accept-Encoding"}
+    encoding = negotiate_encoding(accept_encoding)
+    raw = response["body"].encode("utf-8")
+    with phase(COMPRESS):
+        compressed = compress(raw, encoding) if encoding else None
+    if compressed is None or len(compressed) >= len(raw):
+        return {**response, "headers": headers}
+
+    headers["Content-Encoding"] = encoding
+    if headers.get("ETag", "").startswith('"'):
+        headers["ETag"] = "W/" + headers["ETag"]
     return {
-        "Content-Type": "application/json",
-        "Access-Control-Allow-Origin": "http://localhost:3001",  # Match exact frontend origin
-        "Access-Control-Allow-Credentials": "true",
-        "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type, Authorization, X-Requested-With, Cookie"
+        **response,
+        "body": base64.b64encode(compressed).decode("ascii"),
+        "headers": headers,
+        "isBase64Encoded": True
     }
 
+def create_not_modified_response(etag):
+    """
+    Create a 304 response for a conditional GET whose ETag still matches
+    """
+    return {
+        "statusCode": http_status.NOT_MODIFIED,
+        "body": "",
+        "headers": {**DEFAULT_HEADERS, "ETag": etag, "Cache-Control": CACHE_CONTROL_REVALIDATE}
+    }
+
+def etag_headers(etag):
+    """
+    Headers that let the client revalidate a response with If-None-Match
+    """
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL_REVALIDATE}
+
+def get_default_headers():
+    """
+    Get a mutable copy of the default headers for API responses including CORS settings
+    """
+    return dict(DEFAULT_HEADERS)
+
 def generate_auth_cookie(jwt_token):
     """
     Generate a standardized authentication cookie string
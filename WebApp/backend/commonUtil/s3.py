@@ -0,0 +1,197 @@
+import base64
+import io
+import threading
+import time
+import uuid
+from .config import config
+from .metrics import S3, phase, record_phase
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+def get_s3_client():
+    """
+    Returns the container-wide S3 client, creating it on first use.
+    Building a boto3 client costs several milliseconds, so it is shared
+    across warm invocations instead of being created per request.
+
+    boto3 itself is imported here rather than at module level: it adds
+    well over 100 ms to a cold start, and most handlers that load this
+    layer never touch S3.
+    """
+    global _s3_client
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                import boto3
+                client = boto3.client("s3", endpoint_url=config.S3_ENDPOINT_URL)
+                client.meta.events.register("before-call.s3", _start_call_timer)
+                client.meta.events.register("after-call.s3", _record_call_time)
+                client.meta.events.register("after-call-error.s3", _record_call_time)
+                _s3_client = client
+    return _s3_client
+
+
+def _start_call_timer(context, **kwargs):
+    context["metrics_start"] = time.perf_counter()
+
+def _record_call_time(context, **kwargs):
+    """Adds each S3 API call's round trip to the invocation's s3 phase (see commonUtil/metrics.py)."""
+    start = context.pop("metrics_start", None)
+    if start is not None:
+        record_phase(S3, time.perf_counter() - start)
+
+
+def profile_image_key(user_id):
+    """Returns the S3 object key of a user's profile image from before thumbnails were generated."""
+    return f"profile_images/{user_id}.jpg"
+
+def profile_upload_key(user_id):
+    """Returns the S3 key a browser uploads a profile image to before it is processed."""
+    return f"profile_uploads/{user_id}"
+
+def task_export_key(user_id, extension):
+    """Returns a new S3 key for an export of a user's tasks; every export gets its own object."""
+    return f"task_exports/{user_id}/{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}-{uuid.uuid4().hex[:8]}.{extension}"
+
+def object_url(key, bucket=None):
+    """Returns the plain (unsigned) URL of an object."""
+    return f"https://{bucket or config.S3_BUCKET_NAME}.s3.amazonaws.com/{key}"
+
+
+# (bucket, key) -> (url, expires_at); presigning is pure CPU work, but the
+# URL only needs to change shortly before it expires
+_presigned_urls = {}
+_presigned_urls_lock = threading.Lock()
+_PRESIGNED_URL_CACHE_MAX_SIZE = 1024
+
+def generate_presigned_get_url(key, bucket=None):
+    """
+    Returns a presigned GET URL for an object, reusing the URL generated by a
+    previous invocation until it is within PRESIGNED_URL_REFRESH_MARGIN
+    seconds of expiring.
+    """
+    bucket = bucket or config.S3_BUCKET_NAME
+    now = time.time()
+    with _presigned_urls_lock:
+        cached = _presigned_urls.get((bucket, key))
+    if cached and cached[1] - config.PRESIGNED_URL_REFRESH_MARGIN > now:
+        return cached[0]
+
+    with phase(S3):
+        url = get_s3_client().generate_presigned_url(
+            "get_object",
+            Params={"Bucket": bucket, "Key": key},
+            ExpiresIn=config.PRESIGNED_URL_EXPIRATION,
+        )
+    with _presigned_urls_lock:
+        if len(_presigned_urls) >= _PRESIGNED_URL_CACHE_MAX_SIZE:
+            for cache_key in [k for k, (_, expires_at) in _presigned_urls.items() if expires_at <= now]:
+                del _presigned_urls[cache_key]
+            if len(_presigned_urls) >= _PRESIGNED_URL_CACHE_MAX_SIZE:
+                _presigned_urls.clear()
+        _presigned_urls[(bucket, key)] = (url, now + config.PRESIGNED_URL_EXPIRATION)
+    return url
+
+def invalidate_presigned_url(key, bucket=None):
+    """Drops the cached presigned URL of an object, e.g. after overwriting it."""
+    with _presigned_urls_lock:
+        _presigned_urls.pop((bucket or config.S3_BUCKET_NAME, key), None)
+
+def clear_presigned_url_cache():
+    """Drops every cached presigned URL."""
+    with _presigned_urls_lock:
+        _presigned_urls.clear()
+
+
+def decoded_base64_length(data, start=0):
+    """
+    Returns how many bytes data[start:] decodes to, without decoding it.
+    Lets callers enforce a size limit before allocating the decoded image.
+    """
+    length = len(data) - start
+    padding = 0
+    if length and data[-1] == "=":
+        padding = 2 if length > 1 and data[-2] == "=" else 1
+    return length // 4 * 3 - padding
+
+def iter_base64_chunks(data, start=0, chunk_size=1024 * 1024):
+    """
+    Decodes data[start:] in slices of about chunk_size decoded bytes, so only
+    one slice is held in memory besides the encoded string itself.
+    Raises binascii.Error on malformed input.
+    """
+    step = max(chunk_size // 3, 1) * 4
+    for offset in range(start, len(data), step):
+        yield base64.b64decode(data[offset:offset + step], validate=True)
+
+def upload_stream(chunks, key, content_type, bucket=None, **extra_args):
+    """
+    Uploads an iterable of byte chunks to S3 without holding the whole
+    object in memory. Chunks are copied into a part buffer and released; each
+    full S3_MULTIPART_PART_SIZE buffer is sent as one part of a multipart
+    upload. A payload that fits in a single part is sent with one put_object
+    instead. The multipart upload is aborted on failure.
+
+    :return: The number of bytes uploaded.
+    """
+    bucket = bucket or config.S3_BUCKET_NAME
+    part_size = config.S3_MULTIPART_PART_SIZE
+    client = get_s3_client()
+    upload_id = None
+    parts = []
+    buffer, total = io.BytesIO(), 0
+
+    try:
+        for chunk in chunks:
+            buffer.write(chunk)
+            total += len(chunk)
+            if buffer.tell() >= part_size:
+                if upload_id is None:
+                    upload_id = client.create_multipart_upload(
+                        Bucket=bucket, Key=key, ContentType=content_type, **extra_args
+                    )["UploadId"]
+                buffer.seek(0)
+                response = client.upload_part(
+                    Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=len(parts) + 1, Body=buffer
+                )
+                parts.append({"ETag": response["ETag"], "PartNumber": len(parts) + 1})
+                buffer = io.BytesIO()
+
+        buffer.seek(0)
+        if upload_id is None:
+            client.put_object(Bucket=bucket, Key=key, Body=buffer, ContentType=content_type, **extra_args)
+            return total
+
+        if buffer.getbuffer().nbytes:
+            response = client.upload_part(
+                Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=len(parts) + 1, Body=buffer
+            )
+            parts.append({"ETag": response["ETag"], "PartNumber": len(parts) + 1})
+        client.complete_multipart_upload(
+            Bucket=bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+        )
+        return total
+    except Exception:
+        if upload_id is not None:
+            client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+        raise
+
+def generate_presigned_post(key, content_type, max_bytes, bucket=None, acl=None):
+    """
+    Returns a presigned POST (url and form fields) that lets the browser
+    upload an object straight to S3. S3 itself rejects bodies larger than
+    max_bytes or with a different Content-Type.
+    """
+    fields = {"Content-Type": content_type}
+    conditions = [{"Content-Type": content_type}, ["content-length-range", 1, max_bytes]]
+    if acl:
+        fields["acl"] = acl
+        conditions.append({"acl": acl})
+    return get_s3_client().generate_presigned_post(
+        Bucket=bucket or config.S3_BUCKET_NAME,
+        Key=key,
+        Fields=fields,
+        Conditions=conditions,
+        ExpiresIn=config.PROFILE_IMAGE_UPLOAD_EXPIRATION,
+    )
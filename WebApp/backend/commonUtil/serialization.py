@@ -0,0 +1,93 @@
+import json
+import operator
+import uuid
+from datetime import date, datetime
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback when orjson is not in the layer
+    orjson = None
+
+
+class Rows:
+    """
+    A sequence of database rows that serializes as a JSON array of objects.
+
+    Handlers pass fetched tuples straight through instead of building one
+    dict per row; dates, datetimes and UUIDs are encoded by the serializer.
+
+    Example:
+        create_success_response(http_status.OK, {"tasks": Rows(TASK_FIELDS, cursor.fetchall())})
+    """
+
+    __slots__ = ("columns", "rows")
+
+    def __init__(self, columns, rows):
+        self.columns = tuple(columns)
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        columns = self.columns
+        return (dict(zip(columns, row)) for row in self.rows)
+
+
+_TEXT_TYPES = (datetime, date, uuid.UUID)
+
+
+def _default(obj):
+    """Encodes the types neither backend handles on its own."""
+    if isinstance(obj, Rows):
+        columns = obj.columns
+        return [dict(zip(columns, row)) for row in obj.rows]
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_isoformat = operator.methodcaller("isoformat")
+
+
+def _convert_column(column):
+    """Converts a column of cells in one pass if it holds dates, datetimes or UUIDs."""
+    sample = next((value for value in column if value is not None), None)
+    if not isinstance(sample, _TEXT_TYPES):
+        return column
+    convert = str if isinstance(sample, uuid.UUID) else _isoformat
+    if None in column:
+        return [None if value is None else convert(value) for value in column]
+    return list(map(convert, column))
+
+
+def _stdlib_default(obj):
+    """
+    Like _default, but converts Rows column by column up front: a default()
+    call per date cell costs far more in the stdlib C encoder than one
+    map() over the column.
+    """
+    if isinstance(obj, Rows):
+        if not obj.rows:
+            return []
+        columns = obj.columns
+        return [dict(zip(columns, row)) for row in zip(*map(_convert_column, zip(*obj.rows)))]
+    return _default(obj)
+
+
+_stdlib_encoder = json.JSONEncoder(default=_stdlib_default, separators=(",", ":"), check_circular=False)
+
+
+def dumps(obj):
+    """
+    Serializes obj to a JSON string with orjson when available, else the
+    stdlib encoder. date, datetime and UUID values come out as ISO 8601 and
+    canonical strings with either backend.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default).decode("utf-8")
+    return _stdlib_encoder.encode(obj)
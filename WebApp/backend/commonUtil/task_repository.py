@@ -0,0 +1,287 @@
+import re
+from uuid import uuid4
+
+from commonUtil.db import execute_prepared
+from commonUtil.pagination import encode_cursor, encode_rank_cursor
+from commonUtil.serialization import Rows
+
+
+class TaskNotFoundError(Exception):
+    """Raised when a task does not exist or does not belong to the user."""
+
+
+class TaskRepository:
+    """
+    Data access for the tasks table.
+
+    Every mutation is a single statement: ownership is checked in the WHERE
+    clause and the affected row comes back through RETURNING, so handlers
+    never need a separate SELECT. A statement that matches no row raises
+    TaskNotFoundError, which handlers map to 404. The single-row statements
+    and the list query run as prepared statements (see execute_prepared).
+
+    Example:
+        with get_cursor(autocommit=True) as cursor:
+            task = TaskRepository(cursor).create(user_id, "Write report", "2030-01-01", "pending")
+    """
+
+    TASK_COLUMNS = "task_id, description, due_date, status, created_at"
+    TASK_FIELDS = ("task_id", "description", "due_date", "status", "created_at")
+
+    INSERT_TASK_SQL = (
+        "INSERT INTO tasks (task_id, user_id, description, due_date, status) "
+        f"VALUES (%s, %s, %s, %s, %s) RETURNING {TASK_COLUMNS}"
+    )
+    UPDATE_TASK_SQL = f"""
+        UPDATE tasks
+        SET description = COALESCE(%s, description),
+            due_date = COALESCE(%s, due_date),
+            status = COALESCE(%s, status),
+            updated_at = CURRENT_TIMESTAMP
+        WHERE task_id = %s AND user_id = %s
+        RETURNING {TASK_COLUMNS}
+    """
+    DELETE_TASK_SQL = "DELETE FROM tasks WHERE task_id = %s AND user_id = %s RETURNING task_id"
+    LIST_TASKS_SQL = f"SELECT {TASK_COLUMNS} FROM tasks WHERE user_id = %s"
+    # search_vector is generated from description with the same 'english' configuration (see migrations/0009_tasks_search_vector.sql)
+    SEARCH_TASKS_SQL = f"""
+        SELECT {TASK_COLUMNS}, rank FROM (
+            SELECT {TASK_COLUMNS}, ts_rank(search_vector, query) AS rank
+            FROM tasks, to_tsquery('english', %s) AS query
+            WHERE user_id = %s AND search_vector @@ query{{filters}}
+        ) matches
+    """
+    SEARCH_FIELDS = TASK_FIELDS + ("rank",)
+    # Every task in the order of idx_tasks_user_created, so rows stream from the index without a sort
+    EXPORT_TASKS_SQL = LIST_TASKS_SQL + " ORDER BY created_at, task_id"
+
+    # One chunk of the overdue sweep, in (due_date, task_id) order along
+    # idx_tasks_open_due. The statuses are literals so the partial index
+    # matches the prepared statement too. Rows locked by an interactive write
+    # are skipped rather than waited for; the sweep retries them with one more
+    # pass from the start (see handlers/tasks/mark_overdue_tasks.py).
+    # The update joins on (user_id, task_id), the primary key of a
+    # partitioned tasks too (see migrations/partition_tasks.py).
+    # Returns the number of rows marked and the last (due_date, task_id).
+    MARK_OVERDUE_SQL = """
+        WITH batch AS (
+            SELECT user_id, task_id FROM tasks
+            WHERE status IN ('pending', 'in_progress') AND due_date < %s{after}
+            ORDER BY due_date, task_id
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        ), marked AS (
+            UPDATE tasks t SET status = 'overdue', updated_at = CURRENT_TIMESTAMP
+            FROM batch WHERE t.user_id = batch.user_id AND t.task_id = batch.task_id
+            RETURNING t.due_date, t.task_id
+        )
+        SELECT (SELECT COUNT(*) FROM marked), due_date, task_id
+        FROM marked ORDER BY due_date DESC, task_id DESC LIMIT 1
+    """
+
+    # Multi-row variants used by POST /tasks/batch; each runs once per chunk
+    INSERT_TASKS_SQL = (
+        "INSERT INTO tasks (task_id, user_id, description, due_date, status) "
+        f"VALUES %s RETURNING {TASK_COLUMNS}"
+    )
+    # user_id is inlined as a constant (execute_values takes no other
+    # parameters) so a partitioned tasks is pruned to the user's partition
+    # when the statement is planned, not probed per VALUES row.
+    UPDATE_TASKS_SQL = """
+        UPDATE tasks t
+        SET description = COALESCE(v.description, t.description),
+            due_date = COALESCE(v.due_date, t.due_date),
+            status = COALESCE(v.status, t.status),
+            updated_at = CURRENT_TIMESTAMP
+        FROM (VALUES %s) AS v (task_id, description, due_date, status)
+        WHERE t.user_id = {user_id} AND t.task_id = v.task_id
+        RETURNING t.task_id, t.description, t.due_date, t.status, t.created_at
+    """
+    UPDATE_TASKS_TEMPLATE = "(%s::uuid, %s::varchar, %s::date, %s::varchar)"
+    DELETE_TASKS_SQL = "DELETE FROM tasks WHERE user_id = %s AND task_id = ANY(%s::uuid[]) RETURNING task_id"
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def create(self, user_id, description, due_date, status):
+        """Insert a task and return it."""
+        execute_prepared(self.cursor, self.INSERT_TASK_SQL, (str(uuid4()), user_id, description, due_date, status))
+        return self.to_dict(self.cursor.fetchone())
+
+    def update(self, task_id, user_id, description=None, due_date=None, status=None):
+        """Update the given fields of a task owned by the user and return it."""
+        execute_prepared(self.cursor, self.UPDATE_TASK_SQL, (description, due_date, status, task_id, user_id))
+        row = self.cursor.fetchone()
+        if not row:
+            raise TaskNotFoundError(task_id)
+        return self.to_dict(row)
+
+    def delete(self, task_id, user_id):
+        """Delete a task owned by the user and return its id."""
+        execute_prepared(self.cursor, self.DELETE_TASK_SQL, (task_id, user_id))
+        row = self.cursor.fetchone()
+        if not row:
+            raise TaskNotFoundError(task_id)
+        return row[0]
+
+    def create_many(self, user_id, tasks):
+        """
+        Insert (description, due_date, status) tuples in one multi-row INSERT.
+        :return: The created tasks, in input order.
+        """
+        # psycopg2.extras is only needed by the batch endpoint
+        from psycopg2.extras import execute_values
+
+        rows = [(str(uuid4()), user_id, description, due_date, status) for description, due_date, status in tasks]
+        returned = execute_values(self.cursor, self.INSERT_TASKS_SQL, rows, page_size=len(rows), fetch=True)
+        created = {str(row[0]): self.to_dict(row) for row in returned}
+        return [created[row[0]] for row in rows]
+
+    def update_many(self, user_id, tasks):
+        """
+        Apply (task_id, description, due_date, status) updates in one UPDATE ... FROM VALUES.
+        None fields are left unchanged; tasks the user does not own are skipped.
+        :return: A {task_id: task} mapping of the rows that were updated.
+        """
+        from psycopg2.extras import execute_values
+
+        # Quoted by psycopg2; "%" doubled so execute_values does not read it as a placeholder
+        user_id_literal = self.cursor.mogrify("%s::uuid", (user_id,)).decode().replace("%", "%%")
+        query = self.UPDATE_TASKS_SQL.format(user_id=user_id_literal)
+        rows = list(tasks)
+        returned = execute_values(
+            self.cursor, query, rows, template=self.UPDATE_TASKS_TEMPLATE, page_size=len(rows), fetch=True
+        )
+        return {str(row[0]): self.to_dict(row) for row in returned}
+
+    def delete_many(self, user_id, task_ids):
+        """
+        Delete the given tasks owned by the user in one statement.
+        :return: The set of task ids that were deleted.
+        """
+        self.cursor.execute(self.DELETE_TASKS_SQL, (user_id, list(task_ids)))
+        return {str(row[0]) for row in self.cursor.fetchall()}
+
+    def mark_overdue(self, today, after, limit):
+        """
+        Mark up to ``limit`` open tasks due before ``today`` as overdue,
+        starting after the (due_date, task_id) position ``after`` (None for
+        the beginning). Returns (rows marked, last position), the position
+        being None when nothing was marked.
+        """
+        if after:
+            query = self.MARK_OVERDUE_SQL.format(after=" AND (due_date, task_id) > (%s, %s)")
+            params = (today, after[0], after[1], limit)
+        else:
+            query = self.MARK_OVERDUE_SQL.format(after="")
+            params = (today, limit)
+        execute_prepared(self.cursor, query, params)
+        row = self.cursor.fetchone()
+        if not row:
+            return 0, None
+        return row[0], (row[1], str(row[2]))
+
+    def list(self, user_id, limit, status=None, due_before=None, due_after=None, after=None):
+        """
+        Return one page of the user's tasks and the cursor for the next page.
+
+        Pages are keyed on (created_at, task_id) rather than OFFSET, so each
+        page is a range scan on idx_tasks_user_created. ``after`` is a decoded
+        (created_at, task_id) cursor; the next cursor is None on the last page.
+        The page is a Rows sequence, serialized without per-row dicts.
+        """
+        filters, params = self._filters(status, due_before, due_after)
+        query = self.LIST_TASKS_SQL + filters
+        params = [user_id] + params
+        if after:
+            query += " AND (created_at, task_id) > (%s, %s)"
+            params.extend(after)
+        # Fetch one extra row to know whether another page exists
+        query += " ORDER BY created_at, task_id LIMIT %s"
+        params.append(limit + 1)
+
+        # Each combination of filters is its own (prepared) statement
+        execute_prepared(self.cursor, query, params)
+        rows = self.cursor.fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][4], rows[-1][0])
+        return Rows(self.TASK_FIELDS, rows), next_cursor
+
+    def search(self, user_id, text, limit, status=None, due_before=None, due_after=None, after=None):
+        """
+        Return one page of the user's tasks whose description matches
+        ``text``, best match first, and the cursor for the next page.
+
+        Every word of ``text`` must match as a prefix of a word in the
+        description (see prefix_query), so a partly typed word already
+        matches and results narrow as the user types. The match is a scan of
+        idx_tasks_search for this user only. Pages are keyed on (rank,
+        task_id); ``after`` is a decoded rank cursor. Each row carries its
+        rank after the task fields.
+        """
+        filters, filter_params = self._filters(status, due_before, due_after)
+        query = self.SEARCH_TASKS_SQL.format(filters=filters)
+        params = [self.prefix_query(text), user_id] + filter_params
+        if after:
+            # Ranks are real; comparing them as real keeps equal ranks equal across pages
+            query += " WHERE rank < %s::real OR (rank = %s::real AND task_id > %s)"
+            params.extend((after[0], after[0], after[1]))
+        query += " ORDER BY rank DESC, task_id LIMIT %s"
+        params.append(limit + 1)
+
+        execute_prepared(self.cursor, query, params)
+        rows = self.cursor.fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_rank_cursor(rows[-1][5], rows[-1][0])
+        return Rows(self.SEARCH_FIELDS, rows), next_cursor
+
+    def export(self, user_id):
+        """
+        Iterate over every task of the user, oldest first, as TASK_FIELDS
+        tuples. On a named (server-side) cursor the rows arrive itersize at a
+        time, so memory stays flat however many tasks there are; a plain
+        cursor would fetch them all at once.
+        """
+        self.cursor.execute(self.EXPORT_TASKS_SQL, (user_id,))
+        return iter(self.cursor)
+
+    @staticmethod
+    def prefix_query(text):
+        """
+        Turn free text into a tsquery string matching every word as a prefix,
+        e.g. "weekly rep" -> "weekly:* & rep:*". Only letters and digits are
+        kept, so user input can never be read as tsquery operators.
+        """
+        return " & ".join(f"{word}:*" for word in re.findall(r"[^\W_]+", text.lower()))
+
+    @staticmethod
+    def _filters(status, due_before, due_after):
+        """SQL appended to a task query's WHERE clause for the optional list filters, and its parameters."""
+        sql, params = "", []
+        if status:
+            sql += " AND status = %s"
+            params.append(status)
+        if due_before:
+            sql += " AND due_date < %s"
+            params.append(due_before)
+        if due_after:
+            sql += " AND due_date > %s"
+            params.append(due_after)
+        return sql, params
+
+    @staticmethod
+    def to_dict(row):
+        """Transform a task row into a dictionary for the response."""
+        return {
+            "task_id": row[0],
+            "description": row[1],
+            "due_date": row[2].isoformat() if row[2] else None,
+            "status": row[3],
+            "created_at": row[4].isoformat() if row[4] else None
+        }
@@ -0,0 +1,90 @@
+from commonUtil.db import execute_prepared
+
+
+class TaskSummaryRepository:
+    """
+    Data access for user_task_summaries, the per-user task counts by status
+    kept up to date by triggers on tasks (see
+    migrations/0012_user_task_summaries.sql).
+
+    Reading a summary is a primary key lookup however many tasks the user
+    has. A user with no row yet has no tasks.
+    """
+
+    STATUSES = ("pending", "in_progress", "completed", "overdue")
+
+    GET_SUMMARY_SQL = f"SELECT {', '.join(STATUSES)} FROM user_task_summaries WHERE user_id = %s"
+
+    # Reconciliation runs one user per short transaction. Locking the user's
+    # summary row serialises it with the triggers, which update that row in
+    # the same transaction as every task write; no table lock is needed.
+    LIST_USERS_SQL = "SELECT user_id FROM users WHERE user_id > %s ORDER BY user_id LIMIT %s"
+    LOCK_SUMMARY_SQL = GET_SUMMARY_SQL + " FOR UPDATE"
+    INSERT_EMPTY_SUMMARY_SQL = "INSERT INTO user_task_summaries (user_id) VALUES (%s) ON CONFLICT (user_id) DO NOTHING"
+    ACTUAL_COUNTS_SQL = f"""
+        SELECT {', '.join(f"COUNT(*) FILTER (WHERE status = '{status}')" for status in STATUSES)}
+        FROM tasks WHERE user_id = %s
+    """
+    SET_SUMMARY_SQL = f"UPDATE user_task_summaries SET {', '.join(f'{status} = %s' for status in STATUSES)} WHERE user_id = %s"
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def get(self, user_id):
+        """Return the user's task counts by status, and their total."""
+        execute_prepared(self.cursor, self.GET_SUMMARY_SQL, (user_id,))
+        row = self.cursor.fetchone() or (0,) * len(self.STATUSES)
+        summary = dict(zip(self.STATUSES, row))
+        summary["total"] = sum(row)
+        return summary
+
+    def list_users(self, after, limit):
+        """Return up to ``limit`` user_ids after ``after`` (None for the first batch), in order."""
+        self.cursor.execute(self.LIST_USERS_SQL, (after or "00000000-0000-0000-0000-000000000000", limit))
+        return [str(row[0]) for row in self.cursor.fetchall()]
+
+    def _lock(self, user_id):
+        execute_prepared(self.cursor, self.LOCK_SUMMARY_SQL, (user_id,))
+        row = self.cursor.fetchone()
+        return tuple(row) if row else None
+
+    def _count(self, user_id):
+        execute_prepared(self.cursor, self.ACTUAL_COUNTS_SQL, (user_id,))
+        return tuple(self.cursor.fetchone())
+
+    def reconcile(self, user_id, dry_run=False):
+        """
+        Compare the user's stored summary with counts taken from tasks and,
+        unless ``dry_run``, correct it. Returns None when they match, else
+        {"user_id", "<status>": {"stored", "actual"}} for the statuses that
+        differ; "stored" is None when the user had no summary row.
+
+        Must run in READ COMMITTED, in a transaction of its own that the
+        caller commits (or rolls back) right after, releasing the row lock.
+        The count is taken after the lock, in a new snapshot: writes that
+        committed first are in it, and writes still in flight add their
+        delta on top once the lock is released.
+        """
+        stored = self._lock(user_id)
+        actual = self._count(user_id)
+        if stored is None and not any(actual):
+            return None
+        reported = stored
+        if stored is None and not dry_run:
+            # Lock a row to write to; a concurrent first write may have just created it
+            self.cursor.execute(self.INSERT_EMPTY_SUMMARY_SQL, (user_id,))
+            created = self.cursor.rowcount == 1
+            stored = self._lock(user_id)
+            actual = self._count(user_id)
+            reported = None if created else stored
+        if stored == actual:
+            return None
+
+        entry = {"user_id": user_id}
+        for i, status in enumerate(self.STATUSES):
+            previous = None if reported is None else reported[i]
+            if previous != actual[i]:
+                entry[status] = {"stored": previous, "actual": actual[i]}
+        if not dry_run:
+            execute_prepared(self.cursor, self.SET_SUMMARY_SQL, (*actual, user_id))
+        return entry
@@ -1,7 +1,8 @@
 import re
+import uuid
 from datetime import datetime
 
-from commonUtil.constants.app_constants import app_constants, TaskStatus
+from commonUtil.constants.app_constants import app_constants, TaskStatus, BatchOperation
 from commonUtil.constants.error_messages import error_messages
 from commonUtil.constants.http_status import http_status
 
@@ -50,9 +51,140 @@ def validate_task_input(description, due_date, status):
     
     if due_date and not re.match(r'^\d{4}-\d{2}-\d{2}$', due_date):
         return error_messages.INVALID_DUE_DATE
-    if datetime.strptime(due_date, '%Y-%m-%d') < datetime.now():
+    if due_date and datetime.strptime(due_date, '%Y-%m-%d') < datetime.now():
         return error_messages.DUE_DATE_IN_PAST
     
     if status not in [status.value for status in TaskStatus]:
         return error_messages.INVALID_TASK_STATUS
-    
\ No newline at end of file
+    
+
+def validate_due_date(due_date):
+    """Validate the due date format and check if it's in the past."""
+    try:
+        due_date_obj = datetime.strptime(due_date, "%Y-%m-%d")
+        if due_date_obj < datetime.now():
+            return error_messages.DUE_DATE_IN_PAST
+        return None
+    except ValueError:
+        return error_messages.INVALID_DATE_FORMAT
+
+def validate_task_update_input(description, due_date, status):
+    """
+    Validate a partial task update; every field is optional.
+    :return: None if valid else an error message.
+    """
+
+    if description is not None and (not isinstance(description, str) or not 1 <= len(description) <= 255):
+        return error_messages.INVALID_DESCRIPTION
+
+    if due_date:
+        validation_error = validate_due_date(due_date)
+        if validation_error:
+            return validation_error
+
+    if status and status not in [s.value for s in TaskStatus]:
+        return error_messages.INVALID_TASK_STATUS
+
+    return None
+
+def validate_task_list_params(limit, status, due_before, due_after, q=None):
+    """
+    Validate the query parameters of the task list endpoint.
+    :param limit: The requested page size, as a string.
+    :param status: Optional task status filter.
+    :param due_before: Optional upper bound (exclusive) for the due date.
+    :param due_after: Optional lower bound (exclusive) for the due date.
+    :param q: Optional search text.
+    :return: None if valid else an error message.
+    """
+
+    if limit is not None:
+        if not limit.isdigit() or not 1 <= int(limit) <= app_constants.MAX_TASK_PAGE_SIZE:
+            return error_messages.INVALID_PAGE_LIMIT
+
+    if status and status not in [status.value for status in TaskStatus]:
+        return error_messages.INVALID_TASK_STATUS
+
+    for date_value in (due_before, due_after):
+        if date_value:
+            try:
+                datetime.strptime(date_value, '%Y-%m-%d')
+            except ValueError:
+                return error_messages.INVALID_DATE_FORMAT
+
+    if q is not None:
+        if len(q) > app_constants.MAX_SEARCH_QUERY_LENGTH or not re.search(r"[^\W_]", q):
+            return error_messages.INVALID_SEARCH_QUERY
+
+    return None
+
+def validate_image_size(image_size):
+    """
+    Validate the image_size query parameter of GET /profile.
+    :param image_size: The requested thumbnail edge in pixels, as a string.
+    :return: None if valid else an error message.
+    """
+    if not image_size.isdigit() or not 1 <= int(image_size) <= app_constants.MAX_PROFILE_IMAGE_SIZE:
+        return error_messages.INVALID_IMAGE_SIZE
+    return None
+
+def validate_batch_size(operations):
+    """
+    Validate the shape of a POST /tasks/batch request.
+    :param operations: The "operations" value from the request body.
+    :return: None if valid else an error message.
+    """
+
+    if not isinstance(operations, list) or not operations:
+        return error_messages.INVALID_BATCH
+
+    if len(operations) > app_constants.MAX_BATCH_OPERATIONS:
+        return error_messages.INVALID_BATCH
+
+    return None
+
+def validate_batch_operations(operations):
+    """
+    Validate every operation of a batch in a single pass.
+    :param operations: A list of {"op": ..., ...} dictionaries.
+    :return: A list of {"index": i, "error": message} entries, empty if all are valid.
+    """
+
+    errors = []
+    seen_task_ids = set()
+    valid_ops = [op.value for op in BatchOperation]
+    for index, operation in enumerate(operations):
+        error = None
+        op = operation.get("op") if isinstance(operation, dict) else None
+        if op not in valid_ops:
+            error = error_messages.INVALID_BATCH_OPERATION
+        elif op == BatchOperation.CREATE.value:
+            description = operation.get("description")
+            due_date = operation.get("due_date")
+            if description is not None and not isinstance(description, str):
+                error = error_messages.INVALID_DESCRIPTION
+            elif due_date is not None and not isinstance(due_date, str):
+                error = error_messages.INVALID_DUE_DATE
+            else:
+                try:
+                    error = validate_task_input(description, due_date, operation.get("status", TaskStatus.PENDING.value))
+                except ValueError:
+                    error = error_messages.INVALID_DUE_DATE
+        else:
+            task_id = operation.get("task_id")
+            try:
+                task_id = str(uuid.UUID(str(task_id)))
+            except ValueError:
+                error = error_messages.INVALID_TASK_ID if task_id else error_messages.MISSING_TASK_ID
+            if not error and task_id in seen_task_ids:
+                error = error_messages.DUPLICATE_BATCH_TASK
+            seen_task_ids.add(task_id)
+            if not error and op == BatchOperation.UPDATE.value:
+                due_date = operation.get("due_date")
+                if due_date is not None and not isinstance(due_date, str):
+                    error = error_messages.INVALID_DATE_FORMAT
+                else:
+                    error = validate_task_update_input(operation.get("description"), due_date, operation.get("status"))
+        if error:
+            errors.append({"index": index, "error": error})
+    return errors
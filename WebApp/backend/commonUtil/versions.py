@@ -0,0 +1,85 @@
+import hashlib
+import json
+
+from commonUtil.db import execute_prepared
+from commonUtil.request_helpers import get_header
+
+
+class DataVersionRepository:
+    """
+    Data access for user_data_versions, the per-user change counters kept up
+    to date by triggers on tasks and user_profiles (see
+    migrations/0011_user_data_versions.sql).
+
+    Reading a version is a primary key lookup, cheap enough to run before
+    deciding whether a GET needs to query and serialize anything at all.
+    A user with no row yet is at version 0.
+    """
+
+    GET_VERSION_SQL = "SELECT {column} FROM user_data_versions WHERE user_id = %s"
+    # Creates the row if needed so there is always something to lock; DO UPDATE takes the row lock
+    LOCK_VERSION_SQL = """
+        INSERT INTO user_data_versions (user_id) VALUES (%s)
+        ON CONFLICT (user_id) DO UPDATE SET {column} = user_data_versions.{column}
+        RETURNING {column}
+    """
+
+    TASKS = "tasks_version"
+    PROFILE = "profile_version"
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def get(self, user_id, column, lock=False):
+        """
+        Return the user's version for ``column`` (TASKS or PROFILE).
+        With lock=True the row is locked until the transaction ends, so no
+        other write can bump it in between.
+        """
+        sql = self.LOCK_VERSION_SQL if lock else self.GET_VERSION_SQL
+        execute_prepared(self.cursor, sql.format(column=column), (user_id,))
+        row = self.cursor.fetchone()
+        return row[0] if row else 0
+
+
+def make_etag(scope, version, variant=None):
+    """
+    Build a strong ETag such as "tasks.12.1f3a...". ``variant`` holds whatever
+    else shapes the body for the same data (query parameters, image mode).
+    """
+    etag = f"{scope}.{version}"
+    if variant:
+        digest = hashlib.sha1(json.dumps(variant, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        etag = f"{etag}.{digest}"
+    return f'"{etag}"'
+
+
+def etag_version(etag):
+    """Return the data version an ETag was built from, or None if it is not one of ours."""
+    parts = etag.strip().removeprefix("W/").strip('"').split(".")
+    if len(parts) < 2 or not parts[1].isdigit():
+        return None
+    return int(parts[1])
+
+
+def parse_etag_list(value):
+    """Split an If-None-Match / If-Match header into its entity tags."""
+    return [tag.strip() for tag in value.split(",") if tag.strip()] if value else []
+
+
+def if_none_match(headers, etag):
+    """True if the request's If-None-Match covers ``etag`` (weak comparison, as RFC 9110 requires)."""
+    tags = parse_etag_list(get_header(headers, "If-None-Match"))
+    return "*" in tags or etag in [tag.removeprefix("W/") for tag in tags]
+
+
+def if_match_versions(headers):
+    """
+    Return the data versions listed in If-Match, None when the header is
+    absent, or an empty set when it holds no ETag of ours. "*" matches any
+    version and also comes back as None.
+    """
+    tags = parse_etag_list(get_header(headers, "If-Match"))
+    if not tags or "*" in tags:
+        return None
+    return {version for version in map(etag_version, tags) if version is not None}
@@ -0,0 +1,62 @@
+import logging
+import json
+
+from commonUtil.response_helpers import create_error_response, create_success_response
+from commonUtil.constants.error_messages import error_messages
+from commonUtil.constants.http_status import http_status
+from commonUtil.constants.app_constants import app_constants
+from commonUtil.auth import require_auth, get_user_id
+from commonUtil.config import config
+from commonUtil.s3 import profile_upload_key, generate_presigned_post
+from commonUtil.request_helpers import get_body
+from commonUtil.metrics import instrument
+
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+@instrument
+@require_auth
+def lambda_handler(event, context):
+    """
+    AWS Lambda handler for POST /user/profile/image/upload-url endpoint.
+    Returns a presigned S3 POST so the browser can upload the profile image
+    directly to S3; the image bytes never pass through API Gateway or Lambda.
+
+    Request body:
+        {"content_type": "image/png"}
+
+    Response body:
+        {"upload": {"url": "...", "fields": {...}}}
+
+    The client submits a multipart/form-data POST to ``upload.url`` with every
+    entry of ``upload.fields`` followed by the file. S3 enforces the content
+    type and the MAX_PROFILE_IMAGE_BYTES limit. The upload lands under
+    profile_uploads/, where process_profile_image generates the thumbnails
+    and records them on the profile.
+
+    Args:
+        event (dict): The Lambda event object containing request details.
+        context (object): The Lambda context object providing runtime information.
+
+    Returns:
+        dict: A response object with status code, body, and headers.
+    """
+    try:
+        user_id = get_user_id(event)
+
+        try:
+            body = json.loads(get_body(event) or "{}")
+        except json.JSONDecodeError:
+            return create_error_response(http_status.BAD_REQUEST, error_messages.INVALID_JSON)
+
+        content_type = body.get("content_type") if isinstance(body, dict) else None
+        if not isinstance(content_type, str) or content_type.lower() not in app_constants.ALLOWED_IMAGE_TYPES:
+            return create_error_response(http_status.UNSUPPORTED_MEDIA_TYPE, error_messages.UNSUPPORTED_IMAGE_TYPE)
+
+        upload = generate_presigned_post(profile_upload_key(user_id), content_type.lower(), config.MAX_PROFILE_IMAGE_BYTES)
+        return create_success_response(http_status.OK, {"upload": upload})
+    except Exception as e:
+        logger.error(f"Error creating profile image upload: {str(e)}")
+        return create_error_response(http_status.INTERNAL_SERVER_ERROR, error_messages.INTERNAL_ERROR.format(str(e)))
@@ -1,26 +1,105 @@
-import jwt
 import logging
 import json
+import threading
+import time
 import base64
-import boto3
 
-from commonUtil.response_helpers import create_error_response, create_success_response
+from commonUtil.response_helpers import (
+    create_error_response, create_success_response, create_not_modified_response, etag_headers,
+)
 from commonUtil.constants.error_messages import error_messages
 from commonUtil.constants.http_status import http_status
-from commonUtil.auth import validate_jwt, extract_token_from_cookie
+from commonUtil.auth import require_auth, get_user_id
 from commonUtil.db import get_cursor
+from commonUtil.profile_repository import ProfileRepository
 from commonUtil.config import config
+from commonUtil.constants.app_constants import app_constants, ProfileImageMode
+from commonUtil.validators import validate_image_size
+from commonUtil.s3 import get_s3_client, generate_presigned_get_url, profile_image_key
+from commonUtil.images import parse_image_record, select_derivative
+from commonUtil.versions import DataVersionRepository, make_etag, if_none_match
+from commonUtil.request_helpers import get_header, requires_primary
+from commonUtil.metrics import instrument
+from commonUtil.concurrency import submit
 
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# (user_id, image_size) -> image key served last time; lets an inline request
+# start the S3 read before the database has said which key is current. Keys
+# are content-addressed, so a stale entry is simply not used.
+_image_keys = {}
+_image_keys_lock = threading.Lock()
+_IMAGE_KEY_CACHE_MAX_SIZE = 1024
 
+
+def _remember_image_key(user_id, image_size, key):
+    with _image_keys_lock:
+        if len(_image_keys) >= _IMAGE_KEY_CACHE_MAX_SIZE:
+            _image_keys.clear()
+        _image_keys[(user_id, image_size)] = key
+
+
+def _fetch_inline_image(key):
+    """Returns the object at key as a base64 data URL."""
+    response = get_s3_client().get_object(Bucket=config.S3_BUCKET_NAME, Key=key)
+    content_type = response.get("ContentType") or "image/jpeg"
+    return f"data:{content_type};base64,{base64.b64encode(response['Body'].read()).decode('utf-8')}"
+
+
+def _prefetch_image(key):
+    """
+    Runs on a worker thread while the profile query runs. Builds the S3
+    client (a cold start's boto3 import) and, when the image key is already
+    known, reads the image too. Returns (key, data URL) or None.
+    """
+    get_s3_client()
+    if key is None:
+        return None
+    return key, _fetch_inline_image(key)
+
+
+def _prefetched_image(prefetch, key):
+    """The prefetched data URL if it is for key, else None (the caller fetches it)."""
+    try:
+        result = prefetch.result()
+    except Exception as e:
+        logger.warning(f"Error prefetching image from S3: {str(e)}")
+        return None
+    if result and result[0] == key:
+        return result[1]
+    return None
+
+
+@instrument
+@require_auth
 def lambda_handler(event, context):
     """
     AWS Lambda handler for GET /profile endpoint.
     Retrieves the user's profile information.
 
+    The profile image is returned as a short-lived presigned S3 URL of the
+    smallest thumbnail at least ?image_size pixels wide (default 128). Pass
+    ?image_mode=inline (or set PROFILE_IMAGE_MODE=inline) to get the old
+    base64 data URL instead.
+
+    Responses carry an ETag built from the user's profile version. A request
+    whose If-None-Match still matches gets a 304 after a single primary key
+    lookup. In presigned mode the ETag also changes every
+    PRESIGNED_URL_REFRESH_MARGIN seconds, so a revalidated body never holds
+    an expired URL.
+
+    Reads go to the read replica when one is configured; a client that has
+    just changed its profile sends "X-Consistency: strong" to read from the
+    primary.
+
+    S3 work starts on a worker thread before the database lookup, so the two
+    overlap: the S3 client is built (on a cold start) and, in inline mode,
+    the image this user was last served is read. The prefetch is dropped if
+    the lookup ends in a 304, a 404 or a profile without an image, or names
+    a different image.
+
     Args:
         event (dict): The Lambda event object containing request details.
         context (object): The Lambda context object providing runtime information.
@@ -30,53 +109,66 @@ def lambda_handler(event, context):
     """
     
     try:
-        # Authentication - Extract and validate token
-        token = extract_token_from_cookie(event.get("headers", {}))
-        if not token:
-            return create_error_response(http_status.UNAUTHORIZED, error_messages.MISSING_AUTH_TOKEN)
-        
-        try:
-            payload = validate_jwt(token, config.JWT_SECRET)
-            user_id = payload.get("user_id")
-            if not user_id:
-                return create_error_response(http_status.UNAUTHORIZED, error_messages.INVALID_CREDENTIALS)
-        except jwt.ExpiredSignatureError:
-            return create_error_response(http_status.UNAUTHORIZED, error_messages.JWT_EXPIRED)
-        except jwt.InvalidTokenError:
-            return create_error_response(http_status.UNAUTHORIZED, error_messages.JWT_INVALID)
-        
+        user_id = get_user_id(event)
+        params = event.get("queryStringParameters") or {}
+        image_mode = params.get("image_mode") or config.PROFILE_IMAGE_MODE
+        if image_mode not in [mode.value for mode in ProfileImageMode]:
+            return create_error_response(http_status.BAD_REQUEST, error_messages.INVALID_IMAGE_MODE)
+        image_size = params.get("image_size") or str(app_constants.DEFAULT_PROFILE_IMAGE_SIZE)
+        validation_error = validate_image_size(image_size)
+        if validation_error:
+            return create_error_response(http_status.BAD_REQUEST, validation_error)
+
+        variant = {"image_mode": image_mode, "image_size": image_size}
+        if image_mode == ProfileImageMode.PRESIGNED.value:
+            variant["url_epoch"] = int(time.time() // config.PRESIGNED_URL_REFRESH_MARGIN)
+
+        inline = image_mode == ProfileImageMode.INLINE.value
+        prefetch = submit(_prefetch_image, _image_keys.get((user_id, image_size)) if inline else None)
+
         # Fetch user profile from the database
-        with get_cursor() as cursor:
-            cursor.execute(
-                """SELECT u.email, u.username, up.profile_image_url 
-                FROM users u LEFT JOIN user_profiles up ON u.user_id = up.user_id
-                WHERE u.user_id = %s""",
-                (user_id,)
-            )
-            user_profile = cursor.fetchone()
-            if not user_profile:
-                return create_error_response(http_status.NOT_FOUND, error_messages.USER_NOT_FOUND)
+        try:
+            with get_cursor(readonly=not requires_primary(event.get("headers"))) as cursor:
+                version = DataVersionRepository(cursor).get(user_id, DataVersionRepository.PROFILE)
+                etag = make_etag("profile", version, variant)
+                if if_none_match(event.get("headers"), etag):
+                    prefetch.cancel()
+                    return create_not_modified_response(etag)
+
+                user_profile = ProfileRepository(cursor).get(user_id)
+                if not user_profile:
+                    prefetch.cancel()
+                    return create_error_response(http_status.NOT_FOUND, error_messages.USER_NOT_FOUND)
+        except Exception:
+            prefetch.cancel()
+            raise
         email, username, profile_image_url = user_profile
-        # Decode the base64 image if it exists
         if profile_image_url:
-            s3_client = boto3.client("s3")
-            bucket_name = config.S3_BUCKET_NAME
-            object_key = f"profile_images/{user_id}.jpg"
+            image_record = parse_image_record(profile_image_url)
+            # Images uploaded before thumbnails existed only have the original
+            image_key = select_derivative(image_record, int(image_size)) if image_record else profile_image_key(user_id)
+
+        if not profile_image_url:
+            # Nothing to show; whatever the prefetch read is dropped
+            prefetch.cancel()
+            profile_image_url = None
+        elif inline:
+            # Opt-in legacy mode: embed the image as a base64 data URL
             try:
-                response = s3_client.get_object(Bucket=bucket_name, Key=object_key)
-                profile_image_data = response["Body"].read()
-                profile_image_url = f"data:image/jpeg;base64,{base64.b64encode(profile_image_data).decode('utf-8')}"
+                profile_image_url = _prefetched_image(prefetch, image_key) or _fetch_inline_image(image_key)
             except Exception as e:
                 logger.error(f"Error fetching image from S3: {str(e)}")
                 return create_error_response(http_status.INTERNAL_SERVER_ERROR, error_messages.INTERNAL_ERROR.format(str(e)))
+            _remember_image_key(user_id, image_size, image_key)
         else:
-            profile_image_url = None
+            # Let the browser fetch the image straight from S3
+            profile_image_url = generate_presigned_get_url(image_key)
         
         return create_success_response(http_status.OK, {
             "email": email,
             "username": username,
             "profile_image_url": profile_image_url
-        })
+        }, etag_headers(etag), accept_encoding=get_header(event.get("headers"), "Accept-Encoding") or "")
     except Exception as e:
         logger.error(f"Error fetching user profile: {str(e)}")
         return create_error_response(http_status.INTERNAL_SERVER_ERROR, error_messages.INTERNAL_ERROR.format(str(e)))
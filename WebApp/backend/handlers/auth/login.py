@@ -1,10 +1,7 @@
 import json
-import os
-import bcrypt
-import jwt
 import logging
 
-from commonUtil.db import get_cursor # Import get_cursor instead of get_db_session
+from commonUtil.db import get_cursor, execute_prepared
 from commonUtil.auth import generate_jwt
 from commonUtil.validators import validate_login_input
 from commonUtil.config import config # Keep config for JWT_SECRET
@@ -12,8 +9,11 @@ from commonUtil.constants.app_constants import app_constants
 from commonUtil.constants.error_messages import error_messages
 from commonUtil.constants.http_status import http_status
 from commonUtil.response_helpers import create_error_response, create_success_response, generate_auth_cookie
+from commonUtil.request_helpers import get_body
+from commonUtil.metrics import instrument
 
 
+@instrument
 def lambda_handler(event, context):
     """
     AWS Lambda handler for POST /login endpoint.
@@ -22,7 +22,7 @@ def lambda_handler(event, context):
         
     try:
         # Parse the request body
-        body = json.loads(event["body"])
+        body = json.loads(get_body(event))
         username = body.get("username")
         password = body.get("password")
 
@@ -36,8 +36,8 @@ def lambda_handler(event, context):
         try:
             # Use the new get_cursor context manager
             with get_cursor() as cursor:
-                # Fetch the user from the database
-                cursor.execute("SELECT user_id, username, password_hash FROM users WHERE username = %s", (username,))
+                # Fetch the user from the database; usernames are case-insensitive (idx_users_username_lower)
+                execute_prepared(cursor, "SELECT user_id, username, password_hash FROM users WHERE lower(username) = lower(%s)", (username,))
                 user = cursor.fetchone()
         except Exception as db_error:
             logging.error(f"Database error: {db_error}")
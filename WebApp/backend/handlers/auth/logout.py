@@ -3,8 +3,10 @@ from commonUtil.constants.http_status import http_status
 from commonUtil.constants.app_constants import app_constants
 from commonUtil.constants.error_messages import error_messages
 from commonUtil.response_helpers import create_error_response, create_success_response
+from commonUtil.metrics import instrument
 
 
+@instrument
 def lambda_handler(event, context):
     """
     AWS Lambda handler for POST /logout endpoint.
@@ -0,0 +1,52 @@
+import logging
+from urllib.parse import unquote_plus
+
+from commonUtil.db import get_cursor
+from commonUtil.profile_repository import ProfileRepository
+from commonUtil.config import config
+from commonUtil.images import get_image_store, process_profile_image, encode_image_record
+from commonUtil.metrics import instrument
+
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+@instrument
+def lambda_handler(event, context):
+    """
+    Lambda function triggered by S3 ObjectCreated events on profile_uploads/.
+
+    For every image a browser uploaded through a presigned POST it:
+    1. Reads the upload (keyed by user_id)
+    2. Stores the image and its thumbnails under its content hash
+    3. Records the thumbnails on the user's profile
+    4. Deletes the upload
+
+    Uploads that are not valid images are deleted and logged.
+
+    Args:
+        event (dict): S3 event notification
+        context (object): Lambda Context runtime methods and attributes
+
+    Returns:
+        dict: The number of uploads processed and rejected.
+    """
+    store = get_image_store()
+    processed = rejected = 0
+    for record in event.get("Records", []):
+        key = unquote_plus(record["s3"]["object"]["key"])
+        user_id = key.rsplit("/", 1)[-1]
+        try:
+            if record["s3"]["object"].get("size", 0) > config.MAX_PROFILE_IMAGE_BYTES:
+                raise ValueError("Image too large")
+            image_record = process_profile_image(store.get(key), store)
+            with get_cursor(autocommit=True) as cursor:
+                if not ProfileRepository(cursor).set_image_url(user_id, encode_image_record(image_record)):
+                    raise ValueError(f"No profile for user {user_id}")
+            processed += 1
+        except ValueError as e:
+            logger.error(f"Rejected profile image upload {key}: {str(e)}")
+            rejected += 1
+        store.delete(key)
+    return {"processed": processed, "rejected": rejected}
@@ -1,81 +1,108 @@
-import jwt
 import logging
 import json
-import base64
-import boto3
+import binascii
 
 from commonUtil.response_helpers import create_error_response, create_success_response
 from commonUtil.constants.error_messages import error_messages
 from commonUtil.constants.http_status import http_status
-from commonUtil.auth import validate_jwt, extract_token_from_cookie
+from commonUtil.constants.app_constants import app_constants
+from commonUtil.auth import require_auth, get_user_id
 from commonUtil.db import get_cursor
+from commonUtil.profile_repository import ProfileRepository
 from commonUtil.config import config
+from commonUtil.s3 import decoded_base64_length, iter_base64_chunks, generate_presigned_get_url
+from commonUtil.images import get_image_store, process_profile_image_stream, encode_image_record, select_derivative
+from commonUtil.request_helpers import get_body, get_header
+from commonUtil.metrics import instrument
 
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 
-def process_image_data(image_data):
-    """Process and decode base64 image data.
+def parse_image_data_url(image_data):
+    """Parse the prefix of a base64 data URL without copying the payload.
 
     input example: "data:image/jpeg;base64,/9j/4AAQSkZJRgABAQEAAAAAAAD/..."
-    output: /9j/4AAQSkZJRgABAQEAAAAAAAD/..."
-    This function removes the prefix and decodes the base64 string into bytes.
+    output: ("image/jpeg", 23), the content type and the offset where the
+    base64 payload starts.
     """
-    try:
-        # Remove "data:image/jpeg;base64," prefix and decode
-        image_bytes = base64.b64decode(image_data.split(",")[1])
-        return image_bytes
-    except Exception as e:
-        logger.error(f"Error decoding image data: {str(e)}")
+    # The prefix is short; don't scan a multi-megabyte payload for the comma
+    comma = image_data.find(",", 0, 100)
+    if not image_data.startswith("data:") or comma == -1:
+        raise ValueError("Invalid image data format")
+    media_type, _, encoding = image_data[5:comma].partition(";")
+    if encoding != "base64":
         raise ValueError("Invalid image data format")
+    return media_type.strip().lower(), comma + 1
 
 
-def upload_image_to_s3(image_bytes, user_id):
-    """Upload image to S3 and return the image URL."""
+def store_image(image_data, start, content_type):
+    """
+    Decode base64 image data chunk by chunk, streaming it to the store, and
+    build its thumbnails; returns the record for profile_image_url.
+    """
     try:
-        s3_client = boto3.client('s3')
-        bucket_name = config.S3_BUCKET_NAME
-        object_key = f"profile_images/{user_id}.jpg"
-        
-        s3_client.put_object(
-            Bucket=bucket_name,
-            Key=object_key,
-            Body=image_bytes,
-            ContentType="image/jpeg",
-            ACL="public-read"
-        )
-        
-        image_url = f"https://{bucket_name}.s3.amazonaws.com/{object_key}"
-        logger.info(f"Image uploaded successfully: {image_url}")
-        return image_url
+        chunks = iter_base64_chunks(image_data, start, app_constants.BASE64_DECODE_CHUNK_SIZE)
+        record = process_profile_image_stream(chunks, content_type, get_image_store())
+        logger.info(f"Image stored: {record['original']}")
+        return record
+    except (binascii.Error, ValueError):
+        raise
     except Exception as e:
         logger.error(f"Error uploading to S3: {str(e)}")
         raise
 
 
-def update_profile_image_url(user_id, image_url):
-    """Update the user's profile image URL in the database."""
-    with get_cursor() as cursor:
-        cursor.execute(
-            "UPDATE user_profiles SET profile_image_url = %s WHERE user_id = %s",
-            (image_url, user_id)
-        )
-        cursor.connection.commit()
-        if cursor.rowcount == 0:
+def update_profile_image_url(user_id, record):
+    """Record the user's profile image and thumbnails in the database."""
+    with get_cursor(autocommit=True) as cursor:
+        if not ProfileRepository(cursor).set_image_url(user_id, encode_image_record(record)):
             raise ValueError("Failed to update profile image URL in database")
 
 
+def read_image_payload(event):
+    """
+    Return (image_data, start, content_type) for either request format:
+    a raw image body (binary media type, base64-encoded by API Gateway) or
+    the JSON {"image": "data:<type>;base64,..."} body.
+    Raises ValueError with the error message to return.
+    """
+    content_type = (get_header(event.get("headers"), "Content-Type") or "").split(";")[0].strip().lower()
+    if event.get("isBase64Encoded") and content_type.startswith("image/"):
+        return event.get("body") or "", 0, content_type
+
+    try:
+        body = json.loads(get_body(event))
+    except (json.JSONDecodeError, TypeError):
+        raise ValueError(error_messages.INVALID_JSON)
+    image_data = body.get("image") if isinstance(body, dict) else None
+    if not image_data or not isinstance(image_data, str):
+        raise ValueError(error_messages.MISSING_IMAGE_DATA)
+    try:
+        image_type, start = parse_image_data_url(image_data)
+    except ValueError:
+        raise ValueError(error_messages.INVALID_IMAGE_DATA)
+    return image_data, start, image_type
+
+
+@instrument
+@require_auth
 def lambda_handler(event, context):
     """
     Lambda function to handle the upload of a profile image.
     
     This function processes a request to update a user's profile image. It:
     1. Authenticates the user via JWT token
-    2. Extracts the base64 encoded image from the request
-    3. Uploads the image to S3
-    4. Updates the user's profile record with the new image URL
+    2. Reads the image from a raw image body or a JSON base64 data URL
+    3. Checks the content type and decoded size before decoding anything
+    4. Streams the decoded image to S3 a part at a time, hashing it on the
+       way, and stores it and its thumbnails under its content hash; an
+       image that was uploaded before is not resized again
+    5. Records the thumbnails on the user's profile
+    
+    Images close to the API Gateway payload limit should be uploaded straight
+    to S3 through POST /user/profile/image/upload-url instead.
     
     Args:
         event (dict): API Gateway Lambda Proxy Input Format containing request data
@@ -87,46 +114,41 @@ def lambda_handler(event, context):
               status code, headers, and body (success or error message)
     """
     try:
-        # Authentication - Extract and validate token
-        token = extract_token_from_cookie(event.get("headers", {}))
-        if not token:
-            return create_error_response(http_status.UNAUTHORIZED, error_messages.MISSING_AUTH_TOKEN)
-        
-        try:
-            payload = validate_jwt(token, config.JWT_SECRET)
-            user_id = payload.get("user_id")
-            if not user_id:
-                return create_error_response(http_status.UNAUTHORIZED, error_messages.INVALID_CREDENTIALS)
-        except jwt.ExpiredSignatureError:
-            return create_error_response(http_status.UNAUTHORIZED, error_messages.JWT_EXPIRED)
-        except jwt.InvalidTokenError:
-            return create_error_response(http_status.UNAUTHORIZED, error_messages.JWT_INVALID)
+        user_id = get_user_id(event)
 
         # Parse request data
-        body = json.loads(event["body"])
-        image_data = body.get("image")
-        if not image_data:
+        try:
+            image_data, start, content_type = read_image_payload(event)
+        except ValueError as e:
+            return create_error_response(http_status.BAD_REQUEST, str(e))
+
+        # Reject before decoding: type from the header/prefix, size from the base64 length
+        if content_type not in app_constants.ALLOWED_IMAGE_TYPES:
+            return create_error_response(http_status.UNSUPPORTED_MEDIA_TYPE, error_messages.UNSUPPORTED_IMAGE_TYPE)
+        image_size = decoded_base64_length(image_data, start)
+        if image_size <= 0:
             return create_error_response(http_status.BAD_REQUEST, error_messages.MISSING_IMAGE_DATA)
+        if image_size > config.MAX_PROFILE_IMAGE_BYTES:
+            return create_error_response(
+                http_status.PAYLOAD_TOO_LARGE, error_messages.IMAGE_TOO_LARGE.format(config.MAX_PROFILE_IMAGE_BYTES)
+            )
         
-        # Process image data
+        # Stream the decoded original to S3, then build its thumbnails
         try:
-            image_bytes = process_image_data(image_data)
-        except ValueError:
+            record = store_image(image_data, start, content_type)
+        except (binascii.Error, ValueError):
             return create_error_response(http_status.BAD_REQUEST, error_messages.INVALID_IMAGE_DATA)
-        
-        # Upload to S3
-        try:
-            image_url = upload_image_to_s3(image_bytes, user_id)
         except Exception as e:
             logger.error(f"S3 upload error: {str(e)}")
             return create_error_response(http_status.INTERNAL_SERVER_ERROR, error_messages.INTERNAL_ERROR.format("Failed to upload image"))
         
         # Update database
         try:
-            update_profile_image_url(user_id, image_url)
+            update_profile_image_url(user_id, record)
         except ValueError:
             return create_error_response(http_status.INTERNAL_SERVER_ERROR, error_messages.PROFILE_UPDATE_FAILED)
         
+        image_url = generate_presigned_get_url(select_derivative(record, app_constants.DEFAULT_PROFILE_IMAGE_SIZE))
         return create_success_response(http_status.OK, {"message": "Profile image uploaded successfully.", "profile_image_url": image_url})
     
     except Exception as e:
@@ -0,0 +1,87 @@
+import importlib
+import logging
+
+from commonUtil.response_helpers import create_error_response
+from commonUtil.constants.error_messages import error_messages
+from commonUtil.constants.http_status import http_status
+from commonUtil.metrics import instrument
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+API_PREFIX = "/task-management"
+
+# (method, API Gateway resource) -> module holding the route's lambda_handler,
+# relative to this package. Keep in sync with the events in template-router.yaml.
+ROUTES = {
+    ("POST", "/login"): "auth.login",
+    ("POST", "/logout"): "auth.logout",
+    ("GET", "/user/profile"): "auth.get_user_profile",
+    ("POST", "/user/profile/image"): "auth.upload_profile_image",
+    ("POST", "/user/profile/image/upload-url"): "auth.create_profile_image_upload",
+    ("POST", "/tasks"): "tasks.create_task",
+    ("GET", "/tasks"): "tasks.get_tasks",
+    ("GET", "/tasks/summary"): "tasks.get_task_summary",
+    ("POST", "/tasks/export"): "tasks.export_tasks",
+    ("POST", "/tasks/batch"): "tasks.batch_tasks",
+    ("PUT", "/tasks/{task_id}"): "tasks.update_task",
+    ("DELETE", "/tasks/{task_id}"): "tasks.delete_task",
+}
+
+# The per-function deployment uses handlers/auth or handlers/tasks as the code
+# root, the router handlers/ itself; tests import everything as handlers.*
+_MODULE_PREFIX = f"{__package__}." if __package__ else ""
+
+# Precompiled lookup tables, keyed on the full resource as API Gateway sends it
+_ROUTE_MODULES = {(method, API_PREFIX + resource): _MODULE_PREFIX + module for (method, resource), module in ROUTES.items()}
+_RESOURCE_METHODS = {}
+for _method, _resource in _ROUTE_MODULES:
+    _RESOURCE_METHODS.setdefault(_resource, []).append(_method)
+
+# Module name -> lambda_handler, filled in on a route's first request
+_handlers = {}
+
+
+def resolve(method, resource):
+    """
+    Returns the lambda_handler serving a method and resource, importing its
+    module on first use, or None if no route matches.
+    """
+    module_name = _ROUTE_MODULES.get((method, resource))
+    if module_name is None:
+        return None
+    handler = _handlers.get(module_name)
+    if handler is None:
+        handler = _handlers[module_name] = importlib.import_module(module_name).lambda_handler
+    return handler
+
+
+@instrument
+def lambda_handler(event, context):
+    """
+    Single entry point for the whole API (see template-router.yaml).
+    Dispatches on the event's httpMethod and resource to the same
+    lambda_handler each route runs when deployed as its own function, so one
+    warm container and one connection pool serve every route.
+
+    Args:
+        event (dict): The Lambda event object containing request details.
+        context (object): The Lambda context object providing runtime information.
+
+    Returns:
+        dict: The routed handler's response, or a 404 / 405 error response.
+    """
+    method = event.get("httpMethod")
+    resource = event.get("resource")
+
+    handler = resolve(method, resource)
+    if handler is not None:
+        return handler(event, context)
+
+    allowed = _RESOURCE_METHODS.get(resource)
+    if allowed:
+        response = create_error_response(http_status.METHOD_NOT_ALLOWED, error_messages.METHOD_NOT_ALLOWED.format(method, resource))
+        response["headers"] = {**response["headers"], "Allow": ", ".join(sorted(allowed))}
+        return response
+    logger.error(f"No route for {method} {resource}")
+    return create_error_response(http_status.NOT_FOUND, error_messages.ROUTE_NOT_FOUND.format(method, resource))
@@ -0,0 +1,132 @@
+import json
+import logging
+import uuid
+
+from commonUtil.response_helpers import create_error_response, create_success_response
+from commonUtil.constants.error_messages import error_messages
+from commonUtil.constants.http_status import http_status
+from commonUtil.constants.app_constants import app_constants, TaskStatus, BatchOperation
+from commonUtil.db import get_cursor
+from commonUtil.validators import validate_batch_size, validate_batch_operations
+from commonUtil.auth import require_auth, get_user_id
+from commonUtil.task_repository import TaskRepository
+from commonUtil.request_helpers import get_body, get_header
+from commonUtil.metrics import instrument
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+@instrument
+@require_auth
+def lambda_handler(event, context):
+    """
+    AWS Lambda handler for POST /tasks/batch endpoint.
+    Applies a list of create, update and delete operations for the
+    authenticated user in a single transaction.
+
+    Request body:
+        {"operations": [
+            {"op": "create", "description": "...", "due_date": "YYYY-MM-DD", "status": "pending"},
+            {"op": "update", "task_id": "...", "status": "completed"},
+            {"op": "delete", "task_id": "..."}
+        ]}
+
+    Every operation is validated before anything is written; if any is
+    invalid the whole batch is rejected with per-item errors. Otherwise the
+    response holds one result per operation, in request order, and updates
+    or deletes of tasks the user does not own come back as 404 items.
+
+    Args:
+        event (dict): The Lambda event object containing request details.
+        context (object): The Lambda context object providing runtime information.
+
+    Returns:
+        dict: A response object with status code, body, and headers.
+    """
+    try:
+        user_id = get_user_id(event)
+
+        try:
+            body = json.loads(get_body(event))
+        except (json.JSONDecodeError, TypeError):
+            return create_error_response(http_status.BAD_REQUEST, error_messages.INVALID_JSON)
+
+        operations = body.get("operations") if isinstance(body, dict) else None
+        validation_error = validate_batch_size(operations)
+        if validation_error:
+            return create_error_response(http_status.BAD_REQUEST, validation_error)
+
+        item_errors = validate_batch_operations(operations)
+        if item_errors:
+            return create_error_response(http_status.BAD_REQUEST, error_messages.INVALID_BATCH_ITEMS, details=item_errors)
+
+        results = [None] * len(operations)
+        try:
+            with get_cursor() as cursor:
+                repository = TaskRepository(cursor)
+                # Chunking bounds the size of each statement and of its RETURNING set
+                for start in range(0, len(operations), app_constants.BATCH_CHUNK_SIZE):
+                    end = min(start + app_constants.BATCH_CHUNK_SIZE, len(operations))
+                    apply_chunk(repository, user_id, operations, range(start, end), results)
+                cursor.connection.commit()
+        except Exception as e:
+            logger.error(f"Database error applying batch: {e}")
+            return create_error_response(http_status.INTERNAL_SERVER_ERROR, error_messages.BATCH_FAILED)
+
+        return create_success_response(
+            http_status.OK, {"results": results},
+            accept_encoding=get_header(event.get("headers"), "Accept-Encoding") or ""
+        )
+    except Exception as e:
+        logger.error(f"Error applying batch: {e}")
+        return create_error_response(http_status.INTERNAL_SERVER_ERROR, error_messages.INTERNAL_ERROR.format(str(e)))
+
+
+def apply_chunk(repository, user_id, operations, indexes, results):
+    """
+    Apply one chunk of operations with at most one statement per operation
+    type, writing a result for each index into ``results``.
+    """
+    creates, updates, deletes = [], [], []
+    for index in indexes:
+        op = operations[index]["op"]
+        if op == BatchOperation.CREATE.value:
+            creates.append(index)
+        elif op == BatchOperation.UPDATE.value:
+            updates.append(index)
+        else:
+            deletes.append(index)
+
+    if creates:
+        tasks = repository.create_many(user_id, [
+            (
+                operations[i]["description"],
+                operations[i].get("due_date"),
+                operations[i].get("status", TaskStatus.PENDING.value),
+            )
+            for i in creates
+        ])
+        for index, task in zip(creates, tasks):
+            results[index] = {"index": index, "status": http_status.CREATED, "task": task}
+
+    if updates:
+        task_ids = {i: str(uuid.UUID(str(operations[i]["task_id"]))) for i in updates}
+        updated = repository.update_many(user_id, [
+            (task_ids[i], operations[i].get("description"), operations[i].get("due_date"), operations[i].get("status"))
+            for i in updates
+        ])
+        for index in updates:
+            task = updated.get(task_ids[index])
+            if task:
+                results[index] = {"index": index, "status": http_status.OK, "task": task}
+            else:
+                results[index] = {"index": index, "status": http_status.NOT_FOUND, "error": error_messages.TASK_NOT_FOUND}
+
+    if deletes:
+        task_ids = {i: str(uuid.UUID(str(operations[i]["task_id"]))) for i in deletes}
+        deleted = repository.delete_many(user_id, task_ids.values())
+        for index in deletes:
+            if task_ids[index] in deleted:
+                results[index] = {"index": index, "status": http_status.OK, "task_id": task_ids[index]}
+            else:
+                results[index] = {"index": index, "status": http_status.NOT_FOUND, "error": error_messages.TASK_NOT_FOUND}
@@ -1,22 +1,28 @@
 import logging
-import jwt
 
 from commonUtil.response_helpers import create_error_response, create_success_response
 from commonUtil.constants.error_messages import error_messages
 from commonUtil.constants.http_status import http_status
 from commonUtil.db import get_cursor
-from commonUtil.auth import validate_jwt
-from commonUtil.config import config
-from commonUtil.auth import extract_token_from_cookie
+from commonUtil.auth import require_auth, get_user_id
+from commonUtil.task_repository import TaskRepository, TaskNotFoundError
+from commonUtil.versions import DataVersionRepository, make_etag, if_match_versions
+from commonUtil.metrics import instrument
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@instrument
+@require_auth
 def lambda_handler(event, context):
     """
     AWS Lambda handler for DELETE /tasks/{task_id} endpoint.
     Deletes a task for the authenticated user.
 
+    With an If-Match header holding an ETag from GET /tasks, the delete only
+    happens if none of the user's tasks changed since (412 otherwise), and
+    the response carries the ETag of the new version.
+
     Args:
         event (dict): The Lambda event object containing request details.
         context (object): The Lambda context object providing runtime information.
@@ -31,42 +37,32 @@ def lambda_handler(event, context):
         if not task_id:
             return create_error_response(http_status.BAD_REQUEST, error_messages.MISSING_TASK_ID)
         
-        # Extract token from cookie
-        token = extract_token_from_cookie(event.get("headers", {}))
-        if not token:
-            return create_error_response(http_status.UNAUTHORIZED, error_messages.MISSING_AUTH_TOKEN)
-        
-        # Verify token and get user_id
-        try:
-            payload = validate_jwt(token, config.JWT_SECRET)
-            user_id = payload.get("user_id")
-            if not user_id:
-                return create_error_response(http_status.UNAUTHORIZED, error_messages.INVALID_CREDENTIALS)
-        except jwt.ExpiredSignatureError:
-            return create_error_response(http_status.UNAUTHORIZED, error_messages.JWT_EXPIRED)
-        except jwt.InvalidTokenError:
-            return create_error_response(http_status.UNAUTHORIZED, error_messages.JWT_INVALID)
+        user_id = get_user_id(event)
         
-        with get_cursor() as cursor:
-            # Check if the task exists and belongs to the user
-            cursor.execute(
-                "SELECT task_id FROM tasks WHERE task_id = %s AND user_id = %s",
-                (task_id, user_id)
-            )
-            task = cursor.fetchone()
-            
-            if not task:
+        expected_versions = if_match_versions(event.get("headers"))
+        if expected_versions is None:
+            # Ownership check and delete in a single DELETE ... RETURNING
+            try:
+                with get_cursor(autocommit=True) as cursor:
+                    TaskRepository(cursor).delete(task_id, user_id)
+            except TaskNotFoundError:
                 return create_error_response(http_status.NOT_FOUND, error_messages.TASK_NOT_FOUND)
-            
-            # Delete the task
-            cursor.execute(
-                "DELETE FROM tasks WHERE task_id = %s",
-                (task_id,)
-            )
-            cursor.connection.commit()
-            if cursor.rowcount == 0:
-                return create_error_response(http_status.INTERNAL_SERVER_ERROR, error_messages.TASK_DELETION_FAILED)
             return create_success_response(http_status.OK, {"message": "Task deleted successfully."})
+
+        # Optimistic concurrency: lock the version, compare, then delete in the same transaction
+        try:
+            with get_cursor() as cursor:
+                version = DataVersionRepository(cursor).get(user_id, DataVersionRepository.TASKS, lock=True)
+                if version not in expected_versions:
+                    return create_error_response(http_status.PRECONDITION_FAILED, error_messages.TASKS_MODIFIED)
+                TaskRepository(cursor).delete(task_id, user_id)
+                cursor.connection.commit()
+        except TaskNotFoundError:
+            return create_error_response(http_status.NOT_FOUND, error_messages.TASK_NOT_FOUND)
+        # The DELETE trigger bumped the locked version by exactly one
+        return create_success_response(
+            http_status.OK, {"message": "Task deleted successfully."}, {"ETag": make_etag("tasks", version + 1)}
+        )
     except Exception as e:
         logger.error(f"Error deleting task: {str(e)}")
         return create_error_response(http_status.INTERNAL_SERVER_ERROR, error_messages.INTERNAL_ERROR.format(str(e)))
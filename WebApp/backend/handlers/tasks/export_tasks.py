@@ -0,0 +1,74 @@
+import logging
+from datetime import datetime, timezone
+
+from commonUtil.response_helpers import create_error_response, create_success_response
+from commonUtil.constants.error_messages import error_messages
+from commonUtil.constants.http_status import http_status
+from commonUtil.constants.app_constants import ExportFormat
+from commonUtil.config import config
+from commonUtil.db import get_db_session
+from commonUtil.auth import require_auth, get_user_id
+from commonUtil.task_repository import TaskRepository
+from commonUtil.export import CONTENT_TYPES, CountingRows, encode_rows
+from commonUtil.s3 import generate_presigned_get_url, task_export_key, upload_stream
+from commonUtil.request_helpers import requires_primary
+from commonUtil.metrics import instrument
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+@instrument
+@require_auth
+def lambda_handler(event, context):
+    """
+    Lambda function handler for POST /tasks/export.
+    Exports every task of the authenticated user to S3, as NDJSON by
+    default or CSV with ?format=csv, and returns a presigned GET URL of the
+    file valid for PRESIGNED_URL_EXPIRATION seconds.
+
+    Rows are read through a server-side (named) cursor EXPORT_ITERSIZE at a
+    time, encoded a batch at a time and streamed into a multipart upload
+    (see upload_stream), so peak memory is a few parts however many tasks
+    the user has. Reads go to the read replica when one is configured,
+    unless the client sends "X-Consistency: strong".
+
+    Args:
+        event (dict): The Lambda event object containing request details.
+        context (object): The Lambda context object providing runtime information.
+
+    Returns:
+        dict: A response object with the URL, format, task count and size in bytes.
+    """
+    try:
+        user_id = get_user_id(event)
+        params = event.get("queryStringParameters") or {}
+        export_format = params.get("format") or ExportFormat.NDJSON.value
+        if export_format not in [export.value for export in ExportFormat]:
+            return create_error_response(http_status.BAD_REQUEST, error_messages.INVALID_EXPORT_FORMAT)
+
+        key = task_export_key(user_id, export_format)
+        filename = f"tasks-{datetime.now(timezone.utc):%Y%m%d}.{export_format}"
+        try:
+            with get_db_session(readonly=not requires_primary(event.get("headers"))) as connection:
+                # Named cursors must run inside a transaction, which the session provides
+                with connection.cursor(name="task_export") as cursor:
+                    cursor.itersize = config.EXPORT_ITERSIZE
+                    rows = CountingRows(TaskRepository(cursor).export(user_id))
+                    size = upload_stream(
+                        encode_rows(rows, TaskRepository.TASK_FIELDS, export_format), key, CONTENT_TYPES[export_format],
+                        ContentDisposition=f'attachment; filename="{filename}"',
+                    )
+        except Exception as e:
+            logger.error(f"Error exporting tasks: {str(e)}")
+            return create_error_response(http_status.INTERNAL_SERVER_ERROR, error_messages.EXPORT_FAILED)
+
+        return create_success_response(http_status.OK, {
+            "url": generate_presigned_get_url(key),
+            "format": export_format,
+            "tasks": rows.count,
+            "bytes": size,
+            "expires_in": config.PRESIGNED_URL_EXPIRATION,
+        })
+    except Exception as e:
+        logger.error(f"Error exporting tasks: {str(e)}")
+        return create_error_response(http_status.INTERNAL_SERVER_ERROR, error_messages.INTERNAL_ERROR.format(str(e)))
@@ -0,0 +1,50 @@
+import logging
+
+from commonUtil.response_helpers import (
+    create_error_response, create_success_response, create_not_modified_response, etag_headers,
+)
+from commonUtil.constants.error_messages import error_messages
+from commonUtil.constants.http_status import http_status
+from commonUtil.auth import require_auth, get_user_id
+from commonUtil.db import get_cursor
+from commonUtil.task_summary_repository import TaskSummaryRepository
+from commonUtil.versions import DataVersionRepository, make_etag, if_none_match
+from commonUtil.request_helpers import get_header, requires_primary
+from commonUtil.metrics import instrument
+
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+@instrument
+@require_auth
+def lambda_handler(event, context):
+    """
+    Lambda function handler for GET /tasks/summary.
+    Returns the user's task counts by status (overdue being the tasks the
+    overdue sweep has marked) and their total, read from the summary row the
+    tasks triggers maintain rather than by counting tasks.
+
+    The summary changes only when the tasks do, so its ETag is built from the
+    user's tasks version, like GET /tasks.
+
+    Reads go to the read replica when one is configured; a client that has
+    just written sends "X-Consistency: strong" to read from the primary.
+    """
+    try:
+        user_id = get_user_id(event)
+
+        with get_cursor(readonly=not requires_primary(event.get("headers"))) as cursor:
+            version = DataVersionRepository(cursor).get(user_id, DataVersionRepository.TASKS)
+            etag = make_etag("task-summary", version)
+            if if_none_match(event.get("headers"), etag):
+                return create_not_modified_response(etag)
+
+            summary = TaskSummaryRepository(cursor).get(user_id)
+        return create_success_response(
+            http_status.OK, {"summary": summary}, etag_headers(etag),
+            accept_encoding=get_header(event.get("headers"), "Accept-Encoding") or ""
+        )
+    except Exception as e:
+        logger.error(f"Error fetching task summary: {str(e)}")
+        return create_error_response(http_status.INTERNAL_SERVER_ERROR, error_messages.INTERNAL_ERROR.format(str(e)))
@@ -1,76 +1,87 @@
-import jwt
 import logging
 import json
 
-from commonUtil.response_helpers import create_error_response, create_success_response
+from commonUtil.response_helpers import (
+    create_error_response, create_success_response, create_not_modified_response, etag_headers,
+)
 from commonUtil.constants.error_messages import error_messages
 from commonUtil.constants.http_status import http_status
-from commonUtil.auth import validate_jwt
+from commonUtil.constants.app_constants import app_constants
+from commonUtil.auth import require_auth, get_user_id
 from commonUtil.db import get_cursor
-from commonUtil.config import config
+from commonUtil.validators import validate_task_list_params
+from commonUtil.pagination import decode_cursor, decode_rank_cursor
+from commonUtil.task_repository import TaskRepository
+from commonUtil.versions import DataVersionRepository, make_etag, if_none_match
+from commonUtil.request_helpers import get_header, requires_primary
+from commonUtil.metrics import instrument
 
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@instrument
+@require_auth
 def lambda_handler(event, context):
     """
     Lambda function handler to get tasks from the database.
+    Supports keyset pagination (limit, cursor) and status / due date filters
+    passed as query string parameters.
+
+    With ?q= the tasks are searched instead: only tasks whose description
+    matches every word, each as a prefix (for type-ahead), are
+    returned, best match first, each with its rank. The filters and
+    pagination work the same way.
+
+    Responses carry an ETag built from the user's tasks version and the
+    query parameters. A request whose If-None-Match still matches gets a 304
+    after a single primary key lookup, without querying any tasks.
+
+    Reads go to the read replica when one is configured; a client that has
+    just written sends "X-Consistency: strong" to read from the primary.
     """
     try:
-        # Extract token from cookie
-        token = extract_token_from_cookie(event)
-        if not token:
-            return create_error_response(http_status.UNAUTHORIZED, error_messages.MISSING_AUTH_TOKEN)
+        user_id = get_user_id(event)
+
+        # Parse and validate pagination / filter parameters
+        params = event.get("queryStringParameters") or {}
+        limit = params.get("limit")
+        status = params.get("status")
+        due_before = params.get("due_before")
+        due_after = params.get("due_after")
+        search = params.get("q")
+        validation_error = validate_task_list_params(limit, status, due_before, due_after, search)
+        if validation_error:
+            return create_error_response(http_status.BAD_REQUEST, validation_error)
+        limit = int(limit) if limit else app_constants.DEFAULT_TASK_PAGE_SIZE
 
-        # Verify token and get user_id
-        try:
-            payload = validate_jwt(token, config.JWT_SECRET)
-            user_id = payload.get("user_id")
-            if not user_id:
-                return create_error_response(http_status.UNAUTHORIZED, error_messages.INVALID_CREDENTIALS)
-        except jwt.ExpiredSignatureError:
-            return create_error_response(http_status.UNAUTHORIZED, error_messages.JWT_EXPIRED)
-        except jwt.InvalidTokenError:
-            return create_error_response(http_status.UNAUTHORIZED, error_messages.JWT_INVALID)
+        after = None
+        if params.get("cursor"):
+            try:
+                after = (decode_rank_cursor if search is not None else decode_cursor)(params["cursor"])
+            except ValueError:
+                return create_error_response(http_status.BAD_REQUEST, error_messages.INVALID_CURSOR)
 
-        # Fetch tasks from the database
-        with get_cursor() as cursor:
-            cursor.execute(
-                "SELECT task_id, description, due_date, status FROM tasks WHERE user_id = %s",
-                (user_id,)
-            )
-            tasks = cursor.fetchall()
-        
-        # Format tasks for response
-        formatted_tasks = [
-            {
-                "task_id": task[0],
-                "description": task[1],
-                "due_date": task[2].isoformat() if task[2] else None,
-                "status": task[3]
-            }
-            for task in tasks
-        ]
-        return create_success_response(http_status.OK, {"tasks": formatted_tasks})
+        with get_cursor(readonly=not requires_primary(event.get("headers"))) as cursor:
+            version = DataVersionRepository(cursor).get(user_id, DataVersionRepository.TASKS)
+            etag = make_etag("tasks", version, params)
+            if if_none_match(event.get("headers"), etag):
+                return create_not_modified_response(etag)
+
+            # Fetch one page of tasks (or search results) from the database
+            repository = TaskRepository(cursor)
+            if search is not None:
+                formatted_tasks, next_cursor = repository.search(
+                    user_id, search, limit, status=status, due_before=due_before, due_after=due_after, after=after
+                )
+            else:
+                formatted_tasks, next_cursor = repository.list(
+                    user_id, limit, status=status, due_before=due_before, due_after=due_after, after=after
+                )
+        return create_success_response(
+            http_status.OK, {"tasks": formatted_tasks, "next_cursor": next_cursor}, etag_headers(etag),
+            accept_encoding=get_header(event.get("headers"), "Accept-Encoding") or ""
+        )
     except Exception as e:
         logger.error(f"Error fetching tasks: {str(e)}")
         return create_error_response(http_status.INTERNAL_SERVER_ERROR, error_messages.INTERNAL_ERROR.format(str(e)))
-
-
-def extract_token_from_cookie(event):
-    """Extract JWT token from request cookies or Authorization header."""
-    # Check if token is in cookies
-    headers = event.get("headers", {})
-    cookie_header = headers.get("Cookie") or headers.get("cookie")
-    if cookie_header:
-        for cookie in cookie_header.split(";"):
-            if cookie.strip().startswith("token="):
-                return cookie.strip().split("=")[1]
-    
-    # Check if token is in Authorization header (Bearer token)
-    auth_header = headers.get("Authorization") or headers.get("authorization")
-    if auth_header and auth_header.startswith("Bearer "):
-        return auth_header[7:]  # Remove "Bearer " prefix
-    
-    return None
@@ -0,0 +1,99 @@
+import json
+import logging
+import time
+from datetime import date, datetime, timezone
+
+import psycopg2
+
+from commonUtil.db import get_cursor
+from commonUtil.config import config
+from commonUtil.job_watermarks import JobWatermarkRepository
+from commonUtil.task_repository import TaskRepository
+from commonUtil.metrics import instrument
+
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+JOB_NAME = "mark_overdue_tasks"
+
+# SQLSTATE of a statement cancelled by lock_timeout
+_LOCK_NOT_AVAILABLE = "55P03"
+
+
+@instrument
+def lambda_handler(event, context):
+    """
+    Scheduled job marking open (pending or in progress) tasks whose due date
+    has passed as overdue.
+
+    Tasks are marked in chunks of OVERDUE_SWEEP_CHUNK_SIZE along the
+    (due_date, task_id) order of idx_tasks_open_due, one short transaction
+    per chunk, so no transaction ever holds more than a chunk of row locks.
+    Rows an interactive write has locked are skipped, and lock_timeout stops
+    a chunk from queuing behind one. Once the sweep reaches the end it makes
+    one more pass from the start to retry the skipped rows the same day;
+    rows still locked then wait for the next nightly run. Each chunk
+    commits together with its watermark in job_watermarks, so a run cut
+    short (Lambda time running out, a lock timeout) resumes where it
+    stopped on the next invocation the same day. Rows and time are logged
+    per chunk.
+
+    Args:
+        event (dict): Scheduled event; optional "today" (YYYY-MM-DD) and
+            "chunk_size" override the UTC date and OVERDUE_SWEEP_CHUNK_SIZE.
+        context (object): Lambda Context runtime methods and attributes
+
+    Returns:
+        dict: Rows marked, chunks run (the retry pass included), and whether
+        the sweep reached the end.
+    """
+    event = event or {}
+    today = date.fromisoformat(event["today"]) if event.get("today") else datetime.now(timezone.utc).date()
+    chunk_size = int(event.get("chunk_size") or config.OVERDUE_SWEEP_CHUNK_SIZE)
+
+    marked_total = chunks = 0
+    finished = retrying = False
+    with get_cursor() as cursor:
+        watermarks = JobWatermarkRepository(cursor)
+        tasks = TaskRepository(cursor)
+        position = watermarks.resume_position(JOB_NAME, today)
+        cursor.connection.commit()
+        if position:
+            logger.info(f"Resuming overdue sweep for {today} after {position[0]} {position[1]}")
+
+        while True:
+            if context is not None and context.get_remaining_time_in_millis() < config.OVERDUE_SWEEP_TIME_MARGIN_MS:
+                logger.warning(f"Overdue sweep for {today} stopping for time; the next run resumes")
+                break
+            start = time.perf_counter()
+            try:
+                cursor.execute("SET LOCAL lock_timeout = %s", (f"{config.OVERDUE_SWEEP_LOCK_TIMEOUT_MS}ms",))
+                marked, last = tasks.mark_overdue(today, position, chunk_size)
+                pass_done = marked < chunk_size
+                finished = finished or pass_done
+                position = last or position
+                watermarks.save(JOB_NAME, today, position, finished)
+                cursor.connection.commit()
+            except psycopg2.Error as e:
+                cursor.connection.rollback()
+                if e.pgcode != _LOCK_NOT_AVAILABLE:
+                    raise
+                logger.warning(f"Overdue sweep for {today} stopping on a lock timeout; the next run resumes")
+                break
+            chunks += 1
+            marked_total += marked
+            logger.info(json.dumps({
+                "job": JOB_NAME, "chunk": chunks, "rows": marked, "retry": retrying,
+                "ms": round((time.perf_counter() - start) * 1000, 1),
+            }))
+            if pass_done:
+                if retrying:
+                    break
+                # Rows skipped as locked now lie behind the watermark: go over
+                # the range once more for them. Marked rows have left the
+                # partial index, so this pass only reads what is still open.
+                retrying, position = True, None
+
+    logger.info(f"Overdue sweep for {today}: {marked_total} tasks marked in {chunks} chunks, finished={finished}")
+    return {"marked": marked_total, "chunks": chunks, "finished": finished}
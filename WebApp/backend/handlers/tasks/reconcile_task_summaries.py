@@ -0,0 +1,84 @@
+import argparse
+import json
+import logging
+
+from commonUtil.config import config
+from commonUtil.db import get_cursor
+from commonUtil.task_summary_repository import TaskSummaryRepository
+from commonUtil.metrics import instrument
+
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Drifted users included in the result; all of them are logged
+MAX_REPORTED_DRIFT = 100
+
+
+@instrument
+def lambda_handler(event, context):
+    """
+    Reconciles user_task_summaries with tasks and reports where it had
+    drifted. Invoked by hand (or on a schedule) rather than through the API;
+    pass {"dry_run": true} to only report.
+
+    Users are taken in user_id order, SUMMARY_RECONCILE_BATCH_SIZE ids per
+    query, and each is reconciled in a short transaction of its own: their
+    summary row is locked, their tasks counted and the row corrected. Task
+    writes only ever wait for the one user being counted. When Lambda time
+    runs low the run stops and returns "resume_after"; pass it back as
+    {"after": ...} to carry on.
+
+    Args:
+        event (dict): Optional {"dry_run": bool, "after": user_id}
+        context (object): Lambda Context runtime methods and attributes
+
+    Returns:
+        dict: The number of drifted users, the first MAX_REPORTED_DRIFT of
+        them with their stored and actual counts, the number of summaries
+        corrected (None on a dry run) and "resume_after", the last user
+        reconciled when the run stopped early, else None.
+    """
+    event = event or {}
+    dry_run = bool(event.get("dry_run"))
+    after = event.get("after")
+    drifted = []
+    stopped = False
+    with get_cursor() as cursor:
+        repository = TaskSummaryRepository(cursor)
+        while not stopped:
+            user_ids = repository.list_users(after, config.SUMMARY_RECONCILE_BATCH_SIZE)
+            cursor.connection.commit()
+            if not user_ids:
+                break
+            for user_id in user_ids:
+                if context is not None and context.get_remaining_time_in_millis() < config.SUMMARY_RECONCILE_TIME_MARGIN_MS:
+                    stopped = True
+                    break
+                try:
+                    entry = repository.reconcile(user_id, dry_run)
+                finally:
+                    # Ends the user's transaction either way, releasing their summary row
+                    if dry_run:
+                        cursor.connection.rollback()
+                    else:
+                        cursor.connection.commit()
+                if entry:
+                    logger.warning(f"Task summary drift: {json.dumps(entry)}")
+                    drifted.append(entry)
+                after = user_id
+    rebuilt = None if dry_run else len(drifted)
+    resume_after = after if stopped else None
+    logger.info(f"Task summaries: {len(drifted)} drifted, {'dry run' if dry_run else f'{rebuilt} corrected'}"
+                + (f", stopped for time after {resume_after}" if stopped else ""))
+    return {"drifted": len(drifted), "drift": drifted[:MAX_REPORTED_DRIFT], "rebuilt": rebuilt, "resume_after": resume_after}
+
+
+if __name__ == "__main__":
+    # python -m handlers.tasks.reconcile_task_summaries [--dry-run] [--after USER_ID], from WebApp/backend
+    parser = argparse.ArgumentParser(description="Reconcile user_task_summaries with tasks and report drift.")
+    parser.add_argument("--dry-run", action="store_true", help="Only report drift")
+    parser.add_argument("--after", help="Start after this user_id")
+    args = parser.parse_args()
+    logging.basicConfig()
+    print(json.dumps(lambda_handler({"dry_run": args.dry_run, "after": args.after}, None), indent=2))
@@ -1,6 +1,4 @@
 import logging
-import jwt
-from datetime import datetime
 import json
 
 from commonUtil.response_helpers import create_error_response, create_success_response
@@ -8,18 +6,27 @@ from commonUtil.constants.error_messages import error_messages
 from commonUtil.constants.http_status import http_status
 from commonUtil.constants.app_constants import TaskStatus
 from commonUtil.db import get_cursor
-from commonUtil.auth import validate_jwt
-from commonUtil.config import config
-from commonUtil.auth import extract_token_from_cookie
+from commonUtil.validators import validate_due_date
+from commonUtil.auth import require_auth, get_user_id
+from commonUtil.task_repository import TaskRepository, TaskNotFoundError
+from commonUtil.versions import DataVersionRepository, make_etag, if_match_versions
+from commonUtil.request_helpers import get_body
+from commonUtil.metrics import instrument
 
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@instrument
+@require_auth
 def lambda_handler(event, context):
     """
     AWS Lambda handler for PATCH /tasks/{task_id} endpoint.
     Updates a task for the authenticated user.
+
+    With an If-Match header holding an ETag from GET /tasks, the update only
+    happens if none of the user's tasks changed since (412 otherwise), and
+    the response carries the ETag of the new version.
     Args:
         event (dict): The Lambda event object containing request details.
         context (object): The Lambda context object providing runtime information.
@@ -32,25 +39,11 @@ def lambda_handler(event, context):
         if not task_id:
             return create_error_response(http_status.BAD_REQUEST, error_messages.MISSING_TASK_ID)
         
-        # Extract token from cookie
-        token = extract_token_from_cookie(event.get("headers", {}))
-        if not token:
-            return create_error_response(http_status.UNAUTHORIZED, error_messages.MISSING_AUTH_TOKEN)
-        
-        # Verify token and get user_id
-        try:
-            payload = validate_jwt(token, config.JWT_SECRET)
-            user_id = payload.get("user_id")
-            if not user_id:
-                return create_error_response(http_status.UNAUTHORIZED, error_messages.INVALID_CREDENTIALS)
-        except jwt.ExpiredSignatureError:
-            return create_error_response(http_status.UNAUTHORIZED, error_messages.JWT_EXPIRED)
-        except jwt.InvalidTokenError:
-            return create_error_response(http_status.UNAUTHORIZED, error_messages.JWT_INVALID)
+        user_id = get_user_id(event)
         
         # Parse and validate request data
         try:
-            body = json.loads(event["body"])
+            body = json.loads(get_body(event))
         except json.JSONDecodeError:
             return create_error_response(http_status.BAD_REQUEST, error_messages.INVALID_JSON)
         if not body:
@@ -69,61 +62,28 @@ def lambda_handler(event, context):
         if status and status not in [s.value for s in TaskStatus]:
             return create_error_response(http_status.BAD_REQUEST, error_messages.INVALID_TASK_STATUS)
         
-        with get_cursor() as cursor:
-            # Check if the task exists and belongs to the user
-            cursor.execute(
-                "SELECT task_id FROM tasks WHERE task_id = %s AND user_id = %s",
-                (task_id, user_id)
-            )
-            task = cursor.fetchone()
-            
-            if not task:
+        expected_versions = if_match_versions(event.get("headers"))
+        if expected_versions is None:
+            # Ownership check, update and fetch in a single UPDATE ... RETURNING
+            try:
+                with get_cursor(autocommit=True) as cursor:
+                    task_data = TaskRepository(cursor).update(task_id, user_id, description, due_date, status)
+            except TaskNotFoundError:
                 return create_error_response(http_status.NOT_FOUND, error_messages.TASK_NOT_FOUND)
-            
-            # Update the task in the database
-            update_query = """
-                UPDATE tasks 
-                SET description = COALESCE(%s, description), 
-                    due_date = COALESCE(%s, due_date), 
-                    status = COALESCE(%s, status) 
-                WHERE task_id = %s AND user_id = %s
-            """
-            cursor.execute(
-                update_query,
-                (description, due_date, status, task_id, user_id)
-            )
-            
-            # Commit the changes
-            cursor.connection.commit()
-            if cursor.rowcount == 0:
-                return create_error_response(http_status.NOT_FOUND, error_messages.TASK_UPDATE_FAILED)
-            # Fetch the updated task
-            cursor.execute(
-                "SELECT task_id, description, due_date, status FROM tasks WHERE task_id = %s",
-                (task_id,)
-            )
-            task = cursor.fetchone()
-            if not task:
-                return create_error_response(http_status.NOT_FOUND, error_messages.TASK_NOT_FOUND)
-            # Transform to a dictionary for the response
-            task_data = {
-                "task_id": task[0],
-                "description": task[1],
-                "due_date": task[2].isoformat() if task[2] else None,
-                "status": task[3]
-            }
             return create_success_response(http_status.OK, task_data)
+
+        # Optimistic concurrency: lock the version, compare, then update in the same transaction
+        try:
+            with get_cursor() as cursor:
+                version = DataVersionRepository(cursor).get(user_id, DataVersionRepository.TASKS, lock=True)
+                if version not in expected_versions:
+                    return create_error_response(http_status.PRECONDITION_FAILED, error_messages.TASKS_MODIFIED)
+                task_data = TaskRepository(cursor).update(task_id, user_id, description, due_date, status)
+                cursor.connection.commit()
+        except TaskNotFoundError:
+            return create_error_response(http_status.NOT_FOUND, error_messages.TASK_NOT_FOUND)
+        # The UPDATE trigger bumped the locked version by exactly one
+        return create_success_response(http_status.OK, task_data, {"ETag": make_etag("tasks", version + 1)})
     except Exception as e:
         logger.error(f"Error updating task: {str(e)}")
         return create_error_response(http_status.INTERNAL_SERVER_ERROR, error_messages.INTERNAL_ERROR.format(str(e)))
-        
-        
-def validate_due_date(due_date):
-    """Validate the due date format and check if it's in the past."""
-    try:
-        due_date_obj = datetime.strptime(due_date, "%Y-%m-%d")
-        if due_date_obj < datetime.now():
-            return error_messages.DUE_DATE_IN_PAST
-        return None
-    except ValueError:
-        return error_messages.INVALID_DATE_FORMAT
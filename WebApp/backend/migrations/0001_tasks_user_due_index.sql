@@ -0,0 +1,5 @@
+-- migrate: no-transaction
+-- GET /tasks?due_before=/due_after=: a range scan within one user's tasks instead of filtering them all.
+-- Dropped first so a build that failed (and left an INVALID index behind) can simply be re-run.
+DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_user_due;
+CREATE INDEX CONCURRENTLY idx_tasks_user_due ON tasks (user_id, due_date, task_id);
@@ -0,0 +1,5 @@
+-- migrate: no-transaction
+-- GET /tasks?status=: (user_id, status) narrows to one status of one user, and the trailing
+-- (created_at, task_id) serves the keyset ORDER BY from the same index, without a sort.
+DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_user_status;
+CREATE INDEX CONCURRENTLY idx_tasks_user_status ON tasks (user_id, status, created_at, task_id);
@@ -0,0 +1,21 @@
+-- migrate: no-transaction
+-- Case-insensitive login: POST /login looks users up by lower(username), so "Alice" can now
+-- sign in as "alice". Unique, so no two accounts differ only in case. Accounts that already do
+-- are listed and the migration stops before building anything; rename them, then re-run.
+DO $$
+DECLARE
+    duplicates TEXT;
+BEGIN
+    SELECT string_agg(names, '; ') INTO duplicates FROM (
+        SELECT string_agg(username, ', ' ORDER BY username) AS names
+        FROM users GROUP BY lower(username) HAVING COUNT(*) > 1
+    ) clashes;
+    IF duplicates IS NOT NULL THEN
+        RAISE EXCEPTION 'Usernames differing only in case: %', duplicates
+            USING HINT = 'Rename all but one account of each group, then run the migrations again';
+    END IF;
+END
+$$;
+-- Dropped first so a build that failed (and left an INVALID index behind) can simply be re-run.
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_username_lower;
+CREATE UNIQUE INDEX CONCURRENTLY idx_users_username_lower ON users (lower(username));
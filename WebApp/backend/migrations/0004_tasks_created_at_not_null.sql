@@ -0,0 +1,5 @@
+-- Keyset pagination compares (created_at, task_id) rows, which a NULL created_at would drop from
+-- every page. Rows without one get their updated_at; the constraint is added NOT VALID, so this
+-- transaction does not scan tasks while it holds the table lock (0005 validates it).
+UPDATE tasks SET created_at = COALESCE(updated_at, CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+ALTER TABLE tasks ADD CONSTRAINT tasks_created_at_not_null CHECK (created_at IS NOT NULL) NOT VALID;
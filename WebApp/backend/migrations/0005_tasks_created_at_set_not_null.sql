@@ -0,0 +1,5 @@
+-- VALIDATE scans tasks under a lock that lets writes through; SET NOT NULL then uses the valid
+-- constraint instead of scanning again, so the exclusive lock it takes is brief.
+ALTER TABLE tasks VALIDATE CONSTRAINT tasks_created_at_not_null;
+ALTER TABLE tasks ALTER COLUMN created_at SET NOT NULL;
+ALTER TABLE tasks DROP CONSTRAINT tasks_created_at_not_null;
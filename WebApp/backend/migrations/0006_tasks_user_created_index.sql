@@ -0,0 +1,4 @@
+-- migrate: no-transaction
+-- Keyset pagination for GET /tasks: (user_id, created_at, task_id) makes every page an index range scan.
+DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_user_created;
+CREATE INDEX CONCURRENTLY idx_tasks_user_created ON tasks (user_id, created_at, task_id);
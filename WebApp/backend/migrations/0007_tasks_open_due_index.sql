@@ -0,0 +1,5 @@
+-- migrate: no-transaction
+-- Overdue sweep: only open tasks are indexed, so each chunk is a short range scan in (due_date, task_id) order
+-- and the index shrinks as tasks are marked. The predicate must match TaskRepository.MARK_OVERDUE_SQL.
+DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_open_due;
+CREATE INDEX CONCURRENTLY idx_tasks_open_due ON tasks (due_date, task_id) WHERE status IN ('pending', 'in_progress');
@@ -0,0 +1,9 @@
+-- How far each batch job got, so an interrupted run resumes (see commonUtil/job_watermarks.py).
+CREATE TABLE job_watermarks (
+    job_name VARCHAR(50) PRIMARY KEY,
+    run_date DATE NOT NULL,
+    last_due_date DATE,
+    last_task_id UUID,
+    finished BOOLEAN NOT NULL DEFAULT FALSE,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,6 @@
+-- Full-text search for GET /tasks?q=; must use the configuration TaskRepository.search queries with.
+-- A stored generated column is computed for every existing row: adding it rewrites tasks under an
+-- exclusive lock, so run this one at a quiet time. btree_gin is for the index in 0010.
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+ALTER TABLE tasks ADD COLUMN search_vector TSVECTOR
+    GENERATED ALWAYS AS (to_tsvector('english', description)) STORED;
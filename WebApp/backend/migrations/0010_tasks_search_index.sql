@@ -0,0 +1,4 @@
+-- migrate: no-transaction
+-- Search: btree_gin lets user_id share the GIN index, so a search only reads the user's own postings.
+DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_search;
+CREATE INDEX CONCURRENTLY idx_tasks_search ON tasks USING GIN (user_id, search_vector);
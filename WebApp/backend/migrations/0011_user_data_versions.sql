@@ -0,0 +1,43 @@
+-- Per-user change counters behind the ETags of GET /tasks and GET /user/profile.
+-- Bumped by triggers, so every write path (single, batch, sweeps) is covered.
+CREATE TABLE user_data_versions (
+    user_id UUID PRIMARY KEY REFERENCES users(user_id) ON DELETE CASCADE,
+    tasks_version BIGINT NOT NULL DEFAULT 0,
+    profile_version BIGINT NOT NULL DEFAULT 0
+);
+
+-- Statement-level: one bump per user per statement, however many rows it touched.
+-- The join skips users being deleted (their tasks go with them through ON DELETE CASCADE).
+CREATE FUNCTION bump_tasks_version() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO user_data_versions (user_id, tasks_version)
+        SELECT DISTINCT r.user_id, 1 FROM old_rows r JOIN users u ON u.user_id = r.user_id
+        ON CONFLICT (user_id) DO UPDATE SET tasks_version = user_data_versions.tasks_version + 1;
+    ELSE
+        INSERT INTO user_data_versions (user_id, tasks_version)
+        SELECT DISTINCT r.user_id, 1 FROM new_rows r JOIN users u ON u.user_id = r.user_id
+        ON CONFLICT (user_id) DO UPDATE SET tasks_version = user_data_versions.tasks_version + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_bump_version_insert AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_tasks_version();
+CREATE TRIGGER tasks_bump_version_update AFTER UPDATE ON tasks
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_tasks_version();
+CREATE TRIGGER tasks_bump_version_delete AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_tasks_version();
+
+CREATE FUNCTION bump_profile_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO user_data_versions (user_id, profile_version) VALUES (NEW.user_id, 1)
+    ON CONFLICT (user_id) DO UPDATE SET profile_version = user_data_versions.profile_version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER user_profiles_bump_version AFTER UPDATE OF profile_image_url ON user_profiles
+    FOR EACH ROW WHEN (OLD.profile_image_url IS DISTINCT FROM NEW.profile_image_url)
+    EXECUTE FUNCTION bump_profile_version();
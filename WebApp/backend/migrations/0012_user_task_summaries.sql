@@ -0,0 +1,54 @@
+-- Per-user task counts by status behind GET /tasks/summary, so the summary is one primary key lookup.
+-- Kept up to date by triggers in the same transaction as every write to tasks;
+-- reconcile_task_summaries recounts it from tasks user by user and reports any drift.
+--
+-- The table starts empty and the triggers only add deltas, so on an existing database run
+--     python -m handlers.tasks.reconcile_task_summaries
+-- right after this migration; until it finishes, summaries undercount users' older tasks.
+-- It locks one user's row at a time instead of blocking writes to tasks while it counts.
+CREATE TABLE user_task_summaries (
+    user_id UUID PRIMARY KEY REFERENCES users(user_id) ON DELETE CASCADE,
+    pending BIGINT NOT NULL DEFAULT 0,
+    in_progress BIGINT NOT NULL DEFAULT 0,
+    completed BIGINT NOT NULL DEFAULT 0,
+    overdue BIGINT NOT NULL DEFAULT 0
+);
+
+-- Statement-level: the rows a statement touched are folded into one delta per user.
+-- Statements that leave every count unchanged (description or due date edits) write nothing.
+CREATE FUNCTION update_task_summaries() RETURNS trigger AS $$
+DECLARE
+    changes TEXT := CASE TG_OP
+        WHEN 'INSERT' THEN 'SELECT user_id, status, 1 AS delta FROM new_rows'
+        WHEN 'DELETE' THEN 'SELECT user_id, status, -1 AS delta FROM old_rows'
+        ELSE 'SELECT user_id, status, 1 AS delta FROM new_rows UNION ALL SELECT user_id, status, -1 FROM old_rows'
+    END;
+BEGIN
+    EXECUTE format($sql$
+        INSERT INTO user_task_summaries AS s (user_id, pending, in_progress, completed, overdue)
+        SELECT * FROM (
+            SELECT c.user_id,
+                   COALESCE(SUM(c.delta) FILTER (WHERE c.status = 'pending'), 0) AS pending,
+                   COALESCE(SUM(c.delta) FILTER (WHERE c.status = 'in_progress'), 0) AS in_progress,
+                   COALESCE(SUM(c.delta) FILTER (WHERE c.status = 'completed'), 0) AS completed,
+                   COALESCE(SUM(c.delta) FILTER (WHERE c.status = 'overdue'), 0) AS overdue
+            FROM (%s) c JOIN users u ON u.user_id = c.user_id
+            GROUP BY c.user_id
+        ) d
+        WHERE d.pending <> 0 OR d.in_progress <> 0 OR d.completed <> 0 OR d.overdue <> 0
+        ON CONFLICT (user_id) DO UPDATE SET
+            pending = s.pending + EXCLUDED.pending,
+            in_progress = s.in_progress + EXCLUDED.in_progress,
+            completed = s.completed + EXCLUDED.completed,
+            overdue = s.overdue + EXCLUDED.overdue
+    $sql$, changes);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_summary_insert AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION update_task_summaries();
+CREATE TRIGGER tasks_summary_update AFTER UPDATE ON tasks
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION update_task_summaries();
+CREATE TRIGGER tasks_summary_delete AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION update_task_summaries();
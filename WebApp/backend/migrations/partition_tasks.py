@@ -0,0 +1,348 @@
+"""
+Convert tasks into a table hash-partitioned on user_id, online.
+
+Every query the handlers run on tasks is scoped by user_id, so once tasks
+is partitioned each one reads (and vacuums, and caches) one partition of
+1/N the size. The conversion runs in steps, each safe to re-run:
+
+    prepare   create tasks_partitioned (PARTITION BY HASH (user_id), keyed
+              on (user_id, task_id)) with every index tasks has, and a
+              trigger mirroring each write to tasks into it
+    backfill  copy the existing rows in chunks of --chunk-size in task_id
+              order, one short transaction each, recording the position
+              reached in job_watermarks; run again, it resumes from there
+              (or from --after) until it records that it reached the end
+    swap      refused until the backfill has reached the end; then one
+              short transaction: lock tasks, drop the mirror, rename
+              tasks to tasks_unpartitioned and tasks_partitioned to tasks,
+              and move the indexes' names and the version and summary
+              triggers across
+    drop-old  drop tasks_unpartitioned once the new table has proven itself
+    abort     before swap, drop tasks_partitioned and the mirror trigger
+    all       prepare, backfill and swap, e.g. on a fresh database
+
+Apply the numbered migrations first: the indexes are copied from tasks as it
+is at prepare time, and CREATE INDEX CONCURRENTLY does not work on a
+partitioned table, so later index migrations must build each partition's
+index concurrently and then create the parent index. Needs PostgreSQL 14+,
+where a generic plan of a prepared UPDATE or DELETE still prunes to one
+partition. TRUNCATE on tasks during the conversion is not mirrored.
+
+Usage (from WebApp/backend):
+    python -m migrations.partition_tasks {prepare,backfill,swap,drop-old,abort,all}
+        [--partitions 16] [--chunk-size 5000] [--after TASK_ID] [--lock-timeout-ms 2000]
+"""
+import argparse
+import json
+import re
+import sys
+from datetime import datetime, timezone
+
+import psycopg2
+
+from commonUtil.config import config
+from commonUtil.db import db_connection
+from commonUtil.job_watermarks import JobWatermarkRepository
+
+PARTITIONED_TABLE = "tasks_partitioned"
+OLD_TABLE = "tasks_unpartitioned"
+MIRROR_TRIGGER = "tasks_mirror_to_partitioned"
+MIRROR_FUNCTION = "mirror_tasks_to_partitioned"
+# job_watermarks entry of the backfill: its last task_id, and whether it reached the end
+BACKFILL_JOB = "partition_tasks_backfill"
+# Indexes of tasks_partitioned carry NEW_SUFFIX until the swap, those of the old table OLD_SUFFIX after it
+NEW_SUFFIX = "_partitioned"
+OLD_SUFFIX = "_unpartitioned"
+
+# SQLSTATE of a statement cancelled by lock_timeout
+_LOCK_NOT_AVAILABLE = "55P03"
+_IDENTIFIER = re.compile(r"^[a-z_][a-z0-9_]*$")
+_INDEX_DEFINITION = re.compile(r"^CREATE (UNIQUE )?INDEX (\w+) ON (?:\w+\.)?tasks USING ")
+
+TABLE_KIND_SQL = "SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)"
+# Generated columns (search_vector) are recomputed by the partitioned table
+COLUMNS_SQL = """
+    SELECT column_name FROM information_schema.columns
+    WHERE table_schema = current_schema() AND table_name = 'tasks' AND is_generated = 'NEVER'
+    ORDER BY ordinal_position
+"""
+INDEXES_SQL = """
+    SELECT i.relname, pg_get_indexdef(i.oid), x.indisprimary
+    FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid
+    WHERE x.indrelid = %s::regclass
+"""
+TRIGGERS_SQL = "SELECT tgname, pg_get_triggerdef(oid) FROM pg_trigger WHERE tgrelid = %s::regclass AND NOT tgisinternal"
+
+CREATE_PARTITIONED_SQL = f"""
+    CREATE TABLE {PARTITIONED_TABLE} (
+        LIKE tasks INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING CONSTRAINTS,
+        CONSTRAINT tasks_pkey{NEW_SUFFIX} PRIMARY KEY (user_id, task_id),
+        CONSTRAINT tasks_user_id_fkey FOREIGN KEY (user_id) REFERENCES users (user_id) ON DELETE CASCADE
+    ) PARTITION BY HASH (user_id)
+"""
+CREATE_PARTITION_SQL = (
+    "CREATE TABLE tasks_p{remainder} PARTITION OF " + PARTITIONED_TABLE
+    + " FOR VALUES WITH (MODULUS {modulus}, REMAINDER {remainder})"
+)
+# Applies each write to tasks to tasks_partitioned in the same transaction.
+# Backfilled rows are locked FOR KEY SHARE, so a delete waits for their copy
+# to commit and then removes it; an update upserts over it.
+MIRROR_FUNCTION_SQL = """
+    CREATE OR REPLACE FUNCTION {function}() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.user_id IS DISTINCT FROM NEW.user_id) THEN
+            DELETE FROM {table} WHERE user_id = OLD.user_id AND task_id = OLD.task_id;
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            INSERT INTO {table} ({columns}) VALUES ({values})
+            ON CONFLICT (user_id, task_id) DO UPDATE SET {updates};
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+CREATE_MIRROR_TRIGGER_SQL = (
+    f"CREATE TRIGGER {MIRROR_TRIGGER} AFTER INSERT OR UPDATE OR DELETE ON tasks "
+    f"FOR EACH ROW EXECUTE FUNCTION {MIRROR_FUNCTION}()"
+)
+# One backfill chunk. Rows already mirrored are left alone. Returns the rows
+# read and the last task_id.
+BACKFILL_SQL = """
+    WITH chunk AS (
+        SELECT {columns} FROM tasks{where}
+        ORDER BY task_id
+        LIMIT %s
+        FOR KEY SHARE
+    ), copied AS (
+        INSERT INTO {table} ({columns}) SELECT {columns} FROM chunk
+        ON CONFLICT (user_id, task_id) DO NOTHING
+    )
+    SELECT (SELECT COUNT(*) FROM chunk), task_id
+    FROM chunk ORDER BY task_id DESC LIMIT 1
+"""
+
+
+class PartitionError(Exception):
+    """Raised when a step is run out of order or tasks_partitioned is not ready to replace tasks."""
+
+
+def _today():
+    return datetime.now(timezone.utc).date()
+
+
+def table_kind(cursor, table):
+    """pg_class.relkind of ``table`` ("r" plain, "p" partitioned), or None if it does not exist."""
+    cursor.execute(TABLE_KIND_SQL, (table,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def copied_columns(cursor):
+    """The columns of tasks the conversion copies."""
+    cursor.execute(COLUMNS_SQL)
+    columns = [row[0] for row in cursor.fetchall()]
+    for column in columns:
+        if not _IDENTIFIER.match(column):
+            raise PartitionError(f"Column name {column!r} would need quoting")
+    return columns
+
+
+def partitioned_index(definition):
+    """Rewrite a tasks index definition for tasks_partitioned, its name suffixed with NEW_SUFFIX."""
+    match = _INDEX_DEFINITION.match(definition)
+    if not match:
+        raise PartitionError(f"Cannot copy index: {definition}")
+    unique, name = match.group(1) or "", match.group(2)
+    return f"CREATE {unique}INDEX {name}{NEW_SUFFIX} ON {PARTITIONED_TABLE} USING " + definition[match.end():]
+
+
+def mirror_function_sql(columns):
+    keys = ("user_id", "task_id")
+    return MIRROR_FUNCTION_SQL.format(
+        function=MIRROR_FUNCTION,
+        table=PARTITIONED_TABLE,
+        columns=", ".join(columns),
+        values=", ".join(f"NEW.{column}" for column in columns),
+        updates=", ".join(f"{column} = EXCLUDED.{column}" for column in columns if column not in keys),
+    )
+
+
+def prepare(connection, partitions, log=print):
+    """Create tasks_partitioned with its partitions and indexes, and start mirroring writes into it."""
+    with connection.cursor() as cursor:
+        if table_kind(cursor, "tasks") == "p":
+            raise PartitionError("tasks is already partitioned")
+        if table_kind(cursor, PARTITIONED_TABLE):
+            log(f"{PARTITIONED_TABLE} already exists")
+            return False
+        cursor.execute(CREATE_PARTITIONED_SQL)
+        for remainder in range(partitions):
+            cursor.execute(CREATE_PARTITION_SQL.format(modulus=partitions, remainder=remainder))
+        # Indexes on the parent are created on every partition
+        cursor.execute(INDEXES_SQL, ("tasks",))
+        for name, definition, primary in cursor.fetchall():
+            if not primary:  # replaced by the (user_id, task_id) key
+                cursor.execute(partitioned_index(definition))
+        # Nothing is copied yet, whatever an earlier, aborted conversion recorded
+        JobWatermarkRepository(cursor).save(BACKFILL_JOB, _today(), None, False)
+        cursor.execute(mirror_function_sql(copied_columns(cursor)))
+        cursor.execute(CREATE_MIRROR_TRIGGER_SQL)
+    connection.commit()
+    log(f"Created {PARTITIONED_TABLE} with {partitions} partitions; writes to tasks are mirrored into it")
+    return True
+
+
+def backfill(connection, chunk_size, after=None, log=print):
+    """
+    Copy the rows of tasks into tasks_partitioned in task_id order, one
+    transaction per chunk, starting after ``after`` or else where an
+    unfinished backfill stopped. Each chunk commits with its position in
+    job_watermarks, and the last one records that the copy is complete,
+    which swap requires. Returns the rows read.
+    """
+    copied_total = 0
+    with connection.cursor() as cursor:
+        if not table_kind(cursor, PARTITIONED_TABLE):
+            raise PartitionError(f"{PARTITIONED_TABLE} does not exist; run prepare first")
+        watermarks = JobWatermarkRepository(cursor)
+        last_run = watermarks.last_run(BACKFILL_JOB)
+        if after is None and last_run and last_run[1] and not last_run[2]:
+            after = last_run[1][1]
+            log(f"Resuming the backfill after {after}")
+        columns = ", ".join(copied_columns(cursor))
+        while True:
+            if after:
+                query = BACKFILL_SQL.format(columns=columns, table=PARTITIONED_TABLE, where=" WHERE task_id > %s")
+                params = (after, chunk_size)
+            else:
+                query = BACKFILL_SQL.format(columns=columns, table=PARTITIONED_TABLE, where="")
+                params = (chunk_size,)
+            cursor.execute(query, params)
+            row = cursor.fetchone()
+            copied = row[0] if row else 0
+            if row:
+                after = str(row[1])
+            finished = copied < chunk_size
+            watermarks.save(BACKFILL_JOB, _today(), (None, after) if after else None, finished)
+            connection.commit()
+            if row:
+                copied_total += copied
+                log(json.dumps({"copied": copied, "after": after}))
+            if finished:
+                break
+        cursor.execute(f"ANALYZE {PARTITIONED_TABLE}")
+    connection.commit()
+    log(f"Backfilled {copied_total} tasks")
+    return copied_total
+
+
+def _index_names(cursor, table):
+    cursor.execute(INDEXES_SQL, (table,))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def swap(connection, lock_timeout_ms, log=print):
+    """
+    Make tasks_partitioned the tasks table in one transaction. The old table
+    is kept, no longer written to, as tasks_unpartitioned. Refused unless a
+    backfill recorded that it reached the end.
+    """
+    try:
+        with connection.cursor() as cursor:
+            if table_kind(cursor, "tasks") == "p":
+                log("tasks is already partitioned")
+                return False
+            if not table_kind(cursor, PARTITIONED_TABLE):
+                raise PartitionError(f"{PARTITIONED_TABLE} does not exist; run prepare and backfill first")
+            # Queued behind a long transaction, the lock would stall every request; give up and retry instead
+            cursor.execute("SET LOCAL lock_timeout = %s", (f"{lock_timeout_ms}ms",))
+            cursor.execute("LOCK TABLE tasks IN ACCESS EXCLUSIVE MODE")
+
+            # Rows written since prepare are mirrored; older ones are only there once a backfill reached the end
+            last_run = JobWatermarkRepository(cursor).last_run(BACKFILL_JOB)
+            if not last_run or not last_run[2]:
+                raise PartitionError(f"The backfill of {PARTITIONED_TABLE} has not finished; run backfill first")
+            old_indexes = _index_names(cursor, "tasks")
+            new_indexes = _index_names(cursor, PARTITIONED_TABLE)
+            missing = [name for name in old_indexes if name + NEW_SUFFIX not in new_indexes]
+            if missing:
+                raise PartitionError(f"{PARTITIONED_TABLE} lacks indexes added since prepare: {', '.join(missing)}")
+            cursor.execute(TRIGGERS_SQL, ("tasks",))
+            triggers = [(name, definition) for name, definition in cursor.fetchall() if name != MIRROR_TRIGGER]
+
+            cursor.execute(f"DROP TRIGGER {MIRROR_TRIGGER} ON tasks")
+            cursor.execute(f"DROP FUNCTION {MIRROR_FUNCTION}()")
+            for name, _ in triggers:
+                cursor.execute(f"DROP TRIGGER {name} ON tasks")
+            cursor.execute(f"ALTER TABLE tasks RENAME TO {OLD_TABLE}")
+            cursor.execute(f"ALTER TABLE {PARTITIONED_TABLE} RENAME TO tasks")
+            for name in old_indexes:
+                cursor.execute(f"ALTER INDEX {name} RENAME TO {name}{OLD_SUFFIX}")
+            for name in new_indexes:
+                if name.endswith(NEW_SUFFIX):
+                    cursor.execute(f"ALTER INDEX {name} RENAME TO {name[:-len(NEW_SUFFIX)]}")
+            # The definitions name "tasks", which is now the partitioned table
+            for _, definition in triggers:
+                cursor.execute(definition)
+        connection.commit()
+    except (psycopg2.Error, PartitionError):
+        connection.rollback()
+        raise
+    log(f"tasks is now partitioned; the old table is {OLD_TABLE}")
+    return True
+
+
+def drop_old(connection, log=print):
+    """Drop the table tasks was before the swap."""
+    with connection.cursor() as cursor:
+        if table_kind(cursor, "tasks") != "p":
+            raise PartitionError("tasks is not partitioned yet; run swap first")
+        cursor.execute(f"DROP TABLE IF EXISTS {OLD_TABLE}")
+    connection.commit()
+    log(f"Dropped {OLD_TABLE}")
+
+
+def abort(connection, log=print):
+    """Undo prepare (and any backfill); tasks is left as it was."""
+    with connection.cursor() as cursor:
+        if table_kind(cursor, "tasks") == "p":
+            raise PartitionError("tasks is already partitioned; the old table is kept as " + OLD_TABLE)
+        cursor.execute(f"DROP TRIGGER IF EXISTS {MIRROR_TRIGGER} ON tasks")
+        cursor.execute(f"DROP FUNCTION IF EXISTS {MIRROR_FUNCTION}()")
+        cursor.execute(f"DROP TABLE IF EXISTS {PARTITIONED_TABLE}")
+        JobWatermarkRepository(cursor).save(BACKFILL_JOB, _today(), None, False)
+    connection.commit()
+    log(f"Dropped {PARTITIONED_TABLE} and the mirror trigger")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("step", choices=["prepare", "backfill", "swap", "drop-old", "abort", "all"])
+    parser.add_argument("--partitions", type=int, default=16, help="Hash partitions to create (prepare)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows copied per transaction (backfill)")
+    parser.add_argument("--after", help="Start after this task_id instead of where the last backfill stopped (backfill)")
+    parser.add_argument("--lock-timeout-ms", type=int, default=2000, help="Longest wait for the table lock (swap)")
+    args = parser.parse_args()
+
+    with db_connection(config.DB_HOST, config.DB_NAME, config.DB_USER, config.DB_PASSWORD, config.DB_PORT) as connection:
+        try:
+            if args.step in ("prepare", "all"):
+                prepare(connection, args.partitions)
+            if args.step in ("backfill", "all"):
+                backfill(connection, args.chunk_size, args.after)
+            if args.step in ("swap", "all"):
+                swap(connection, args.lock_timeout_ms)
+            if args.step == "drop-old":
+                drop_old(connection)
+            if args.step == "abort":
+                abort(connection)
+        except PartitionError as e:
+            sys.exit(str(e))
+        except psycopg2.Error as e:
+            if e.pgcode != _LOCK_NOT_AVAILABLE:
+                raise
+            sys.exit("Timed out waiting for the lock on tasks; nothing was changed, run swap again")
+
+
+if __name__ == "__main__":
+    main()
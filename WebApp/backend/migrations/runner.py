@@ -0,0 +1,198 @@
+"""
+Versioned schema migrations for the database configured through DB_*.
+
+tables.sh creates the baseline schema; every change after it is a file in
+this directory named <version>_<name>.sql, applied once, in version order,
+and recorded in schema_migrations with a checksum. Editing a migration that
+has already been applied is an error; add a new one instead.
+
+A migration runs in a single transaction unless its first line is
+
+    -- migrate: no-transaction
+
+in which case each statement runs on its own in autocommit mode, as
+CREATE INDEX CONCURRENTLY requires. Such files hold statements separated
+by semicolons (a DO block quoted with $$ is kept whole) and should be safe
+to re-run, e.g. DROP INDEX CONCURRENTLY IF EXISTS before the CREATE,
+because a failure part-way leaves the earlier statements applied.
+
+Migrations that change behaviour or need a follow-up step:
+
+    0003  usernames are unique ignoring case, and login matches them
+          case-insensitively; it stops, listing them, if existing usernames
+          differ only in case
+    0012  run python -m handlers.tasks.reconcile_task_summaries once it is
+          applied, to count the tasks that existed before its triggers
+
+Usage (from WebApp/backend):
+    python -m migrations.runner [--status] [--dry-run]
+"""
+import argparse
+import hashlib
+import os
+import re
+import sys
+from collections import namedtuple
+
+from commonUtil.config import config
+from commonUtil.db import db_connection
+
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+NO_TRANSACTION_MARKER = "-- migrate: no-transaction"
+
+# pg_advisory_lock key held while migrating; any constant shared by every runner
+ADVISORY_LOCK_KEY = 5_310_023
+
+CREATE_MIGRATIONS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        checksum TEXT NOT NULL,
+        applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+APPLIED_MIGRATIONS_SQL = "SELECT version, checksum FROM schema_migrations"
+RECORD_MIGRATION_SQL = "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)"
+
+_FILENAME = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+Migration = namedtuple("Migration", ["version", "name", "sql", "transactional", "checksum"])
+
+
+class MigrationError(Exception):
+    """Raised when the migrations on disk and those applied to the database disagree."""
+
+
+def load_migrations(directory=MIGRATIONS_DIR):
+    """Every migration file in ``directory``, in version order."""
+    migrations = []
+    for filename in os.listdir(directory):
+        match = _FILENAME.match(filename)
+        if not match:
+            continue
+        with open(os.path.join(directory, filename)) as f:
+            sql = f.read()
+        migrations.append(Migration(
+            version=int(match.group(1)),
+            name=match.group(2),
+            sql=sql,
+            transactional=not sql.lstrip().startswith(NO_TRANSACTION_MARKER),
+            checksum=hashlib.sha256(sql.encode("utf-8")).hexdigest(),
+        ))
+    migrations.sort(key=lambda migration: migration.version)
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise MigrationError(f"Duplicate migration versions in {directory}")
+    return migrations
+
+
+def split_statements(sql):
+    """The statements of a no-transaction migration, comments dropped and $$ bodies kept whole."""
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    statements, current, quoted = [], "", False
+    for part in re.split(r"(\$\$)", "\n".join(lines)):
+        if part == "$$":
+            quoted = not quoted
+            current += part
+            continue
+        if quoted:
+            current += part
+            continue
+        first, *rest = part.split(";")
+        current += first
+        for piece in rest:
+            statements.append(current)
+            current = piece
+    statements.append(current)
+    return [statement.strip() for statement in statements if statement.strip()]
+
+
+def pending_migrations(migrations, applied):
+    """
+    The migrations not yet applied, given {version: checksum} of those that
+    are. Raises MigrationError if an applied migration has changed on disk.
+    """
+    for migration in migrations:
+        if migration.version in applied and applied[migration.version] != migration.checksum:
+            raise MigrationError(
+                f"Migration {migration.version}_{migration.name} was changed after it was applied"
+            )
+    return [migration for migration in migrations if migration.version not in applied]
+
+
+def applied_migrations(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(CREATE_MIGRATIONS_TABLE_SQL)
+        cursor.execute(APPLIED_MIGRATIONS_SQL)
+        return dict(cursor.fetchall())
+
+
+def apply_migration(connection, migration):
+    """Run one migration and record it; the connection must be in autocommit mode."""
+    with connection.cursor() as cursor:
+        if migration.transactional:
+            cursor.execute("BEGIN")
+            try:
+                cursor.execute(migration.sql)
+                cursor.execute(RECORD_MIGRATION_SQL, (migration.version, migration.name, migration.checksum))
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+        else:
+            for statement in split_statements(migration.sql):
+                cursor.execute(statement)
+            cursor.execute(RECORD_MIGRATION_SQL, (migration.version, migration.name, migration.checksum))
+
+
+def migrate(connection, migrations, dry_run=False, log=print):
+    """
+    Apply every pending migration in order, holding an advisory lock so two
+    runners never interleave. Returns the migrations applied (or, on a dry
+    run, those that would be).
+    """
+    connection.autocommit = True
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(%s)", (ADVISORY_LOCK_KEY,))
+        # Index builds on large tables outlast any sensible statement timeout
+        cursor.execute("SET statement_timeout = 0")
+    try:
+        pending = pending_migrations(migrations, applied_migrations(connection))
+        for migration in pending:
+            mode = "in a transaction" if migration.transactional else "statement by statement"
+            if dry_run:
+                log(f"Would apply {migration.version}_{migration.name} ({mode})")
+                continue
+            log(f"Applying {migration.version}_{migration.name} ({mode})")
+            apply_migration(connection, migration)
+        return pending
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", (ADVISORY_LOCK_KEY,))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--status", action="store_true", help="List applied and pending migrations and exit")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would be applied")
+    args = parser.parse_args()
+
+    migrations = load_migrations()
+    with db_connection(config.DB_HOST, config.DB_NAME, config.DB_USER, config.DB_PASSWORD, config.DB_PORT) as connection:
+        try:
+            if args.status:
+                connection.autocommit = True
+                applied = applied_migrations(connection)
+                for migration in migrations:
+                    state = "applied" if migration.version in applied else "pending"
+                    print(f"{migration.version:>5} {migration.name:<40} {state}")
+                pending_migrations(migrations, applied)
+                return
+            applied = migrate(connection, migrations, dry_run=args.dry_run)
+        except MigrationError as e:
+            sys.exit(str(e))
+    print(f"{len(applied)} migration(s) {'pending' if args.dry_run else 'applied'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+-- Baseline schema. Changes after it are versioned migrations in migrations/ (python -m migrations.runner).
+
 CREATE TABLE users (
     user_id UUID PRIMARY KEY NOT NULL,
     username VARCHAR(50) UNIQUE NOT NULL,
@@ -0,0 +1,16 @@
+import pytest
+from unittest.mock import patch
+from commonUtil.auth import generate_jwt, clear_jwt_cache
+
+TEST_JWT_SECRET = "test-secret-K8pEr3Vx7Qz9JyB2sT5nM4cF"
+TEST_USER_ID = "b613bb6c-77e8-439d-890c-f9203f6bc70a"
+
+
+@pytest.fixture
+def auth_headers():
+    """Patches the JWT secret and returns headers carrying a valid bearer token."""
+    clear_jwt_cache()
+    with patch("commonUtil.auth.config.JWT_SECRET", TEST_JWT_SECRET):
+        token = generate_jwt(payload={"user_id": TEST_USER_ID, "username": "test_user"}, secret=TEST_JWT_SECRET)
+        yield {"Authorization": f"Bearer {token}"}
+    clear_jwt_cache()
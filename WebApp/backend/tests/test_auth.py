@@ -0,0 +1,96 @@
+import json
+import time
+import jwt
+import pytest
+from unittest.mock import patch
+from commonUtil import auth
+from commonUtil.auth import validate_jwt_cached, clear_jwt_cache, require_auth, get_user_id
+from commonUtil.constants.http_status import http_status
+from commonUtil.constants.error_messages import error_messages
+from tests.conftest import TEST_JWT_SECRET, TEST_USER_ID
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_jwt_cache()
+    yield
+    clear_jwt_cache()
+
+
+def make_token(exp_offset=3600, secret=TEST_JWT_SECRET):
+    return jwt.encode({"user_id": TEST_USER_ID, "exp": int(time.time()) + exp_offset}, secret, algorithm="HS256")
+
+
+def test_cached_token_skips_verification():
+    """The second validation of the same token is served from the cache."""
+    token = make_token()
+    with patch("commonUtil.auth.validate_jwt", wraps=auth.validate_jwt) as mock_validate:
+        assert validate_jwt_cached(token, TEST_JWT_SECRET)["user_id"] == TEST_USER_ID
+        assert validate_jwt_cached(token, TEST_JWT_SECRET)["user_id"] == TEST_USER_ID
+    assert mock_validate.call_count == 1
+
+
+def test_entry_dropped_at_exp():
+    """Once exp passes, the cached entry is ignored and the token re-verified."""
+    token = make_token()
+    validate_jwt_cached(token, TEST_JWT_SECRET)
+
+    with patch("commonUtil.auth.time.time", return_value=time.time() + 7200), \
+         patch("commonUtil.auth.validate_jwt", side_effect=jwt.ExpiredSignatureError) as mock_validate:
+        with pytest.raises(jwt.ExpiredSignatureError):
+            validate_jwt_cached(token, TEST_JWT_SECRET)
+    mock_validate.assert_called_once()
+    assert len(auth._token_cache) == 0
+
+
+def test_invalid_token_not_cached():
+    """Tokens that fail verification never enter the cache."""
+    with pytest.raises(jwt.InvalidTokenError):
+        validate_jwt_cached(make_token(secret="other-secret-aD0wL3iR8oUvK8pEr3Vx7Q"), TEST_JWT_SECRET)
+    assert len(auth._token_cache) == 0
+
+
+def test_cache_is_bounded():
+    """The least recently used token is evicted when the cache is full."""
+    with patch.object(auth.app_constants, "JWT_CACHE_MAX_SIZE", 2):
+        tokens = [make_token(exp_offset=3600 + i) for i in range(3)]
+        for token in tokens:
+            validate_jwt_cached(token, TEST_JWT_SECRET)
+    assert len(auth._token_cache) == 2
+
+
+def test_require_auth_puts_user_id_on_request(auth_headers):
+    """The decorated handler receives the authenticated user_id on the event."""
+    @require_auth
+    def handler(event, context):
+        return get_user_id(event)
+
+    assert handler({"headers": auth_headers}, None) == TEST_USER_ID
+
+
+@pytest.mark.parametrize("headers, expected_error", [
+    ({}, error_messages.MISSING_AUTH_TOKEN),
+    ({"Authorization": "Bearer not-a-jwt"}, error_messages.JWT_INVALID),
+])
+def test_require_auth_rejects_bad_tokens(headers, expected_error):
+    """Missing or invalid tokens short-circuit with 401 before the handler runs."""
+    @require_auth
+    def handler(event, context):
+        raise AssertionError("handler must not run")
+
+    with patch("commonUtil.auth.config.JWT_SECRET", TEST_JWT_SECRET):
+        response = handler({"headers": headers}, None)
+    assert response["statusCode"] == http_status.UNAUTHORIZED
+    assert json.loads(response["body"]) == {"error": expected_error}
+
+
+def test_require_auth_rejects_expired_token():
+    """Expired tokens map to the JWT_EXPIRED error."""
+    @require_auth
+    def handler(event, context):
+        raise AssertionError("handler must not run")
+
+    token = make_token(exp_offset=-60)
+    with patch("commonUtil.auth.config.JWT_SECRET", TEST_JWT_SECRET):
+        response = handler({"headers": {"Authorization": f"Bearer {token}"}}, None)
+    assert json.loads(response["body"]) == {"error": error_messages.JWT_EXPIRED}
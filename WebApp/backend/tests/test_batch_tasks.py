@@ -0,0 +1,98 @@
+import json
+import pytest
+from unittest.mock import patch
+from handlers.tasks.batch_tasks import lambda_handler
+from commonUtil.constants.http_status import http_status
+from commonUtil.constants.error_messages import error_messages
+from tests.conftest import TEST_USER_ID
+
+TASK_A = "00000000-0000-0000-0000-00000000000a"
+TASK_B = "00000000-0000-0000-0000-00000000000b"
+
+
+def make_task(task_id, description="Task"):
+    return {"task_id": task_id, "description": description, "due_date": None, "status": "pending", "created_at": None}
+
+
+@pytest.fixture
+def make_event(auth_headers):
+    """Returns a factory for authenticated POST /tasks/batch events."""
+    def _make_event(operations):
+        return {"headers": auth_headers, "body": json.dumps({"operations": operations})}
+    return _make_event
+
+
+@pytest.fixture
+def mock_repository():
+    """Patches get_cursor and TaskRepository in the handler, returning the repository mock."""
+    with patch("handlers.tasks.batch_tasks.get_cursor"), \
+         patch("handlers.tasks.batch_tasks.TaskRepository") as mock_repository_class:
+        yield mock_repository_class.return_value
+
+
+def test_batch_applies_one_statement_per_operation_type(make_event, mock_repository):
+    """Creates, updates and deletes are each sent as a single multi-row statement."""
+    mock_repository.create_many.return_value = [make_task("new-1"), make_task("new-2")]
+    mock_repository.update_many.return_value = {TASK_A: make_task(TASK_A, "Updated")}
+    mock_repository.delete_many.return_value = set()
+
+    response = lambda_handler(make_event([
+        {"op": "create", "description": "First"},
+        {"op": "update", "task_id": TASK_A, "description": "Updated"},
+        {"op": "create", "description": "Second", "status": "in_progress"},
+        {"op": "delete", "task_id": TASK_B},
+    ]), None)
+
+    assert response["statusCode"] == http_status.OK
+    results = json.loads(response["body"])["results"]
+    assert [result["status"] for result in results] == [
+        http_status.CREATED, http_status.OK, http_status.CREATED, http_status.NOT_FOUND
+    ]
+    assert results[1]["task"]["description"] == "Updated"
+    mock_repository.create_many.assert_called_once_with(
+        TEST_USER_ID, [("First", None, "pending"), ("Second", None, "in_progress")]
+    )
+    mock_repository.update_many.assert_called_once_with(TEST_USER_ID, [(TASK_A, "Updated", None, None)])
+    mock_repository.delete_many.assert_called_once()
+
+
+def test_batch_is_chunked(make_event, mock_repository):
+    """Large batches are split into BATCH_CHUNK_SIZE statements."""
+    mock_repository.create_many.side_effect = lambda user_id, tasks: [make_task(str(i)) for i in range(len(tasks))]
+
+    with patch("handlers.tasks.batch_tasks.app_constants.BATCH_CHUNK_SIZE", 2):
+        response = lambda_handler(make_event([{"op": "create", "description": f"Task {i}"} for i in range(5)]), None)
+
+    assert response["statusCode"] == http_status.OK
+    assert len(json.loads(response["body"])["results"]) == 5
+    assert mock_repository.create_many.call_count == 3
+
+
+def test_batch_rejected_when_any_item_invalid(make_event, mock_repository):
+    """Validation runs over every item before anything is written."""
+    response = lambda_handler(make_event([
+        {"op": "create", "description": "Valid"},
+        {"op": "rename", "task_id": TASK_A},
+        {"op": "update", "task_id": "not-a-uuid"},
+        {"op": "delete", "task_id": TASK_B},
+        {"op": "update", "task_id": TASK_B, "status": "completed"},
+    ]), None)
+
+    assert response["statusCode"] == http_status.BAD_REQUEST
+    body = json.loads(response["body"])
+    assert body["error"] == error_messages.INVALID_BATCH_ITEMS
+    assert body["details"] == [
+        {"index": 1, "error": error_messages.INVALID_BATCH_OPERATION},
+        {"index": 2, "error": error_messages.INVALID_TASK_ID},
+        {"index": 4, "error": error_messages.DUPLICATE_BATCH_TASK},
+    ]
+    mock_repository.create_many.assert_not_called()
+
+
+@pytest.mark.parametrize("operations", [[], "not-a-list", [{"op": "delete", "task_id": TASK_A}] * 5001])
+def test_batch_size_limits(make_event, mock_repository, operations):
+    """Empty, malformed and oversized batches are rejected up front."""
+    response = lambda_handler(make_event(operations), None)
+
+    assert response["statusCode"] == http_status.BAD_REQUEST
+    assert json.loads(response["body"]) == {"error": error_messages.INVALID_BATCH}
@@ -0,0 +1,81 @@
+import base64
+import gzip
+import json
+import pytest
+from unittest.mock import patch
+from commonUtil import compression
+from commonUtil.compression import negotiate_encoding
+from commonUtil.request_helpers import get_body
+from commonUtil.response_helpers import create_success_response
+
+LARGE_BODY = {"tasks": [{"task_id": str(i), "description": "Write the quarterly report", "status": "pending"} for i in range(200)]}
+
+
+def decode_body(response):
+    raw = base64.b64decode(response["body"])
+    if response["headers"]["Content-Encoding"] == "gzip":
+        return json.loads(gzip.decompress(raw))
+    return json.loads(compression.brotli.decompress(raw))
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip", "gzip"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("br;q=0, gzip;q=0", None),
+    ("*", "br"),
+    ("identity", None),
+    ("", None),
+])
+def test_negotiate_encoding(accept_encoding, expected):
+    pytest.importorskip("brotli")
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+def test_gzip_only_without_brotli():
+    with patch.object(compression, "brotli", None):
+        assert negotiate_encoding("br, gzip") == "gzip"
+        assert negotiate_encoding("br") is None
+
+
+@pytest.mark.parametrize("accept_encoding", ["gzip", "br"])
+def test_large_body_compressed(accept_encoding):
+    """Large bodies come back compressed, base64-encoded for API Gateway, with a weak ETag."""
+    if accept_encoding == "br":
+        pytest.importorskip("brotli")
+
+    response = create_success_response(200, LARGE_BODY, {"ETag": '"tasks.1"'}, accept_encoding=accept_encoding)
+
+    assert response["isBase64Encoded"] is True
+    assert response["headers"]["Content-Encoding"] == accept_encoding
+    assert response["headers"]["Vary"] == "Accept-Encoding"
+    assert response["headers"]["ETag"] == 'W/"tasks.1"'
+    assert decode_body(response) == LARGE_BODY
+
+
+def test_small_body_not_compressed():
+    response = create_success_response(200, {"message": "ok"}, accept_encoding="gzip")
+
+    assert "isBase64Encoded" not in response
+    assert json.loads(response["body"]) == {"message": "ok"}
+
+
+def test_already_encoded_or_binary_not_compressed():
+    for headers in ({"Content-Encoding": "gzip"}, {"Content-Type": "image/webp"}):
+        response = create_success_response(200, LARGE_BODY, headers, accept_encoding="gzip")
+        assert "isBase64Encoded" not in response
+
+
+def test_no_accept_encoding_keeps_identity():
+    response = create_success_response(200, LARGE_BODY, accept_encoding="")
+
+    assert json.loads(response["body"]) == LARGE_BODY
+    assert response["headers"]["Vary"] == "Accept-Encoding"
+
+
+def test_base64_request_body_decoded():
+    """With binary media types enabled, API Gateway base64-encodes JSON request bodies too."""
+    event = {"body": base64.b64encode(b'{"a": 1}').decode(), "isBase64Encoded": True}
+
+    assert json.loads(get_body(event)) == {"a": 1}
+    assert get_body({"body": '{"a": 1}'}) == '{"a": 1}'
@@ -0,0 +1,71 @@
+import json
+import pytest
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+from handlers.tasks.create_task import lambda_handler
+from commonUtil.constants.http_status import http_status
+from commonUtil.constants.error_messages import error_messages
+from tests.conftest import TEST_USER_ID
+
+TASK_ROW = ("00000000-0000-0000-0000-000000000001", "Write report", date(2030, 1, 1), "pending", datetime(2024, 1, 1))
+
+
+@pytest.fixture
+def create_event(auth_headers):
+    """Returns an authenticated POST /tasks event."""
+    return {
+        "headers": auth_headers,
+        "body": json.dumps({"description": "Write report", "due_date": "2030-01-01", "status": "pending"}),
+    }
+
+
+@pytest.fixture
+def mock_get_cursor():
+    """Patches get_cursor in the handler; the cursor returns TASK_ROW."""
+    with patch("handlers.tasks.create_task.get_cursor") as mock_get_cursor:
+        cursor = MagicMock()
+        cursor.fetchone.return_value = TASK_ROW
+        mock_get_cursor.return_value.__enter__.return_value = cursor
+        yield mock_get_cursor
+
+
+def test_create_task_single_statement(create_event, mock_get_cursor):
+    """Creating a task costs one INSERT ... RETURNING and no explicit commit."""
+    response = lambda_handler(create_event, None)
+
+    assert response["statusCode"] == http_status.CREATED
+    assert json.loads(response["body"])["task"] == {
+        "task_id": TASK_ROW[0],
+        "description": "Write report",
+        "due_date": "2030-01-01",
+        "status": "pending",
+        "created_at": "2024-01-01T00:00:00",
+    }
+    cursor = mock_get_cursor.return_value.__enter__.return_value
+    assert cursor.execute.call_count == 1
+    query, params = cursor.execute.call_args[0]
+    assert query.startswith("INSERT INTO tasks") and "RETURNING" in query
+    assert params[1] == TEST_USER_ID
+    mock_get_cursor.assert_called_once_with(autocommit=True)
+    cursor.connection.commit.assert_not_called()
+
+
+def test_create_task_invalid_input(auth_headers, mock_get_cursor):
+    """Invalid input is rejected without touching the database."""
+    event = {"headers": auth_headers, "body": json.dumps({"description": "", "due_date": "2030-01-01"})}
+
+    response = lambda_handler(event, None)
+
+    assert response["statusCode"] == http_status.BAD_REQUEST
+    assert json.loads(response["body"]) == {"error": error_messages.MISSING_DESCRIPTION}
+    mock_get_cursor.assert_not_called()
+
+
+def test_create_task_database_error(create_event, mock_get_cursor):
+    """Database failures map to TASK_CREATION_FAILED."""
+    mock_get_cursor.return_value.__enter__.return_value.execute.side_effect = Exception("Database failure")
+
+    response = lambda_handler(create_event, None)
+
+    assert response["statusCode"] == http_status.INTERNAL_SERVER_ERROR
+    assert json.loads(response["body"]) == {"error": error_messages.TASK_CREATION_FAILED}
@@ -0,0 +1,281 @@
+import json
+import pytest
+import psycopg2
+from unittest.mock import MagicMock, patch
+from commonUtil.db import (
+    ConnectionPool, PoolTimeoutError, normalize_sql, param_shape, fingerprint, plan_fingerprint,
+    explain_query, record_statement, get_cursor, get_db_session,
+    PreparingConnection, execute_prepared, statement_sql,
+)
+
+
+def make_conn():
+    """Returns a mocked psycopg2 connection that is open and idle."""
+    conn = MagicMock()
+    conn.closed = 0
+    conn.get_transaction_status.return_value = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+    return conn
+
+
+@pytest.fixture
+def pool():
+    return ConnectionPool(connect_kwargs={}, max_size=2, timeout=0.05, ping_interval=30)
+
+
+@patch("commonUtil.db.psycopg2.connect")
+def test_connection_reused_across_requests(mock_connect, pool):
+    """A returned connection is handed out again instead of reconnecting."""
+    mock_connect.return_value = make_conn()
+
+    conn = pool.getconn()
+    pool.putconn(conn)
+    assert pool.getconn() is conn
+    assert mock_connect.call_count == 1
+
+
+@patch("commonUtil.db.psycopg2.connect")
+def test_open_transaction_rolled_back_on_return(mock_connect, pool):
+    """An uncommitted transaction must not leak into the next checkout."""
+    conn = make_conn()
+    conn.get_transaction_status.return_value = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+    mock_connect.return_value = conn
+
+    pool.putconn(pool.getconn())
+    conn.rollback.assert_called_once()
+
+
+@patch("commonUtil.db.psycopg2.connect")
+def test_stale_connection_replaced_after_failed_ping(mock_connect):
+    """Idle connections are pinged and transparently replaced when the socket is dead."""
+    pool = ConnectionPool(connect_kwargs={}, max_size=1, timeout=0.05, ping_interval=0)
+    stale, fresh = make_conn(), make_conn()
+    stale.cursor.return_value.__enter__.return_value.execute.side_effect = psycopg2.OperationalError("server closed")
+    mock_connect.side_effect = [stale, fresh]
+
+    pool.putconn(pool.getconn())
+    assert pool.getconn() is fresh
+    stale.close.assert_called_once()
+
+
+@patch("commonUtil.db.psycopg2.connect")
+def test_pool_size_is_bounded(mock_connect, pool):
+    """Checkouts beyond the configured size time out instead of opening more connections."""
+    mock_connect.side_effect = [make_conn(), make_conn()]
+    pool.getconn()
+    pool.getconn()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.getconn()
+
+
+def test_normalize_sql_groups_statements_by_shape():
+    """Values, placeholders and batch sizes do not change the normalized text."""
+    one = normalize_sql("SELECT * FROM tasks WHERE user_id = %s  AND status = 'done' LIMIT 50")
+    two = normalize_sql("SELECT * FROM tasks WHERE user_id = %s AND status = 'it''s' LIMIT 10")
+    assert one == two == "SELECT * FROM tasks WHERE user_id = ? AND status = ? LIMIT ?"
+
+    small = normalize_sql(b"INSERT INTO tasks VALUES ('a'::uuid, 1), ('b'::uuid, 2) RETURNING task_id")
+    large = normalize_sql(b"INSERT INTO tasks VALUES ('c'::uuid, 3), ('d'::uuid, 4), ('e'::uuid, 5) RETURNING task_id")
+    assert small == large == "INSERT INTO tasks VALUES (?::uuid, ?), ... RETURNING task_id"
+
+
+def test_param_shape_hides_values():
+    assert param_shape(("secret@example.com", 3, None, ["a", "b"])) == ["str", "int", "NoneType", ["str", "str"]]
+    assert param_shape({"user_id": "x"}) == {"user_id": "str"}
+    assert param_shape(None) is None
+
+
+def test_plan_fingerprint_ignores_costs_and_timings():
+    def plan(rows, time):
+        return [{"Plan": {
+            "Node Type": "Limit", "Actual Rows": rows, "Actual Total Time": time,
+            "Plans": [{"Node Type": "Index Scan", "Relation Name": "tasks", "Index Name": "idx_tasks_user", "Actual Rows": rows}],
+        }}]
+    assert plan_fingerprint(plan(10, 1.5)) == plan_fingerprint(plan(500, 80.0))
+    assert plan_fingerprint(plan(10, 1.5)) != plan_fingerprint([{"Plan": {"Node Type": "Seq Scan", "Relation Name": "tasks"}}])
+
+
+def test_fast_statement_is_only_counted():
+    with patch("commonUtil.db.config.SLOW_QUERY_THRESHOLD_MS", 200), \
+         patch("commonUtil.db.increment") as mock_increment, patch("commonUtil.db.log_slow_query") as mock_log:
+        record_statement(make_conn(), "SELECT 1", None, 0.01)
+    mock_increment.assert_called_once_with("db_statements")
+    mock_log.assert_not_called()
+
+
+def test_slow_statement_logged_without_values(caplog):
+    with patch("commonUtil.db.config.SLOW_QUERY_THRESHOLD_MS", 200), \
+         patch("commonUtil.db.config.SLOW_QUERY_EXPLAIN_SAMPLE_RATE", 0):
+        record_statement(make_conn(), "SELECT * FROM users WHERE email = %s", ("secret@example.com",), 0.5)
+
+    [message] = [record.getMessage() for record in caplog.records]
+    logged = json.loads(message)
+    assert logged["sql"] == "SELECT * FROM users WHERE email = ?"
+    assert logged["params"] == ["str"]
+    assert logged["duration_ms"] == 500.0
+    assert logged["slow_query"] == fingerprint(logged["sql"])
+    assert "plan" not in logged
+    assert "secret@example.com" not in message
+
+
+def test_sampled_slow_select_is_explained_under_savepoint(caplog):
+    conn = make_conn()
+    conn.autocommit = False
+    explain_cursor = conn.cursor.return_value.__enter__.return_value
+    explain_cursor.fetchone.return_value = ([{"Plan": {"Node Type": "Seq Scan", "Relation Name": "tasks"}}],)
+
+    with patch("commonUtil.db.config.SLOW_QUERY_THRESHOLD_MS", 200), \
+         patch("commonUtil.db.config.SLOW_QUERY_EXPLAIN_SAMPLE_RATE", 1.0):
+        record_statement(conn, "SELECT * FROM tasks WHERE user_id = %s", ("u",), 0.5)
+
+    statements = [call.args[0] for call in explain_cursor.execute.call_args_list]
+    assert statements == [
+        "SAVEPOINT slow_query_explain",
+        "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) SELECT * FROM tasks WHERE user_id = %s",
+        "RELEASE SAVEPOINT slow_query_explain",
+    ]
+    assert conn.cursor.call_args.kwargs == {"cursor_factory": psycopg2.extensions.cursor}
+    logged = json.loads(caplog.records[0].getMessage())
+    assert logged["plan"][0]["Plan"]["Node Type"] == "Seq Scan"
+    assert "plan_fingerprint" in logged
+
+
+def test_writes_are_never_explained():
+    """EXPLAIN ANALYZE would execute an INSERT, UPDATE or DELETE a second time."""
+    conn = make_conn()
+    assert explain_query(conn, "UPDATE tasks SET status = %s", ("done",)) is None
+    conn.cursor.assert_not_called()
+
+
+@pytest.fixture
+def pools():
+    """Patches the primary and replica pools with mocks and configures a replica."""
+    primary, replica = MagicMock(), MagicMock()
+    primary.getconn.side_effect = lambda: make_conn()
+    replica.getconn.side_effect = lambda: make_conn()
+    with patch("commonUtil.db.get_pool", return_value=primary), \
+         patch("commonUtil.db.get_replica_pool", return_value=replica), \
+         patch("commonUtil.db.config.DB_REPLICA_HOST", "replica"), \
+         patch("commonUtil.db._replica_down_until", 0.0):
+        yield primary, replica
+
+
+def test_readonly_session_uses_replica(pools):
+    primary, replica = pools
+    with get_cursor(readonly=True):
+        pass
+    replica.getconn.assert_called_once()
+    primary.getconn.assert_not_called()
+    conn = replica.putconn.call_args.args[0]
+    assert conn.readonly is not True  # read-only comes from the replica's connect options
+
+
+def test_writes_never_use_replica(pools):
+    primary, replica = pools
+    with get_cursor(autocommit=True):
+        pass
+    replica.getconn.assert_not_called()
+    primary.getconn.assert_called_once()
+
+
+def test_unreachable_replica_fails_over_to_primary(pools):
+    """The replica is skipped for DB_REPLICA_RETRY_INTERVAL after a failed connect."""
+    primary, replica = pools
+    replica.getconn.side_effect = psycopg2.OperationalError("could not connect to server")
+
+    with get_db_session(readonly=True) as conn:
+        assert conn.readonly is True  # still a read-only session, now on the primary
+    with get_cursor(readonly=True):
+        pass
+
+    assert replica.getconn.call_count == 1
+    assert primary.getconn.call_count == 2
+    assert conn.readonly is None
+
+
+def test_replica_retried_after_interval(pools):
+    primary, replica = pools
+    replica.getconn.side_effect = psycopg2.OperationalError("could not connect to server")
+    with patch("commonUtil.db.config.DB_REPLICA_RETRY_INTERVAL", 0):
+        with get_cursor(readonly=True):
+            pass
+        replica.getconn.side_effect = lambda: make_conn()
+        with get_cursor(readonly=True):
+            pass
+    assert replica.getconn.call_count == 2
+    replica.putconn.assert_called_once()
+
+
+def test_broken_replica_connection_marks_replica_down(pools):
+    primary, replica = pools
+    with pytest.raises(psycopg2.OperationalError):
+        with get_cursor(readonly=True):
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+    assert replica.putconn.call_args.kwargs == {"discard": True}
+
+    with get_cursor(readonly=True):
+        pass
+    primary.getconn.assert_called_once()
+
+
+def test_readonly_without_replica_uses_primary(pools):
+    primary, replica = pools
+    with patch("commonUtil.db.config.DB_REPLICA_HOST", None):
+        with get_cursor(readonly=True):
+            pass
+    replica.getconn.assert_not_called()
+    primary.getconn.assert_called_once()
+
+
+@pytest.fixture
+def prepared_cursor():
+    """A cursor on a pooled connection that has not prepared anything yet."""
+    cursor = MagicMock()
+    cursor.connection = MagicMock(spec=PreparingConnection)
+    cursor.connection.prepared = set()
+    return cursor
+
+
+def test_statement_prepared_once_per_connection(prepared_cursor):
+    sql = "SELECT * FROM tasks WHERE user_id = %s AND due_date < %s LIMIT %s"
+    execute_prepared(prepared_cursor, sql, ("u", "2030-01-01", 10))
+    execute_prepared(prepared_cursor, sql, ("v", "2031-01-01", 20))
+
+    statements = [call.args for call in prepared_cursor.execute.call_args_list]
+    name = statements[0][0].split()[1]
+    assert statements == [
+        (f"PREPARE {name} AS SELECT * FROM tasks WHERE user_id = $1 AND due_date < $2 LIMIT $3",),
+        (f"EXECUTE {name} (%s, %s, %s)", ("u", "2030-01-01", 10)),
+        (f"EXECUTE {name} (%s, %s, %s)", ("v", "2031-01-01", 20)),
+    ]
+    assert statement_sql(statements[1][0]) == sql
+
+
+def test_prepared_statements_can_be_disabled(prepared_cursor):
+    """Behind a transaction-mode pooler statements run unprepared."""
+    with patch("commonUtil.db.config.DB_PREPARED_STATEMENTS", False):
+        execute_prepared(prepared_cursor, "SELECT 1 WHERE %s", (True,))
+    prepared_cursor.execute.assert_called_once_with("SELECT 1 WHERE %s", (True,))
+
+
+def test_unpooled_connection_runs_plain_statement():
+    cursor = MagicMock()
+    execute_prepared(cursor, "SELECT %s", (1,))
+    cursor.execute.assert_called_once_with("SELECT %s", (1,))
+
+
+class StatementNotPrepared(psycopg2.Error):
+    pgcode = "26000"
+
+
+def test_lost_prepared_statements_are_prepared_again(prepared_cursor):
+    prepared_cursor.execute.side_effect = [None, None, StatementNotPrepared("prepared statement does not exist")]
+    execute_prepared(prepared_cursor, "SELECT %s", (1,))
+    prepared_cursor.connection.prepared.add("ps_other")
+    with pytest.raises(psycopg2.Error):
+        execute_prepared(prepared_cursor, "SELECT %s", (2,))
+    assert prepared_cursor.connection.prepared == set()
+
+    prepared_cursor.execute.side_effect = None
+    execute_prepared(prepared_cursor, "SELECT %s", (3,))
+    assert prepared_cursor.execute.call_args_list[-2].args[0].startswith("PREPARE ")
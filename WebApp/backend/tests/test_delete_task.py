@@ -0,0 +1,61 @@
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+from handlers.tasks.delete_task import lambda_handler
+from commonUtil.constants.http_status import http_status
+from commonUtil.constants.error_messages import error_messages
+from tests.conftest import TEST_USER_ID
+
+TASK_ID = "00000000-0000-0000-0000-000000000001"
+
+
+@pytest.fixture
+def delete_event(auth_headers):
+    """Returns an authenticated DELETE /tasks/{task_id} event."""
+    return {"headers": auth_headers, "pathParameters": {"task_id": TASK_ID}}
+
+
+@pytest.fixture
+def mock_cursor():
+    """Patches get_cursor in the handler and returns the mocked cursor."""
+    with patch("handlers.tasks.delete_task.get_cursor") as mock_get_cursor:
+        cursor = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = cursor
+        yield cursor
+
+
+def test_delete_task_single_statement(delete_event, mock_cursor):
+    """Deleting a task is one DELETE scoped by task_id and user_id."""
+    mock_cursor.fetchone.return_value = (TASK_ID,)
+
+    response = lambda_handler(delete_event, None)
+
+    assert response["statusCode"] == http_status.OK
+    assert json.loads(response["body"]) == {"message": "Task deleted successfully."}
+    assert mock_cursor.execute.call_count == 1
+    query, params = mock_cursor.execute.call_args[0]
+    assert "DELETE FROM tasks WHERE task_id = %s AND user_id = %s RETURNING task_id" == query
+    assert params == (TASK_ID, TEST_USER_ID)
+
+
+def test_delete_task_not_found(delete_event, mock_cursor):
+    """Deleting a missing or foreign task maps to 404."""
+    mock_cursor.fetchone.return_value = None
+
+    response = lambda_handler(delete_event, None)
+
+    assert response["statusCode"] == http_status.NOT_FOUND
+    assert json.loads(response["body"]) == {"error": error_messages.TASK_NOT_FOUND}
+    assert mock_cursor.execute.call_count == 1
+
+
+def test_delete_task_if_match_stale(delete_event, mock_cursor):
+    """A stale If-Match is rejected with 412 and nothing is deleted."""
+    delete_event["headers"]["If-Match"] = '"tasks.2"'
+    mock_cursor.fetchone.return_value = (3,)
+
+    response = lambda_handler(delete_event, None)
+
+    assert response["statusCode"] == http_status.PRECONDITION_FAILED
+    assert json.loads(response["body"]) == {"error": error_messages.TASKS_MODIFIED}
+    assert mock_cursor.execute.call_count == 1
@@ -0,0 +1,223 @@
+import csv
+import io
+import json
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from handlers.tasks.export_tasks import lambda_handler
+from commonUtil.config import config
+from commonUtil.s3 import clear_presigned_url_cache
+from commonUtil.constants.http_status import http_status
+from commonUtil.constants.error_messages import error_messages
+from tests.conftest import TEST_USER_ID
+
+FIELDS = ["task_id", "description", "due_date", "status", "created_at"]
+
+
+def make_row(i):
+    return (
+        uuid.UUID(int=i), f'Task {i}, "quoted"', date(2030, 1, 1 + i % 28), "pending", datetime(2024, 1, 1, 12, 0, i % 60),
+    )
+
+
+class LocalS3Client:
+    """
+    An S3 stand-in holding objects in memory. Multipart uploads are
+    assembled on completion; with keep=False part bodies are only counted,
+    so the client itself does not grow with the export.
+    """
+
+    def __init__(self, keep=True):
+        self.keep = keep
+        self.objects = {}
+        self.uploads = {}
+        self.part_sizes = []
+        self.aborted = []
+
+    def put_object(self, Bucket, Key, Body, ContentType, **kwargs):
+        self.objects[Key] = {"Body": Body.read(), "ContentType": ContentType, **kwargs}
+        return {}
+
+    def create_multipart_upload(self, Bucket, Key, ContentType, **kwargs):
+        upload_id = f"upload-{len(self.uploads) + 1}"
+        self.uploads[upload_id] = {"ContentType": ContentType, "parts": {}, **kwargs}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        body = Body.read()
+        self.part_sizes.append(len(body))
+        self.uploads[UploadId]["parts"][PartNumber] = body if self.keep else b""
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        upload = self.uploads.pop(UploadId)
+        parts = upload.pop("parts")
+        body = b"".join(parts[part["PartNumber"]] for part in MultipartUpload["Parts"])
+        self.objects[Key] = {"Body": body, **upload}
+        return {}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.aborted.append(UploadId)
+        self.uploads.pop(UploadId)
+        return {}
+
+    def generate_presigned_url(self, method, Params, ExpiresIn):
+        return f"https://s3.local/{Params['Bucket']}/{Params['Key']}?expires={ExpiresIn}"
+
+
+class NamedCursor:
+    """A server-side cursor stand-in producing rows lazily, like psycopg2 does itersize at a time."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.itersize = None
+        self.executed = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+@pytest.fixture
+def s3():
+    client = LocalS3Client()
+    clear_presigned_url_cache()
+    with patch("commonUtil.s3.get_s3_client", return_value=client), \
+         patch("commonUtil.s3.config.S3_BUCKET_NAME", "bucket"):
+        yield client
+    clear_presigned_url_cache()
+
+
+@contextmanager
+def database(rows):
+    """Patches the handler's session so its named cursor yields ``rows``."""
+    cursor = NamedCursor(rows)
+    connection = MagicMock()
+    connection.cursor.return_value = cursor
+    with patch("handlers.tasks.export_tasks.get_db_session") as mock_session:
+        mock_session.return_value.__enter__.return_value = connection
+        yield connection, cursor
+
+
+def export(auth_headers, export_format=None):
+    query = {"format": export_format} if export_format else None
+    return lambda_handler({"headers": auth_headers, "queryStringParameters": query}, None)
+
+
+def test_ndjson_export(auth_headers, s3):
+    """Each task is one JSON line in the uploaded object, and the response links to it."""
+    with database([make_row(i) for i in range(3)]) as (connection, cursor):
+        response = export(auth_headers)
+
+    assert response["statusCode"] == http_status.OK
+    body = json.loads(response["body"])
+    key = body["url"].split("/bucket/")[1].split("?")[0]
+    stored = s3.objects[key]
+    lines = [json.loads(line) for line in stored["Body"].decode().splitlines()]
+    assert [line["task_id"] for line in lines] == [str(uuid.UUID(int=i)) for i in range(3)]
+    assert lines[0] == {
+        "task_id": str(uuid.UUID(int=0)), "description": 'Task 0, "quoted"',
+        "due_date": "2030-01-01", "status": "pending", "created_at": "2024-01-01T12:00:00",
+    }
+    assert stored["ContentType"] == "application/x-ndjson"
+    assert stored["ContentDisposition"].startswith('attachment; filename="tasks-')
+    assert key.startswith(f"task_exports/{TEST_USER_ID}/") and key.endswith(".ndjson")
+    assert (body["format"], body["tasks"], body["bytes"]) == ("ndjson", 3, len(stored["Body"]))
+    # A server-side cursor with a fixed fetch size, scoped to the user
+    connection.cursor.assert_called_once_with(name="task_export")
+    assert cursor.itersize == config.EXPORT_ITERSIZE
+    assert cursor.executed[0][1] == (TEST_USER_ID,)
+
+
+def test_csv_export(auth_headers, s3):
+    """CSV has a header row and quotes descriptions with commas and quotes."""
+    with database([make_row(i) for i in range(2)]):
+        response = export(auth_headers, "csv")
+
+    body = json.loads(response["body"])
+    stored = next(iter(s3.objects.values()))
+    rows = list(csv.reader(io.StringIO(stored["Body"].decode())))
+    assert rows[0] == FIELDS
+    assert rows[1] == [str(uuid.UUID(int=0)), 'Task 0, "quoted"', "2030-01-01", "pending", "2024-01-01T12:00:00"]
+    assert len(rows) == 3
+    assert stored["ContentType"] == "text/csv"
+    assert body["tasks"] == 2
+
+
+def test_empty_csv_export_has_header(auth_headers, s3):
+    with database([]):
+        response = export(auth_headers, "csv")
+
+    assert response["statusCode"] == http_status.OK
+    assert next(iter(s3.objects.values()))["Body"].decode().strip() == ",".join(FIELDS)
+    assert json.loads(response["body"])["tasks"] == 0
+
+
+def test_invalid_format(auth_headers, s3):
+    with patch("handlers.tasks.export_tasks.get_db_session") as mock_session:
+        response = export(auth_headers, "xml")
+
+    assert response["statusCode"] == http_status.BAD_REQUEST
+    assert json.loads(response["body"])["error"] == error_messages.INVALID_EXPORT_FORMAT
+    mock_session.assert_not_called()
+
+
+def test_large_export_streams_in_parts(auth_headers, s3):
+    """An export larger than one part goes up as a multipart upload of bounded parts."""
+    with patch("commonUtil.s3.config.S3_MULTIPART_PART_SIZE", 64 * 1024), database(make_row(i) for i in range(5000)):
+        response = export(auth_headers)
+
+    assert json.loads(response["body"])["tasks"] == 5000
+    stored = next(iter(s3.objects.values()))
+    assert len(stored["Body"].splitlines()) == 5000
+    assert len(s3.part_sizes) > 1
+    # A part is flushed as soon as it reaches the part size, so it overshoots by at most one encoded batch
+    assert max(s3.part_sizes) < 64 * 1024 * 2
+
+
+def test_failed_export_aborts_upload(auth_headers, s3):
+    """A database error mid-stream aborts the multipart upload and leaves no object."""
+    def rows():
+        for i in range(3000):
+            yield make_row(i)
+        raise RuntimeError("connection lost")
+
+    with patch("commonUtil.s3.config.S3_MULTIPART_PART_SIZE", 16 * 1024), database(rows()):
+        response = export(auth_headers)
+
+    assert response["statusCode"] == http_status.INTERNAL_SERVER_ERROR
+    assert json.loads(response["body"])["error"] == error_messages.EXPORT_FAILED
+    assert s3.aborted and not s3.objects
+
+
+def peak_export_memory(auth_headers, count):
+    s3 = LocalS3Client(keep=False)
+    with patch("commonUtil.s3.get_s3_client", return_value=s3), \
+         patch("commonUtil.s3.config.S3_BUCKET_NAME", "bucket"), \
+         patch("commonUtil.s3.config.S3_MULTIPART_PART_SIZE", 64 * 1024), \
+         database(make_row(i) for i in range(count)):
+        tracemalloc.start()
+        response = export(auth_headers)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    assert json.loads(response["body"])["tasks"] == count
+    return peak
+
+
+def test_peak_memory_does_not_grow_with_rows(auth_headers):
+    """Ten times the tasks, about the same peak: nothing holds the whole export."""
+    small = peak_export_memory(auth_headers, 2000)
+    large = peak_export_memory(auth_headers, 20000)
+    assert large < small * 1.5
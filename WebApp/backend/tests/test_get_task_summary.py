@@ -0,0 +1,62 @@
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+from handlers.tasks.get_task_summary import lambda_handler
+from commonUtil.constants.http_status import http_status
+
+
+@pytest.fixture
+def make_event(auth_headers):
+    """Returns a factory for authenticated GET /tasks/summary events."""
+    def _make_event(headers=None):
+        return {"headers": {**auth_headers, **(headers or {})}, "queryStringParameters": None}
+    return _make_event
+
+
+@pytest.fixture
+def mock_cursor():
+    cursor = MagicMock()
+    with patch("handlers.tasks.get_task_summary.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__.return_value = cursor
+        yield cursor
+
+
+def test_summary_read_from_summary_row(mock_cursor, make_event):
+    """The counts come from one primary key lookup of the summary row, never from tasks."""
+    mock_cursor.fetchone.side_effect = [(7,), (4, 1, 10, 2)]
+
+    response = lambda_handler(make_event(), None)
+
+    assert response["statusCode"] == http_status.OK
+    assert json.loads(response["body"]) == {"summary": {
+        "pending": 4, "in_progress": 1, "completed": 10, "overdue": 2, "total": 17,
+    }}
+    queries = [call[0][0] for call in mock_cursor.execute.call_args_list]
+    assert "user_task_summaries WHERE user_id = %s" in queries[-1]
+    assert not any("FROM tasks" in query for query in queries)
+
+
+def test_user_without_tasks_has_zero_counts(mock_cursor, make_event):
+    mock_cursor.fetchone.side_effect = [None, None]
+
+    body = json.loads(lambda_handler(make_event(), None)["body"])
+
+    assert body["summary"] == {"pending": 0, "in_progress": 0, "completed": 0, "overdue": 0, "total": 0}
+
+
+def test_etag_revalidation(mock_cursor, make_event):
+    """A matching If-None-Match gets a 304 after the version lookup alone."""
+    mock_cursor.fetchone.side_effect = [(7,), (4, 1, 10, 2)]
+    etag = lambda_handler(make_event(), None)["headers"]["ETag"]
+    mock_cursor.reset_mock()
+
+    mock_cursor.fetchone.side_effect = [(7,)]
+    response = lambda_handler(make_event({"If-None-Match": etag}), None)
+
+    assert response["statusCode"] == http_status.NOT_MODIFIED
+    assert mock_cursor.execute.call_count == 1
+
+
+def test_missing_token_rejected():
+    response = lambda_handler({"headers": {}}, None)
+    assert response["statusCode"] == http_status.UNAUTHORIZED
@@ -0,0 +1,190 @@
+import json
+import pytest
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+from handlers.tasks.get_tasks import lambda_handler
+from commonUtil.constants.http_status import http_status
+from commonUtil.constants.error_messages import error_messages
+from commonUtil.pagination import encode_cursor, decode_cursor, encode_rank_cursor, decode_rank_cursor
+from commonUtil.task_repository import TaskRepository
+
+from tests.conftest import TEST_USER_ID as USER_ID
+
+
+@pytest.fixture
+def make_event(auth_headers):
+    """Returns a factory for authenticated GET /tasks events."""
+    def _make_event(params=None):
+        return {"headers": auth_headers, "queryStringParameters": params}
+    return _make_event
+
+
+def make_row(index):
+    """Returns a task row as fetched by the handler query."""
+    return (
+        f"00000000-0000-0000-0000-{index:012d}",
+        f"Task {index}",
+        date(2030, 1, 1),
+        "pending",
+        datetime(2024, 1, 1, 12, 0, index),
+    )
+
+
+@pytest.fixture
+def mock_cursor():
+    """Patches get_cursor and JWT validation, returning the mocked cursor."""
+    cursor = MagicMock()
+    cursor.fetchone.return_value = (3,)  # tasks version
+    with patch("handlers.tasks.get_tasks.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__.return_value = cursor
+        yield cursor
+
+
+def test_first_page_returns_next_cursor(mock_cursor, make_event):
+    """A full page returns next_cursor pointing at its last row."""
+    mock_cursor.fetchall.return_value = [make_row(i) for i in range(3)]
+
+    response = lambda_handler(make_event({"limit": "2"}), None)
+
+    assert response["statusCode"] == http_status.OK
+    body = json.loads(response["body"])
+    assert [task["task_id"] for task in body["tasks"]] == [make_row(0)[0], make_row(1)[0]]
+    assert decode_cursor(body["next_cursor"]) == (make_row(1)[4], make_row(1)[0])
+    query, params = mock_cursor.execute.call_args[0]
+    assert "LIMIT %s" in query
+    assert params[-1] == 3
+
+
+def test_last_page_has_no_next_cursor(mock_cursor, make_event):
+    """A short page means there is nothing left to fetch."""
+    mock_cursor.fetchall.return_value = [make_row(0)]
+
+    response = lambda_handler(make_event(), None)
+
+    assert json.loads(response["body"])["next_cursor"] is None
+
+
+def test_cursor_and_filters_pushed_into_sql(mock_cursor, make_event):
+    """Filters and the keyset position become WHERE clauses, not client-side filtering."""
+    mock_cursor.fetchall.return_value = []
+    cursor = encode_cursor(make_row(5)[4], make_row(5)[0])
+
+    lambda_handler(make_event({
+        "cursor": cursor,
+        "status": "pending",
+        "due_before": "2031-01-01",
+        "due_after": "2029-01-01",
+    }), None)
+
+    query, params = mock_cursor.execute.call_args[0]
+    assert "status = %s" in query
+    assert "due_date < %s" in query
+    assert "due_date > %s" in query
+    assert "(created_at, task_id) > (%s, %s)" in query
+    assert "OFFSET" not in query
+    assert params[:4] == [USER_ID, "pending", "2031-01-01", "2029-01-01"]
+
+
+@pytest.mark.parametrize("params, expected_error", [
+    ({"cursor": "not-a-cursor"}, error_messages.INVALID_CURSOR),
+    ({"limit": "0"}, error_messages.INVALID_PAGE_LIMIT),
+    ({"limit": "abc"}, error_messages.INVALID_PAGE_LIMIT),
+    ({"status": "unknown"}, error_messages.INVALID_TASK_STATUS),
+    ({"due_before": "01-01-2030"}, error_messages.INVALID_DATE_FORMAT),
+    ({"q": ""}, error_messages.INVALID_SEARCH_QUERY),
+    ({"q": "&|!:*"}, error_messages.INVALID_SEARCH_QUERY),
+    ({"q": "a" * 101}, error_messages.INVALID_SEARCH_QUERY),
+    ({"q": "report", "cursor": encode_cursor(datetime(2024, 1, 1), make_row(1)[0])}, error_messages.INVALID_CURSOR),
+])
+def test_invalid_parameters(mock_cursor, make_event, params, expected_error):
+    """Malformed query parameters are rejected before touching the database."""
+    response = lambda_handler(make_event(params), None)
+
+    assert response["statusCode"] == http_status.BAD_REQUEST
+    assert json.loads(response["body"]) == {"error": expected_error}
+    mock_cursor.execute.assert_not_called()
+
+
+def test_search_ranks_and_paginates(mock_cursor, make_event):
+    """?q= runs the ranked search; a full page returns a rank cursor and every task its rank."""
+    mock_cursor.fetchall.return_value = [make_row(i) + (0.5 - i / 10,) for i in range(3)]
+
+    response = lambda_handler(make_event({"q": "weekly Rep", "limit": "2", "status": "pending"}), None)
+
+    assert response["statusCode"] == http_status.OK
+    body = json.loads(response["body"])
+    assert [task["rank"] for task in body["tasks"]] == [0.5, 0.4]
+    assert decode_rank_cursor(body["next_cursor"]) == (0.4, make_row(1)[0])
+    query, params = mock_cursor.execute.call_args[0]
+    assert "search_vector @@ query" in query
+    assert "ORDER BY rank DESC, task_id" in query
+    assert params == ["weekly:* & rep:*", USER_ID, "pending", 3]
+
+
+def test_search_cursor_pushed_into_sql(mock_cursor, make_event):
+    mock_cursor.fetchall.return_value = []
+
+    lambda_handler(make_event({"q": "report", "cursor": encode_rank_cursor(0.25, make_row(5)[0])}), None)
+
+    query, params = mock_cursor.execute.call_args[0]
+    assert "rank < %s::real OR (rank = %s::real AND task_id > %s)" in query
+    assert params[2:5] == [0.25, 0.25, make_row(5)[0]]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("report", "report:*"),
+    ("Weekly  report!", "weekly:* & report:*"),
+    ("a&b | !c:*", "a:* & b:* & c:*"),
+    ("café_menu", "café:* & menu:*"),
+])
+def test_prefix_query_keeps_only_words(text, expected):
+    """Search text becomes prefix terms; tsquery operators in it are dropped."""
+    assert TaskRepository.prefix_query(text) == expected
+
+
+def test_etag_revalidation(mock_cursor, make_event):
+    """A matching If-None-Match gets a 304 after the version lookup alone."""
+    mock_cursor.fetchall.return_value = [make_row(0)]
+    etag = lambda_handler(make_event({"limit": "2"}), None)["headers"]["ETag"]
+    mock_cursor.reset_mock()
+
+    event = make_event({"limit": "2"})
+    event["headers"] = {**event["headers"], "If-None-Match": etag}
+    response = lambda_handler(event, None)
+
+    assert response["statusCode"] == http_status.NOT_MODIFIED
+    assert response["body"] == ""
+    assert mock_cursor.execute.call_count == 1
+    assert "user_data_versions" in mock_cursor.execute.call_args[0][0]
+    mock_cursor.fetchall.assert_not_called()
+
+
+def test_etag_changes_with_version_and_params(mock_cursor, make_event):
+    """Other filters, or any write to the user's tasks, produce a new ETag."""
+    mock_cursor.fetchall.return_value = []
+    etag = lambda_handler(make_event(), None)["headers"]["ETag"]
+
+    assert lambda_handler(make_event({"status": "pending"}), None)["headers"]["ETag"] != etag
+    mock_cursor.fetchone.return_value = (4,)
+    assert lambda_handler(make_event(), None)["headers"]["ETag"] != etag
+
+
+def test_missing_token_rejected():
+    """Requests without a token never reach the database."""
+    response = lambda_handler({"headers": {}}, None)
+
+    assert response["statusCode"] == http_status.UNAUTHORIZED
+    assert json.loads(response["body"]) == {"error": error_messages.MISSING_AUTH_TOKEN}
+
+
+def test_reads_from_replica_unless_strong_consistency_requested(auth_headers):
+    """Reads go to the replica; "X-Consistency: strong" sends them to the primary."""
+    cursor = MagicMock()
+    cursor.fetchone.return_value = (3,)
+    cursor.fetchall.return_value = []
+    with patch("handlers.tasks.get_tasks.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__.return_value = cursor
+        lambda_handler({"headers": auth_headers, "queryStringParameters": None}, None)
+        lambda_handler({"headers": {**auth_headers, "x-consistency": "strong"}, "queryStringParameters": None}, None)
+
+    assert [call.kwargs for call in mock_get_cursor.call_args_list] == [{"readonly": True}, {"readonly": False}]
@@ -0,0 +1,169 @@
+import io
+import base64
+import threading
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+from handlers.auth.get_user_profile import lambda_handler
+from commonUtil.constants.http_status import http_status
+from commonUtil.constants.error_messages import error_messages
+from commonUtil.s3 import clear_presigned_url_cache
+from tests.conftest import TEST_USER_ID
+
+PROFILE_ROW = ("test_user@example.com", "test_user", "https://bucket.s3.amazonaws.com/profile_images/x.jpg")
+
+
+@pytest.fixture
+def make_event(auth_headers):
+    """Returns a factory for authenticated GET /user/profile events."""
+    def _make_event(params=None):
+        return {"headers": auth_headers, "queryStringParameters": params}
+    return _make_event
+
+
+@pytest.fixture
+def mock_s3():
+    """Patches the shared S3 client and the profile query."""
+    clear_presigned_url_cache()
+    s3_client = MagicMock()
+    s3_client.generate_presigned_url.side_effect = lambda *args, **kwargs: f"https://signed/{kwargs['Params']['Key']}"
+    s3_client.get_object.return_value = {"Body": io.BytesIO(b"jpeg-bytes")}
+    with patch("commonUtil.s3.get_s3_client", return_value=s3_client), \
+         patch("handlers.auth.get_user_profile.get_s3_client", return_value=s3_client), \
+         patch("handlers.auth.get_user_profile.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__.return_value.fetchone.return_value = PROFILE_ROW
+        yield s3_client
+    clear_presigned_url_cache()
+
+
+def test_profile_returns_presigned_url(make_event, mock_s3):
+    """By default the image is a presigned URL and S3 is never read."""
+    response = lambda_handler(make_event(), None)
+
+    assert response["statusCode"] == http_status.OK
+    body = json.loads(response["body"])
+    assert body["profile_image_url"] == f"https://signed/profile_images/{TEST_USER_ID}.jpg"
+    mock_s3.get_object.assert_not_called()
+
+
+def test_presigned_url_reused_across_requests(make_event, mock_s3):
+    """A warm container reuses the presigned URL until shortly before it expires."""
+    lambda_handler(make_event(), None)
+    lambda_handler(make_event(), None)
+
+    assert mock_s3.generate_presigned_url.call_count == 1
+
+
+def test_inline_mode_is_opt_in(make_event, mock_s3):
+    """image_mode=inline keeps the base64 data URL behaviour."""
+    response = lambda_handler(make_event({"image_mode": "inline"}), None)
+
+    body = json.loads(response["body"])
+    assert body["profile_image_url"] == "data:image/jpeg;base64,anBlZy1ieXRlcw=="
+    mock_s3.generate_presigned_url.assert_not_called()
+
+
+def test_invalid_image_mode(make_event, mock_s3):
+    response = lambda_handler(make_event({"image_mode": "thumbnail"}), None)
+
+    assert response["statusCode"] == http_status.BAD_REQUEST
+    assert json.loads(response["body"]) == {"error": error_messages.INVALID_IMAGE_MODE}
+
+
+def test_smallest_suitable_thumbnail_returned(make_event, mock_s3):
+    """Profiles with thumbnails get the smallest one at least image_size wide."""
+    record = '{"original":"profile_images/abc/original","derivatives":{"64":"profile_images/abc/64.webp","256":"profile_images/abc/256.webp"}}'
+    with patch("handlers.auth.get_user_profile.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__.return_value.fetchone.return_value = PROFILE_ROW[:2] + (record,)
+        response = lambda_handler(make_event({"image_size": "100"}), None)
+
+    assert json.loads(response["body"])["profile_image_url"] == "https://signed/profile_images/abc/256.webp"
+
+
+def test_invalid_image_size(make_event, mock_s3):
+    response = lambda_handler(make_event({"image_size": "0"}), None)
+
+    assert response["statusCode"] == http_status.BAD_REQUEST
+    assert json.loads(response["body"]) == {"error": error_messages.INVALID_IMAGE_SIZE}
+
+
+def test_profile_not_modified(make_event, mock_s3):
+    """Revalidating with the current ETag skips the profile query and S3."""
+    with patch("handlers.auth.get_user_profile.get_cursor") as mock_get_cursor:
+        cursor = mock_get_cursor.return_value.__enter__.return_value
+        cursor.fetchone.side_effect = [(5,), PROFILE_ROW]
+        etag = lambda_handler(make_event(), None)["headers"]["ETag"]
+
+        cursor.fetchone.side_effect = [(5,)]
+        event = make_event()
+        event["headers"] = {**event["headers"], "if-none-match": etag}
+        response = lambda_handler(event, None)
+
+    assert response["statusCode"] == http_status.NOT_MODIFIED
+    assert mock_s3.generate_presigned_url.call_count == 1
+
+
+@pytest.fixture
+def image_keys():
+    with patch.dict("handlers.auth.get_user_profile._image_keys", clear=True) as keys:
+        yield keys
+
+
+def test_s3_client_built_while_profile_query_runs(make_event, mock_s3):
+    """The S3 client is requested from a worker thread before the profile query returns."""
+    client_requested = threading.Event()
+    with patch("handlers.auth.get_user_profile.get_s3_client",
+               side_effect=lambda: client_requested.set() or mock_s3), \
+         patch("handlers.auth.get_user_profile.get_cursor") as mock_get_cursor:
+        cursor = mock_get_cursor.return_value.__enter__.return_value
+        rows = iter([(5,), PROFILE_ROW])
+        cursor.fetchone.side_effect = lambda: next(rows) if client_requested.wait(5) else None
+        response = lambda_handler(make_event(), None)
+
+    assert response["statusCode"] == http_status.OK
+
+
+def test_inline_image_prefetched_from_last_key(make_event, mock_s3, image_keys):
+    """A repeat inline request reads the image it was served last time alongside the query, once."""
+    lambda_handler(make_event({"image_mode": "inline"}), None)
+    assert image_keys == {(TEST_USER_ID, "128"): f"profile_images/{TEST_USER_ID}.jpg"}
+
+    mock_s3.get_object.reset_mock()
+    mock_s3.get_object.side_effect = lambda **kwargs: {"Body": io.BytesIO(b"jpeg-bytes")}
+    response = lambda_handler(make_event({"image_mode": "inline"}), None)
+
+    assert json.loads(response["body"])["profile_image_url"] == "data:image/jpeg;base64,anBlZy1ieXRlcw=="
+    mock_s3.get_object.assert_called_once_with(Bucket=None, Key=f"profile_images/{TEST_USER_ID}.jpg")
+
+
+def test_prefetch_of_replaced_image_is_dropped(make_event, mock_s3, image_keys):
+    """When the profile now names another image, the prefetched one is discarded and the new one read."""
+    image_keys[(TEST_USER_ID, "128")] = "profile_images/old/128.webp"
+    record = '{"original":"profile_images/new/original","derivatives":{"128":"profile_images/new/128.webp"}}'
+    mock_s3.get_object.side_effect = lambda **kwargs: {"Body": io.BytesIO(kwargs["Key"].encode())}
+    with patch("handlers.auth.get_user_profile.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__.return_value.fetchone.return_value = PROFILE_ROW[:2] + (record,)
+        response = lambda_handler(make_event({"image_mode": "inline"}), None)
+
+    data_url = json.loads(response["body"])["profile_image_url"]
+    assert base64.b64decode(data_url.split(",", 1)[1]) == b"profile_images/new/128.webp"
+    assert image_keys[(TEST_USER_ID, "128")] == "profile_images/new/128.webp"
+
+
+def test_prefetch_dropped_when_user_has_no_image(make_event, mock_s3, image_keys):
+    image_keys[(TEST_USER_ID, "128")] = "profile_images/gone/128.webp"
+    with patch("handlers.auth.get_user_profile.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__.return_value.fetchone.return_value = PROFILE_ROW[:2] + (None,)
+        response = lambda_handler(make_event({"image_mode": "inline"}), None)
+
+    assert json.loads(response["body"])["profile_image_url"] is None
+
+
+def test_failed_prefetch_falls_back_to_direct_read(make_event, mock_s3, image_keys):
+    """A prefetch error (say, an image deleted since) is not the request's error."""
+    image_keys[(TEST_USER_ID, "128")] = f"profile_images/{TEST_USER_ID}.jpg"
+    mock_s3.get_object.side_effect = [Exception("NoSuchKey"), {"Body": io.BytesIO(b"jpeg-bytes")}]
+    response = lambda_handler(make_event({"image_mode": "inline"}), None)
+
+    assert response["statusCode"] == http_status.OK
+    assert mock_s3.get_object.call_count == 2
@@ -0,0 +1,99 @@
+import io
+import pytest
+from unittest.mock import patch
+from PIL import Image
+from commonUtil.images import (
+    LocalImageStore, process_profile_image, process_profile_image_stream,
+    encode_image_record, parse_image_record, select_derivative,
+)
+
+
+def make_image(size=(640, 480), color=(200, 30, 30), image_format="JPEG"):
+    output = io.BytesIO()
+    Image.new("RGB", size, color).save(output, format=image_format)
+    return output.getvalue()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalImageStore(str(tmp_path))
+
+
+def test_derivatives_generated(store):
+    """Every configured size is written as a square WebP next to the original."""
+    image_bytes = make_image()
+
+    record = process_profile_image(image_bytes, store)
+
+    assert store.get(record["original"]) == image_bytes
+    for size, key in record["derivatives"].items():
+        thumbnail = Image.open(io.BytesIO(store.get(key)))
+        assert thumbnail.format == "WEBP"
+        assert thumbnail.size == (size, size)
+
+
+def test_same_image_is_not_processed_twice(store):
+    """Objects are keyed by content hash, so a re-upload writes nothing."""
+    image_bytes = make_image()
+    first = process_profile_image(image_bytes, store)
+
+    with patch.object(store, "put") as mock_put, patch("PIL.Image.open") as mock_open:
+        second = process_profile_image(image_bytes, store)
+
+    assert second == first
+    mock_put.assert_not_called()
+    mock_open.assert_not_called()
+
+
+def test_different_images_get_different_keys(store):
+    first = process_profile_image(make_image(color=(0, 0, 0)), store)
+    second = process_profile_image(make_image(color=(255, 255, 255)), store)
+
+    assert first["original"] != second["original"]
+
+
+@pytest.mark.parametrize("image_bytes", [b"not an image", make_image(image_format="GIF")])
+def test_invalid_images_rejected(store, image_bytes):
+    """Anything Pillow cannot read, or of a type outside ALLOWED_IMAGE_TYPES, is refused."""
+    with pytest.raises(ValueError):
+        process_profile_image(image_bytes, store)
+
+
+def chunked(data, size=1000):
+    return (data[offset:offset + size] for offset in range(0, len(data), size))
+
+
+def staged(root):
+    staging = root / "profile_images" / "staging"
+    return list(staging.iterdir()) if staging.exists() else []
+
+
+def test_streamed_image_matches_processed_bytes(store, tmp_path):
+    """Streaming gives the same content-addressed record and objects, and leaves no staging object behind."""
+    image_bytes = make_image()
+
+    record = process_profile_image_stream(chunked(image_bytes), "image/jpeg", store)
+
+    assert record == process_profile_image(image_bytes, LocalImageStore(str(tmp_path / "bytes")))
+    assert store.get(record["original"]) == image_bytes
+    assert all(store.exists(key) for key in record["derivatives"].values())
+    assert staged(tmp_path) == []
+
+
+def test_streamed_invalid_image_cleans_up(store, tmp_path):
+    with pytest.raises(ValueError):
+        process_profile_image_stream(chunked(b"not an image" * 200), "image/png", store)
+
+    assert staged(tmp_path) == []
+    assert [path.name for path in (tmp_path / "profile_images").iterdir()] == ["staging"]
+
+
+def test_record_round_trip_and_selection(store):
+    record = process_profile_image(make_image(), store)
+    parsed = parse_image_record(encode_image_record(record))
+
+    assert parsed == record
+    assert select_derivative(parsed, 100) == record["derivatives"][128]
+    assert select_derivative(parsed, 64) == record["derivatives"][64]
+    assert select_derivative(parsed, 1000) == record["derivatives"][256]
+    assert parse_image_record("https://bucket.s3.amazonaws.com/profile_images/x.jpg") is None
@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+import pytest
+from benchmarks.import_time import BACKEND_DIR, handler_modules, import_time_ms, loaded_modules
+
+# Cumulative import time each handler may spend at module load, measured as
+# the fastest of a few fresh interpreters. Overridable for slow CI machines.
+IMPORT_TIME_BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", "250"))
+
+# Dependencies no handler should pay for at import; they are loaded on first use
+LAZY_MODULES = {"boto3", "botocore", "PIL", "bcrypt"}
+
+HANDLERS = handler_modules()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def compiled():
+    subprocess.run([sys.executable, "-m", "compileall", "-q", "handlers", "commonUtil"], cwd=BACKEND_DIR, check=True)
+
+
+def test_handlers_are_discovered():
+    assert "handlers.tasks.get_tasks" in HANDLERS
+    assert "handlers.auth.get_user_profile" in HANDLERS
+
+
+@pytest.mark.parametrize("module", HANDLERS)
+def test_heavy_dependencies_are_not_imported_at_load(module):
+    assert loaded_modules(module) & LAZY_MODULES == set()
+
+
+@pytest.mark.parametrize("module", HANDLERS)
+def test_import_time_within_budget(module):
+    milliseconds, _ = import_time_ms(module, repeat=3)
+    assert milliseconds <= IMPORT_TIME_BUDGET_MS, (
+        f"{module} takes {milliseconds:.0f} ms to import (budget {IMPORT_TIME_BUDGET_MS:.0f} ms); "
+        "run python -m benchmarks.import_time to see what it pulls in"
+    )
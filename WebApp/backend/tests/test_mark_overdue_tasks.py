@@ -0,0 +1,128 @@
+import psycopg2
+import pytest
+from datetime import date
+from unittest.mock import MagicMock, patch
+from handlers.tasks.mark_overdue_tasks import lambda_handler, JOB_NAME
+
+TODAY = date(2030, 6, 1)
+TASK_A = "00000000-0000-0000-0000-00000000000a"
+TASK_B = "00000000-0000-0000-0000-00000000000b"
+
+
+class LockNotAvailable(psycopg2.Error):
+    pgcode = "55P03"
+
+
+@pytest.fixture
+def mock_cursor():
+    cursor = MagicMock()
+    with patch("handlers.tasks.mark_overdue_tasks.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__.return_value = cursor
+        yield cursor
+
+
+def statements(cursor, fragment):
+    """(query, params) of every executed statement containing ``fragment``."""
+    return [call[0] for call in cursor.execute.call_args_list if fragment in call[0][0]]
+
+
+def test_sweeps_in_chunks_until_a_short_one(mock_cursor):
+    """Each chunk commits with its watermark; a chunk smaller than the chunk size ends the sweep."""
+    mock_cursor.fetchone.side_effect = [
+        None,  # no watermark yet
+        (2, date(2030, 1, 1), TASK_A),
+        (1, date(2030, 5, 1), TASK_B),
+        None,  # the retry pass finds nothing left
+    ]
+
+    result = lambda_handler({"today": "2030-06-01", "chunk_size": 2}, None)
+
+    assert result == {"marked": 3, "chunks": 3, "finished": True}
+    first, second, retry = statements(mock_cursor, "FOR UPDATE SKIP LOCKED")
+    assert "(due_date, task_id) >" not in first[0]
+    assert first[1] == (TODAY, 2)
+    assert second[1] == (TODAY, date(2030, 1, 1), TASK_A, 2)
+    assert retry[1] == (TODAY, 2)
+    saves = [params for _, params in statements(mock_cursor, "INSERT INTO job_watermarks")]
+    assert saves == [
+        (JOB_NAME, TODAY, date(2030, 1, 1), TASK_A, False),
+        (JOB_NAME, TODAY, date(2030, 5, 1), TASK_B, True),
+        (JOB_NAME, TODAY, None, None, True),
+    ]
+    # Watermark read, then one commit per chunk
+    assert mock_cursor.connection.commit.call_count == 4
+    assert len(statements(mock_cursor, "lock_timeout")) == 3
+
+
+def test_rows_skipped_as_locked_are_retried_the_same_day(mock_cursor):
+    """After reaching the end the sweep starts over once, marking rows that were locked the first time."""
+    mock_cursor.fetchone.side_effect = [
+        None,
+        (1, date(2030, 5, 1), TASK_B),  # TASK_A was locked and skipped
+        (1, date(2030, 1, 1), TASK_A),
+    ]
+
+    result = lambda_handler({"today": "2030-06-01", "chunk_size": 2}, None)
+
+    assert result == {"marked": 2, "chunks": 2, "finished": True}
+    first, retry = statements(mock_cursor, "FOR UPDATE SKIP LOCKED")
+    assert first[1] == retry[1] == (TODAY, 2)
+
+
+def test_unfinished_run_resumes_from_watermark(mock_cursor):
+    mock_cursor.fetchone.side_effect = [(TODAY, date(2030, 2, 1), TASK_A, False), None, None]
+
+    result = lambda_handler({"today": "2030-06-01"}, None)
+
+    assert result == {"marked": 0, "chunks": 2, "finished": True}
+    (_, params), _ = statements(mock_cursor, "FOR UPDATE SKIP LOCKED")
+    assert params[:3] == (TODAY, date(2030, 2, 1), TASK_A)
+    # Nothing marked: the watermark keeps its position
+    saved, _ = [params for _, params in statements(mock_cursor, "INSERT INTO job_watermarks")]
+    assert saved == (JOB_NAME, TODAY, date(2030, 2, 1), TASK_A, True)
+
+
+@pytest.mark.parametrize("watermark", [
+    (TODAY, date(2030, 2, 1), TASK_A, True),  # finished today
+    (date(2030, 5, 31), date(2030, 2, 1), TASK_A, False),  # yesterday's run
+])
+def test_new_run_starts_from_the_beginning(mock_cursor, watermark):
+    mock_cursor.fetchone.side_effect = [watermark, None, None]
+
+    lambda_handler({"today": "2030-06-01"}, None)
+
+    (query, _), _ = statements(mock_cursor, "FOR UPDATE SKIP LOCKED")
+    assert "(due_date, task_id) >" not in query
+
+
+def test_lock_timeout_stops_the_run(mock_cursor):
+    """A chunk that times out waiting for a lock is rolled back and left to the next run."""
+    def execute(query, params=None):
+        if "SKIP LOCKED" in query:
+            raise LockNotAvailable("canceling statement due to lock timeout")
+
+    mock_cursor.fetchone.side_effect = [None]
+    mock_cursor.execute.side_effect = execute
+
+    result = lambda_handler({"today": "2030-06-01"}, None)
+
+    assert result == {"marked": 0, "chunks": 0, "finished": False}
+    mock_cursor.connection.rollback.assert_called_once()
+
+
+def test_other_database_errors_raise(mock_cursor):
+    mock_cursor.fetchone.side_effect = [None, psycopg2.OperationalError("server closed the connection")]
+
+    with pytest.raises(psycopg2.OperationalError):
+        lambda_handler({"today": "2030-06-01"}, None)
+
+
+def test_stops_before_lambda_time_runs_out(mock_cursor):
+    mock_cursor.fetchone.side_effect = [None]
+    context = MagicMock(function_name="MarkOverdueTasksFunction")
+    context.get_remaining_time_in_millis.return_value = 1000
+
+    result = lambda_handler({"today": "2030-06-01"}, context)
+
+    assert result == {"marked": 0, "chunks": 0, "finished": False}
+    assert statements(mock_cursor, "SKIP LOCKED") == []
@@ -0,0 +1,178 @@
+import json
+import sys
+import pytest
+from unittest.mock import MagicMock, patch
+from commonUtil import metrics
+from commonUtil.metrics import instrument, increment, phase, record_phase
+from commonUtil.s3 import _start_call_timer, _record_call_time
+from commonUtil.constants.http_status import http_status
+
+
+@pytest.fixture
+def enabled():
+    with patch("commonUtil.metrics.config.METRICS_ENABLED", True), patch("commonUtil.metrics._cold_start", False):
+        yield
+
+
+def emitted(capsys):
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def api_event(**kwargs):
+    return {"httpMethod": "GET", "resource": "/task-management/tasks", **kwargs}
+
+
+def test_disabled_emits_nothing(capsys):
+    @instrument
+    def handler(event, context):
+        with phase("work"):
+            pass
+        return {"statusCode": http_status.OK}
+
+    with patch("commonUtil.metrics.config.METRICS_ENABLED", False):
+        assert handler(api_event(), None) == {"statusCode": http_status.OK}
+    assert capsys.readouterr().out == ""
+    assert phase("work") is metrics._NOOP
+
+
+def test_emits_one_emf_record_per_invocation(enabled, capsys):
+    @instrument
+    def handler(event, context):
+        with phase("db_query"):
+            pass
+        with phase("db_query"):
+            pass
+        record_phase("s3", 0.25)
+        return {"statusCode": http_status.CREATED}
+
+    handler(api_event(), None)
+
+    [record] = emitted(capsys)
+    assert record["Route"] == "GET /task-management/tasks"
+    assert record["Status"] == http_status.CREATED
+    assert record["ColdStart"] is False
+    assert record["s3"] == 250.0
+    assert record["db_query"] >= 0
+    directive = record["_aws"]["CloudWatchMetrics"][0]
+    assert directive["Dimensions"] == [["Route"]]
+    assert {metric["Name"] for metric in directive["Metrics"]} == {"Duration", "db_query", "s3"}
+
+
+def test_counters_are_emitted_as_counts(enabled, capsys):
+    @instrument
+    def handler(event, context):
+        increment("db_statements")
+        increment("db_statements", 2)
+        return {"statusCode": http_status.OK}
+
+    handler(api_event(), None)
+
+    [record] = emitted(capsys)
+    assert record["db_statements"] == 3
+    units = {metric["Name"]: metric["Unit"] for metric in record["_aws"]["CloudWatchMetrics"][0]["Metrics"]}
+    assert units == {"Duration": "Milliseconds", "db_statements": "Count"}
+
+
+def test_first_invocation_is_cold(capsys):
+    handler = instrument(lambda event, context: {"statusCode": http_status.OK})
+    with patch("commonUtil.metrics.config.METRICS_ENABLED", True), patch("commonUtil.metrics._cold_start", True):
+        handler(api_event(), None)
+        handler(api_event(), None)
+    assert [record["ColdStart"] for record in emitted(capsys)] == [True, False]
+
+
+def test_nested_handlers_report_once(enabled, capsys):
+    inner = instrument(lambda event, context: {"statusCode": http_status.OK})
+    outer = instrument(lambda event, context: inner(event, context))
+
+    outer(api_event(), None)
+
+    assert len(emitted(capsys)) == 1
+
+
+def test_failed_invocation_is_still_reported(enabled, capsys):
+    @instrument
+    def handler(event, context):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        handler(api_event(), None)
+    [record] = emitted(capsys)
+    assert record["Status"] is None
+    assert metrics._local.phases is None
+
+
+def test_non_api_event_uses_function_name(enabled, capsys):
+    handler = instrument(lambda event, context: {"processed": 1})
+    handler({"Records": []}, MagicMock(function_name="ProcessProfileImageFunction"))
+    assert emitted(capsys)[0]["Route"] == "ProcessProfileImageFunction"
+
+
+def test_s3_call_hooks_record_round_trip(enabled, capsys):
+    @instrument
+    def handler(event, context):
+        request_context = {}
+        _start_call_timer(context=request_context)
+        _record_call_time(context=request_context, http_response=None)
+        return {"statusCode": http_status.OK}
+
+    handler(api_event(), None)
+    assert emitted(capsys)[0]["s3"] >= 0
+
+
+def test_handler_phases(enabled, capsys, auth_headers):
+    """A GET /tasks request reports token parsing, JWT validation and serialization time."""
+    from handlers.tasks.get_tasks import lambda_handler
+
+    cursor = MagicMock()
+    cursor.fetchone.return_value = (3,)
+    cursor.fetchall.return_value = []
+    with patch("handlers.tasks.get_tasks.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__.return_value = cursor
+        response = lambda_handler(api_event(headers=auth_headers, queryStringParameters=None), None)
+
+    assert response["statusCode"] == http_status.OK
+    [record] = emitted(capsys)
+    assert {"token_parse", "jwt_validate", "serialize"} <= set(record)
+
+
+def test_worker_thread_phases_count_towards_invocation(enabled, capsys):
+    """S3 calls handed to the worker pool are reported with the invocation that submitted them."""
+    from commonUtil.concurrency import submit
+
+    @instrument
+    def handler(event, context):
+        submit(record_phase, "s3", 0.5).result()
+        return {"statusCode": http_status.OK}
+
+    handler(api_event(), None)
+    assert emitted(capsys)[0]["s3"] == 500.0
+
+
+def test_concurrent_updates_are_not_lost(enabled, capsys):
+    """Phases and counters updated from several worker threads at once all add up."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    def work():
+        for _ in range(2000):
+            record_phase("s3", 0.001)
+            increment("calls")
+
+    @instrument
+    def handler(event, context):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for future in [pool.submit(metrics.bind_invocation(work)) for _ in range(8)]:
+                future.result()
+        return {"statusCode": http_status.OK}
+
+    # Switch threads as often as possible, so unguarded read-modify-writes would interleave
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        handler(api_event(), None)
+    finally:
+        sys.setswitchinterval(interval)
+
+    record = emitted(capsys)[0]
+    assert record["calls"] == 16000
+    assert record["s3"] == pytest.approx(16000.0)
@@ -0,0 +1,138 @@
+import os
+import pytest
+from unittest.mock import MagicMock
+from migrations.runner import (
+    MigrationError, load_migrations, migrate, pending_migrations, split_statements,
+)
+
+
+def write(directory, filename, sql):
+    (directory / filename).write_text(sql)
+
+
+@pytest.fixture
+def migrations_dir(tmp_path):
+    write(tmp_path, "0002_second.sql", "-- migrate: no-transaction\nDROP INDEX CONCURRENTLY IF EXISTS i;\nCREATE INDEX CONCURRENTLY i ON t (a);\n")
+    write(tmp_path, "0001_first.sql", "ALTER TABLE t ADD COLUMN b INT;\n")
+    write(tmp_path, "README.txt", "not a migration")
+    return tmp_path
+
+
+def connection_with(applied):
+    """A mocked autocommit connection whose schema_migrations holds ``applied`` {version: checksum}."""
+    connection = MagicMock()
+    cursor = connection.cursor.return_value.__enter__.return_value
+    cursor.fetchall.return_value = list(applied.items())
+    return connection, cursor
+
+
+def executed(cursor):
+    return [call[0][0].strip() for call in cursor.execute.call_args_list]
+
+
+def test_migrations_load_in_version_order(migrations_dir):
+    first, second = load_migrations(str(migrations_dir))
+    assert (first.version, first.name, first.transactional) == (1, "first", True)
+    assert (second.version, second.name, second.transactional) == (2, "second", False)
+
+
+def test_shipped_migrations_build_indexes_online():
+    """Every shipped index is built with CREATE INDEX CONCURRENTLY, outside a transaction."""
+    migrations = load_migrations()
+    assert migrations
+    for migration in migrations:
+        if "CREATE INDEX" in migration.sql.upper() or "CREATE UNIQUE INDEX" in migration.sql.upper():
+            assert not migration.transactional
+            assert all(
+                "CONCURRENTLY" in statement
+                for statement in split_statements(migration.sql) if "INDEX" in statement.upper()
+            )
+
+
+def test_shipped_schema_changes_are_migrations():
+    """tables.sh stays the baseline; everything added after it is a migration."""
+    with open(os.path.join(os.path.dirname(__file__), "..", "tables.sh")) as f:
+        baseline = f.read()
+    assert "CREATE INDEX" not in baseline and "CREATE TRIGGER" not in baseline
+    shipped = "\n".join(migration.sql for migration in load_migrations())
+    for name in ("idx_tasks_user_created", "idx_tasks_open_due", "idx_tasks_search", "job_watermarks",
+                 "user_data_versions", "user_task_summaries"):
+        assert name in shipped
+
+
+def test_username_case_clashes_checked_before_the_unique_index():
+    migration = next(migration for migration in load_migrations() if migration.name == "users_username_lower_index")
+    check, drop, create = split_statements(migration.sql)
+    assert check.startswith("DO $$") and "GROUP BY lower(username)" in check and "RAISE EXCEPTION" in check
+    assert create.startswith("CREATE UNIQUE INDEX CONCURRENTLY")
+
+
+def test_split_statements_drops_comments():
+    sql = "-- migrate: no-transaction\n-- why\nDROP INDEX CONCURRENTLY IF EXISTS i;\nCREATE INDEX CONCURRENTLY i\n    ON t (a);\n"
+    assert split_statements(sql) == ["DROP INDEX CONCURRENTLY IF EXISTS i", "CREATE INDEX CONCURRENTLY i\n    ON t (a)"]
+
+
+def test_split_statements_keeps_do_blocks_whole():
+    sql = "-- migrate: no-transaction\nDO $$\nBEGIN\n    PERFORM 1;\n    PERFORM 2;\nEND\n$$;\nCREATE INDEX CONCURRENTLY i ON t (a);\n"
+    assert split_statements(sql) == [
+        "DO $$\nBEGIN\n    PERFORM 1;\n    PERFORM 2;\nEND\n$$", "CREATE INDEX CONCURRENTLY i ON t (a)",
+    ]
+
+
+def test_pending_migrations_applied_in_order_and_recorded(migrations_dir):
+    migrations = load_migrations(str(migrations_dir))
+    connection, cursor = connection_with({})
+
+    applied = migrate(connection, migrations, log=lambda message: None)
+
+    assert [migration.version for migration in applied] == [1, 2]
+    assert connection.autocommit is True
+    statements = executed(cursor)
+    # The transactional one is wrapped in BEGIN/COMMIT, the other runs statement by statement
+    begin = statements.index("BEGIN")
+    assert statements[begin + 1].startswith("ALTER TABLE t ADD COLUMN b INT")
+    assert statements[begin + 2].startswith("INSERT INTO schema_migrations")
+    assert statements[begin + 3] == "COMMIT"
+    assert statements[begin + 4:begin + 7] == [
+        "DROP INDEX CONCURRENTLY IF EXISTS i", "CREATE INDEX CONCURRENTLY i ON t (a)",
+        "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+    ]
+    assert statements[0] == "SELECT pg_advisory_lock(%s)"
+    assert statements[-1] == "SELECT pg_advisory_unlock(%s)"
+
+
+def test_applied_migrations_are_skipped(migrations_dir):
+    first, second = load_migrations(str(migrations_dir))
+    connection, cursor = connection_with({1: first.checksum})
+
+    assert migrate(connection, [first, second], log=lambda message: None) == [second]
+    assert not any(statement.startswith("ALTER TABLE") for statement in executed(cursor))
+
+
+def test_dry_run_applies_nothing(migrations_dir):
+    migrations = load_migrations(str(migrations_dir))
+    connection, cursor = connection_with({})
+
+    assert len(migrate(connection, migrations, dry_run=True, log=lambda message: None)) == 2
+    assert not any("schema_migrations (version" in statement for statement in executed(cursor))
+
+
+def test_edited_migration_is_rejected(migrations_dir):
+    migrations = load_migrations(str(migrations_dir))
+    with pytest.raises(MigrationError):
+        pending_migrations(migrations, {1: "checksum of an older version"})
+
+
+def test_failed_transactional_migration_rolls_back(migrations_dir):
+    first, _ = load_migrations(str(migrations_dir))
+    connection, cursor = connection_with({})
+    def execute(sql, params=None):
+        if "ALTER" in sql:
+            raise RuntimeError("boom")
+
+    cursor.execute.side_effect = execute
+
+    with pytest.raises(RuntimeError):
+        migrate(connection, [first], log=lambda message: None)
+    assert "ROLLBACK" in executed(cursor)
+    assert executed(cursor)[-1] == "SELECT pg_advisory_unlock(%s)"
@@ -0,0 +1,198 @@
+import psycopg2
+import pytest
+from datetime import date
+from unittest.mock import MagicMock
+from commonUtil.job_watermarks import JobWatermarkRepository
+from migrations.partition_tasks import (
+    COLUMNS_SQL, INDEXES_SQL, TABLE_KIND_SQL, TRIGGERS_SQL,
+    PartitionError, backfill, mirror_function_sql, partitioned_index, prepare, swap,
+)
+
+COLUMNS = ["task_id", "user_id", "description", "due_date", "status", "created_at", "updated_at"]
+TASKS_INDEXES = [
+    ("tasks_pkey", "CREATE UNIQUE INDEX tasks_pkey ON public.tasks USING btree (task_id)", True),
+    ("idx_tasks_user_created", "CREATE INDEX idx_tasks_user_created ON public.tasks USING btree (user_id, created_at, task_id)", False),
+]
+
+
+class CatalogCursor:
+    """
+    A cursor answering the catalog queries from ``kinds`` {table: relkind}
+    and ``indexes`` {table: rows}, and the backfill's job_watermarks row
+    from ``watermark``, which saves replace.
+    """
+
+    def __init__(self, kinds, indexes=None, triggers=(), chunks=(), watermark=None):
+        self.kinds = kinds
+        self.indexes = indexes or {}
+        self.triggers = list(triggers)
+        self.chunks = list(chunks)
+        self.watermark = watermark
+        self.saved = []
+        self.executed = []
+        self._result = None
+
+    def execute(self, sql, params=None):
+        self.executed.append(sql.strip())
+        if sql == TABLE_KIND_SQL:
+            kind = self.kinds.get(params[0])
+            self._result = [(kind,)] if kind else []
+        elif sql == COLUMNS_SQL:
+            self._result = [(column,) for column in COLUMNS]
+        elif sql == INDEXES_SQL:
+            self._result = self.indexes.get(params[0], [])
+        elif sql == TRIGGERS_SQL:
+            self._result = self.triggers
+        elif sql == JobWatermarkRepository.GET_WATERMARK_SQL:
+            self._result = [self.watermark] if self.watermark else []
+        elif sql == JobWatermarkRepository.SAVE_WATERMARK_SQL:
+            self.watermark = params[1:]
+            self.saved.append(params)
+        elif "WITH chunk AS" in sql:
+            chunk = self.chunks.pop(0) if self.chunks else None
+            if isinstance(chunk, Exception):
+                raise chunk
+            self._result = [chunk] if chunk else []
+        else:
+            self._result = []
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return self._result
+
+
+FINISHED = (date(2026, 1, 1), None, "id-9", True)
+
+
+def connection_with(cursor):
+    connection = MagicMock()
+    connection.cursor.return_value.__enter__.return_value = cursor
+    return connection
+
+
+def test_partitioned_index_renames_and_retargets():
+    assert partitioned_index(TASKS_INDEXES[1][1]) == (
+        "CREATE INDEX idx_tasks_user_created_partitioned ON tasks_partitioned USING btree (user_id, created_at, task_id)"
+    )
+
+
+def test_mirror_upserts_on_the_partition_key():
+    sql = mirror_function_sql(COLUMNS)
+    assert "ON CONFLICT (user_id, task_id) DO UPDATE SET description = EXCLUDED.description" in sql
+    assert "user_id = EXCLUDED.user_id" not in sql
+    assert "search_vector" not in sql
+
+
+def test_prepare_creates_partitions_indexes_and_mirror():
+    cursor = CatalogCursor({"tasks": "r"}, {"tasks": TASKS_INDEXES})
+    connection = connection_with(cursor)
+
+    assert prepare(connection, 4, log=lambda message: None)
+
+    statements = cursor.executed
+    assert any("PARTITION BY HASH (user_id)" in sql for sql in statements)
+    partitions = [sql for sql in statements if "PARTITION OF" in sql]
+    assert len(partitions) == 4
+    assert partitions[3].endswith("(MODULUS 4, REMAINDER 3)")
+    # The task_id primary key is replaced, not copied
+    assert [sql for sql in statements if sql.startswith("CREATE INDEX")] == [partitioned_index(TASKS_INDEXES[1][1])]
+    assert statements[-1].startswith("CREATE TRIGGER tasks_mirror_to_partitioned")
+    # Any earlier backfill no longer counts
+    assert cursor.watermark[1:] == (None, None, False)
+    connection.commit.assert_called_once()
+
+
+def test_prepare_refuses_a_partitioned_tasks():
+    with pytest.raises(PartitionError):
+        prepare(connection_with(CatalogCursor({"tasks": "p"})), 4)
+
+
+def test_backfill_copies_in_chunks_until_a_short_one():
+    cursor = CatalogCursor({"tasks": "r", "tasks_partitioned": "p"}, chunks=[(2, "id-2"), (1, "id-3")])
+    connection = connection_with(cursor)
+
+    assert backfill(connection, 2, log=lambda message: None) == 3
+
+    chunks = [sql for sql in cursor.executed if "WITH chunk AS" in sql]
+    assert len(chunks) == 2
+    assert "task_id >" not in chunks[0] and "task_id > %s" in chunks[1]
+    assert cursor.executed[-1] == "ANALYZE tasks_partitioned"
+    assert connection.commit.call_count == 3
+    # Each chunk commits its position; the short one marks the copy complete
+    assert [saved[3:] for saved in cursor.saved] == [("id-2", False), ("id-3", True)]
+
+
+def test_backfill_resumes_where_it_stopped():
+    cursor = CatalogCursor(
+        {"tasks": "r", "tasks_partitioned": "p"}, chunks=[(1, "id-5")], watermark=(date(2026, 1, 1), None, "id-4", False),
+    )
+
+    assert backfill(connection_with(cursor), 2, log=lambda message: None) == 1
+
+    chunk = next(sql for sql in cursor.executed if "WITH chunk AS" in sql)
+    assert "task_id > %s" in chunk
+    assert cursor.watermark[2:] == ("id-5", True)
+
+
+def test_swap_renames_under_one_lock_and_moves_triggers():
+    trigger = "CREATE TRIGGER tasks_summary_insert AFTER INSERT ON public.tasks FOR EACH STATEMENT EXECUTE FUNCTION f()"
+    cursor = CatalogCursor(
+        {"tasks": "r", "tasks_partitioned": "p"},
+        {
+            "tasks": TASKS_INDEXES,
+            "tasks_partitioned": [("tasks_pkey_partitioned", "", True), ("idx_tasks_user_created_partitioned", "", False)],
+        },
+        triggers=[("tasks_mirror_to_partitioned", ""), ("tasks_summary_insert", trigger)],
+        watermark=FINISHED,
+    )
+    connection = connection_with(cursor)
+
+    assert swap(connection, 2000, log=lambda message: None)
+
+    statements = cursor.executed
+    lock = statements.index("LOCK TABLE tasks IN ACCESS EXCLUSIVE MODE")
+    rename = statements.index("ALTER TABLE tasks_partitioned RENAME TO tasks")
+    assert lock < statements.index("DROP TRIGGER tasks_summary_insert ON tasks") < rename
+    assert rename < statements.index(trigger)
+    assert "ALTER INDEX tasks_pkey RENAME TO tasks_pkey_unpartitioned" in statements
+    assert "ALTER INDEX idx_tasks_user_created_partitioned RENAME TO idx_tasks_user_created" in statements
+    connection.commit.assert_called_once()
+
+
+def test_swap_refuses_when_an_index_was_added_after_prepare():
+    cursor = CatalogCursor(
+        {"tasks": "r", "tasks_partitioned": "p"},
+        {"tasks": TASKS_INDEXES, "tasks_partitioned": [("tasks_pkey_partitioned", "", True)]},
+        watermark=FINISHED,
+    )
+    connection = connection_with(cursor)
+
+    with pytest.raises(PartitionError):
+        swap(connection, 2000)
+    connection.rollback.assert_called_once()
+    assert not any(sql.startswith("ALTER TABLE") for sql in cursor.executed)
+
+
+def test_swap_refuses_after_partial_backfill():
+    """A backfill cut short leaves rows uncopied; swap refuses and renames nothing."""
+    cursor = CatalogCursor(
+        {"tasks": "r", "tasks_partitioned": "p"}, chunks=[(2, "id-2"), psycopg2.OperationalError("connection lost")],
+    )
+    connection = connection_with(cursor)
+    with pytest.raises(psycopg2.OperationalError):
+        backfill(connection, 2, log=lambda message: None)
+    assert cursor.watermark[2:] == ("id-2", False)
+
+    with pytest.raises(PartitionError, match="backfill"):
+        swap(connection, 2000)
+    connection.rollback.assert_called_once()
+    assert not any(sql.startswith(("ALTER TABLE", "DROP TRIGGER")) for sql in cursor.executed)
+
+
+def test_swap_refuses_without_a_backfill():
+    connection = connection_with(CatalogCursor({"tasks": "r", "tasks_partitioned": "p"}))
+
+    with pytest.raises(PartitionError, match="backfill"):
+        swap(connection, 2000)
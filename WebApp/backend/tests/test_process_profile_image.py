@@ -0,0 +1,41 @@
+import pytest
+from unittest.mock import patch
+from handlers.auth.process_profile_image import lambda_handler
+from commonUtil.images import LocalImageStore, parse_image_record
+from tests.conftest import TEST_USER_ID
+from tests.test_images import make_image
+
+
+def s3_event(key, size=1000):
+    return {"Records": [{"s3": {"bucket": {"name": "bucket"}, "object": {"key": key, "size": size}}}]}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LocalImageStore(str(tmp_path))
+    with patch("handlers.auth.process_profile_image.get_image_store", return_value=store), \
+         patch("handlers.auth.process_profile_image.get_cursor"), \
+         patch("handlers.auth.process_profile_image.ProfileRepository") as mock_repository:
+        store.saved = mock_repository.return_value.set_image_url
+        yield store
+
+
+def test_upload_processed_and_removed(store):
+    """A direct upload becomes a content-addressed image set on the user's profile."""
+    image_bytes = make_image()
+    store.put(f"profile_uploads/{TEST_USER_ID}", image_bytes, "image/jpeg")
+
+    assert lambda_handler(s3_event(f"profile_uploads/{TEST_USER_ID}"), None) == {"processed": 1, "rejected": 0}
+
+    user_id, value = store.saved.call_args[0]
+    assert user_id == TEST_USER_ID
+    assert store.get(parse_image_record(value)["original"]) == image_bytes
+    assert not store.exists(f"profile_uploads/{TEST_USER_ID}")
+
+
+def test_invalid_upload_rejected(store):
+    store.put(f"profile_uploads/{TEST_USER_ID}", b"not an image", "image/jpeg")
+
+    assert lambda_handler(s3_event(f"profile_uploads/{TEST_USER_ID}"), None) == {"processed": 0, "rejected": 1}
+    store.saved.assert_not_called()
+    assert not store.exists(f"profile_uploads/{TEST_USER_ID}")
@@ -0,0 +1,20 @@
+"""
+Handler queries against a seeded database: none may sequentially scan a
+large table (see benchmarks/check_plans.py). Skipped unless DB_HOST is set;
+expects tables.sh and every migration applied.
+"""
+import os
+import pytest
+from commonUtil.config import config
+from commonUtil.db import db_connection
+from benchmarks.check_plans import check_plans
+
+pytestmark = pytest.mark.skipif(not os.environ.get("DB_HOST"), reason="needs a database (see commands.sh)")
+
+
+def test_no_handler_query_scans_a_large_table():
+    with db_connection(config.DB_HOST, config.DB_NAME, config.DB_USER, config.DB_PASSWORD, config.DB_PORT) as connection:
+        plans, offenders = check_plans(connection, users=2000, tasks_per_user=50)
+
+    assert plans
+    assert offenders == []
@@ -0,0 +1,144 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from handlers.tasks.reconcile_task_summaries import lambda_handler
+from commonUtil.task_summary_repository import TaskSummaryRepository
+from tests.conftest import TEST_USER_ID
+
+OTHER_USER_ID = "9a0f4b7e-3c2d-4e1f-8a9b-000000000002"
+IDLE_USER_ID = "9a0f4b7e-3c2d-4e1f-8a9b-000000000003"
+
+
+class SummaryCursor:
+    """
+    Answers the reconciliation statements from in-memory summaries and task
+    counts, as (pending, in_progress, completed, overdue) tuples per user.
+    """
+
+    def __init__(self, users, stored, actual):
+        self.users = sorted(users)
+        self.stored = dict(stored)
+        self.actual = actual
+        self.connection = MagicMock()
+        self.executed = []
+        self.rowcount = 0
+        self.result = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+        if sql == TaskSummaryRepository.LIST_USERS_SQL:
+            after, limit = params
+            self.result = [(user,) for user in self.users if user > after][:limit]
+        elif sql == TaskSummaryRepository.LOCK_SUMMARY_SQL:
+            self.result = [self.stored[params[0]]] if params[0] in self.stored else []
+        elif sql == TaskSummaryRepository.ACTUAL_COUNTS_SQL:
+            self.result = [self.actual.get(params[0], (0, 0, 0, 0))]
+        elif sql == TaskSummaryRepository.INSERT_EMPTY_SUMMARY_SQL:
+            self.rowcount = 0 if params[0] in self.stored else 1
+            self.stored.setdefault(params[0], (0, 0, 0, 0))
+        elif sql == TaskSummaryRepository.SET_SUMMARY_SQL:
+            self.stored[params[-1]] = tuple(params[:-1])
+
+    def fetchone(self):
+        return self.result[0] if self.result else None
+
+    def fetchall(self):
+        return self.result
+
+    def statements(self):
+        return [sql for sql, _ in self.executed]
+
+
+@pytest.fixture
+def make_cursor():
+    with patch("handlers.tasks.reconcile_task_summaries.get_cursor") as mock_get_cursor:
+        def make(*args):
+            cursor = SummaryCursor(*args)
+            mock_get_cursor.return_value.__enter__.return_value = cursor
+            return cursor
+        yield make
+
+
+def test_drift_reported_and_corrected(make_cursor):
+    """Drifted users are reported per status and corrected; a user without a row gets one."""
+    cursor = make_cursor(
+        [TEST_USER_ID, OTHER_USER_ID, IDLE_USER_ID],
+        {TEST_USER_ID: (3, 0, 5, 1)},
+        {TEST_USER_ID: (2, 0, 5, 1), OTHER_USER_ID: (4, 0, 0, 0)},
+    )
+
+    result = lambda_handler({}, None)
+
+    assert result["drifted"] == 2
+    assert sorted(result["drift"], key=lambda entry: entry["user_id"]) == sorted([
+        {"user_id": TEST_USER_ID, "pending": {"stored": 3, "actual": 2}},
+        {"user_id": OTHER_USER_ID, "pending": {"stored": None, "actual": 4}, "in_progress": {"stored": None, "actual": 0},
+         "completed": {"stored": None, "actual": 0}, "overdue": {"stored": None, "actual": 0}},
+    ], key=lambda entry: entry["user_id"])
+    assert result["rebuilt"] == 2 and result["resume_after"] is None
+    assert cursor.stored == {TEST_USER_ID: (2, 0, 5, 1), OTHER_USER_ID: (4, 0, 0, 0)}
+    # A user with neither tasks nor a summary row is left alone
+    assert IDLE_USER_ID not in cursor.stored
+    # Row locks only, one short transaction per user (plus one per user list)
+    assert not any("LOCK TABLE" in sql for sql in cursor.statements())
+    assert cursor.connection.commit.call_count == 3 + 2
+
+
+def test_counts_taken_after_the_row_lock(make_cursor):
+    """The recount follows the FOR UPDATE, so writes serialised on the row are counted or added after."""
+    cursor = make_cursor([TEST_USER_ID], {TEST_USER_ID: (1, 0, 0, 0)}, {TEST_USER_ID: (2, 0, 0, 0)})
+
+    lambda_handler({}, None)
+
+    statements = [sql for sql in cursor.statements() if sql != TaskSummaryRepository.LIST_USERS_SQL]
+    assert statements == [
+        TaskSummaryRepository.LOCK_SUMMARY_SQL, TaskSummaryRepository.ACTUAL_COUNTS_SQL, TaskSummaryRepository.SET_SUMMARY_SQL,
+    ]
+
+
+def test_matching_summary_not_written(make_cursor):
+    cursor = make_cursor([TEST_USER_ID], {TEST_USER_ID: (1, 2, 3, 4)}, {TEST_USER_ID: (1, 2, 3, 4)})
+
+    assert lambda_handler({}, None)["drifted"] == 0
+    assert TaskSummaryRepository.SET_SUMMARY_SQL not in cursor.statements()
+
+
+def test_dry_run_only_reports(make_cursor):
+    cursor = make_cursor(
+        [TEST_USER_ID, OTHER_USER_ID], {TEST_USER_ID: (3, 0, 0, 0)}, {TEST_USER_ID: (2, 0, 0, 0), OTHER_USER_ID: (1, 0, 0, 0)},
+    )
+
+    result = lambda_handler({"dry_run": True}, None)
+
+    assert result["drifted"] == 2 and result["rebuilt"] is None
+    assert not any(sql.startswith(("INSERT", "UPDATE")) for sql in cursor.statements())
+    assert cursor.stored == {TEST_USER_ID: (3, 0, 0, 0)}
+    assert cursor.connection.rollback.call_count == 2
+
+
+def test_users_listed_in_batches(make_cursor):
+    users = [f"9a0f4b7e-3c2d-4e1f-8a9b-{i:012d}" for i in range(1, 6)]
+    cursor = make_cursor(users, {}, {user: (1, 0, 0, 0) for user in users})
+
+    with patch("handlers.tasks.reconcile_task_summaries.config.SUMMARY_RECONCILE_BATCH_SIZE", 2):
+        result = lambda_handler({}, None)
+
+    assert result["drifted"] == 5
+    assert [params for sql, params in cursor.executed if sql == TaskSummaryRepository.LIST_USERS_SQL] == [
+        ("00000000-0000-0000-0000-000000000000", 2), (users[1], 2), (users[3], 2), (users[4], 2),
+    ]
+
+
+def test_stops_for_time_and_resumes(make_cursor):
+    users = [f"9a0f4b7e-3c2d-4e1f-8a9b-{i:012d}" for i in range(1, 4)]
+    make_cursor(users, {}, {user: (1, 0, 0, 0) for user in users})
+    context = MagicMock()
+    context.get_remaining_time_in_millis.side_effect = [60000, 60000, 1000]
+
+    result = lambda_handler({}, context)
+
+    assert result["drifted"] == 2 and result["resume_after"] == users[1]
+    make_cursor(users, {}, {user: (1, 0, 0, 0) for user in users})
+    assert lambda_handler({"after": result["resume_after"]}, None)["drift"] == [
+        {"user_id": users[2], "pending": {"stored": None, "actual": 1}, "in_progress": {"stored": None, "actual": 0},
+         "completed": {"stored": None, "actual": 0}, "overdue": {"stored": None, "actual": 0}},
+    ]
@@ -0,0 +1,53 @@
+"""
+Read replica routing against real databases: a primary and a streaming
+replica, as started by commands.sh. Skipped unless DB_HOST and
+DB_REPLICA_HOST are set.
+"""
+import os
+import pytest
+import psycopg2
+from unittest.mock import patch
+from commonUtil.db import get_cursor
+
+pytestmark = pytest.mark.skipif(
+    not (os.environ.get("DB_HOST") and os.environ.get("DB_REPLICA_HOST")),
+    reason="needs a primary and a read replica (see commands.sh)",
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_pools():
+    with patch("commonUtil.db._pool", None), patch("commonUtil.db._replica_pool", None), \
+         patch("commonUtil.db._replica_down_until", 0.0):
+        yield
+
+
+def server_state(cursor):
+    cursor.execute("SELECT pg_is_in_recovery(), current_setting('transaction_read_only')")
+    return cursor.fetchone()
+
+
+def test_readonly_reads_from_replica():
+    with get_cursor(readonly=True) as cursor:
+        assert server_state(cursor) == (True, "on")
+
+
+def test_writes_go_to_primary():
+    with get_cursor(autocommit=True) as cursor:
+        assert server_state(cursor) == (False, "off")
+
+
+def test_replica_rejects_writes():
+    with pytest.raises(psycopg2.Error):
+        with get_cursor(readonly=True) as cursor:
+            cursor.execute("CREATE TEMP TABLE replica_write_check (id int)")
+
+
+def test_unreachable_replica_fails_over_to_read_only_primary():
+    with patch("commonUtil.db.config.DB_REPLICA_HOST", "127.0.0.1"), \
+         patch("commonUtil.db.config.DB_REPLICA_PORT", "1"):
+        with get_cursor(readonly=True) as cursor:
+            assert server_state(cursor) == (False, "on")
+    # The primary connection goes back to the pool as a normal read-write session
+    with get_cursor() as cursor:
+        assert server_state(cursor) == (False, "off")
@@ -0,0 +1,74 @@
+import json
+import os
+import re
+import importlib
+import pytest
+from unittest.mock import MagicMock, patch
+from handlers.router import lambda_handler, resolve, ROUTES, API_PREFIX
+from commonUtil.constants.http_status import http_status
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "CloudFormation", "dev_yaml")
+
+
+def template_routes(filename):
+    """(method, resource) pairs of the Api events declared in a SAM template."""
+    with open(os.path.join(TEMPLATE_DIR, filename)) as f:
+        template = f.read()
+    return set(
+        (method, path[len(API_PREFIX):])
+        for path, method in re.findall(r"Path: (\S+)\s+Method: (\w+)", template)
+    )
+
+
+def test_routes_cover_per_function_template():
+    """The router serves every route the per-function deployment does, and the router template declares them all."""
+    assert set(ROUTES) == template_routes("template-local.yaml")
+    assert set(ROUTES) == template_routes("template-router.yaml")
+
+
+@pytest.mark.parametrize("route", sorted(ROUTES))
+def test_each_route_resolves_to_its_handler(route):
+    method, resource = route
+    module = importlib.import_module(f"handlers.{ROUTES[route]}")
+    assert resolve(method, API_PREFIX + resource) is module.lambda_handler
+
+
+def test_dispatches_to_route_handler(auth_headers):
+    """A GET /tasks event runs the get_tasks handler unchanged, path parameters and all."""
+    cursor = MagicMock()
+    cursor.fetchone.return_value = (3,)
+    cursor.fetchall.return_value = []
+    event = {
+        "httpMethod": "GET", "resource": f"{API_PREFIX}/tasks",
+        "headers": auth_headers, "queryStringParameters": None,
+    }
+    with patch("handlers.tasks.get_tasks.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__.return_value = cursor
+        response = lambda_handler(event, None)
+
+    assert response["statusCode"] == http_status.OK
+    assert json.loads(response["body"])["tasks"] == []
+
+
+def test_path_parameters_reach_handler():
+    """Routes with path parameters match on the resource template, not the concrete path."""
+    with patch("handlers.tasks.delete_task.lambda_handler", return_value={"statusCode": 200}) as mock_handler, \
+         patch.dict("handlers.router._handlers", clear=True):
+        event = {
+            "httpMethod": "DELETE", "resource": f"{API_PREFIX}/tasks/{{task_id}}",
+            "path": f"{API_PREFIX}/tasks/abc", "pathParameters": {"task_id": "abc"},
+        }
+        assert lambda_handler(event, "context") == {"statusCode": 200}
+    mock_handler.assert_called_once_with(event, "context")
+
+
+def test_unknown_resource_returns_404():
+    response = lambda_handler({"httpMethod": "GET", "resource": f"{API_PREFIX}/nope"}, None)
+    assert response["statusCode"] == http_status.NOT_FOUND
+
+
+def test_wrong_method_returns_405_with_allow_header():
+    response = lambda_handler({"httpMethod": "PATCH", "resource": f"{API_PREFIX}/tasks"}, None)
+    assert response["statusCode"] == http_status.METHOD_NOT_ALLOWED
+    assert response["headers"]["Allow"] == "GET, POST"
+    assert "Access-Control-Allow-Origin" in response["headers"]
@@ -0,0 +1,60 @@
+import json
+import uuid
+import pytest
+from datetime import date, datetime
+from unittest.mock import patch
+from commonUtil import serialization
+from commonUtil.serialization import Rows, dumps
+from commonUtil.response_helpers import DEFAULT_HEADERS, create_success_response
+
+TASK_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+ROW = (TASK_ID, "Write report", date(2030, 1, 1), "pending", datetime(2024, 1, 1, 12, 30, 0, 250000))
+EXPECTED = {
+    "task_id": str(TASK_ID),
+    "description": "Write report",
+    "due_date": "2030-01-01",
+    "status": "pending",
+    "created_at": "2024-01-01T12:30:00.250000",
+}
+FIELDS = ("task_id", "description", "due_date", "status", "created_at")
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request):
+    """Runs the test with orjson and with the stdlib fallback."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+        yield
+    else:
+        with patch.object(serialization, "orjson", None):
+            yield
+
+
+def test_native_types_encoded(backend):
+    """Dates, datetimes and UUIDs match the isoformat()/str() output handlers used to build by hand."""
+    assert json.loads(dumps(dict(zip(FIELDS, ROW)))) == EXPECTED
+
+
+def test_rows_serialize_as_objects(backend):
+    """Rows come out as one object per row, including nullable date columns."""
+    undated = ROW[:2] + (None,) + ROW[3:]
+    body = json.loads(dumps({"tasks": Rows(FIELDS, [ROW, undated]), "next_cursor": None}))
+
+    assert body == {"tasks": [EXPECTED, {**EXPECTED, "due_date": None}], "next_cursor": None}
+    assert json.loads(dumps(Rows(FIELDS, []))) == []
+
+
+def test_unknown_types_rejected(backend):
+    with pytest.raises(TypeError):
+        dumps({"value": object()})
+
+
+def test_default_headers_shared_and_read_only():
+    """Responses share one header mapping; extra headers get their own copy."""
+    assert create_success_response(200, {})["headers"] is DEFAULT_HEADERS
+    with pytest.raises(TypeError):
+        DEFAULT_HEADERS["Content-Type"] = "text/plain"
+
+    headers = create_success_response(200, {}, {"Set-Cookie": "token=x"})["headers"]
+    assert headers["Set-Cookie"] == "token=x"
+    assert "Set-Cookie" not in DEFAULT_HEADERS
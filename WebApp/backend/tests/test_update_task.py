@@ -0,0 +1,91 @@
+import json
+import pytest
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+from handlers.tasks.update_task import lambda_handler
+from commonUtil.constants.http_status import http_status
+from commonUtil.constants.error_messages import error_messages
+from tests.conftest import TEST_USER_ID
+
+TASK_ID = "00000000-0000-0000-0000-000000000001"
+TASK_ROW = (TASK_ID, "Write report", date(2030, 1, 1), "completed", datetime(2024, 1, 1))
+
+
+@pytest.fixture
+def update_event(auth_headers):
+    """Returns an authenticated PUT /tasks/{task_id} event."""
+    return {
+        "headers": auth_headers,
+        "pathParameters": {"task_id": TASK_ID},
+        "body": json.dumps({"status": "completed"}),
+    }
+
+
+@pytest.fixture
+def mock_cursor():
+    """Patches get_cursor in the handler and returns the mocked cursor."""
+    with patch("handlers.tasks.update_task.get_cursor") as mock_get_cursor:
+        cursor = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = cursor
+        yield cursor
+
+
+def test_update_task_single_statement(update_event, mock_cursor):
+    """Ownership check, update and re-read happen in one UPDATE ... RETURNING."""
+    mock_cursor.fetchone.return_value = TASK_ROW
+
+    response = lambda_handler(update_event, None)
+
+    assert response["statusCode"] == http_status.OK
+    assert json.loads(response["body"])["status"] == "completed"
+    assert mock_cursor.execute.call_count == 1
+    query, params = mock_cursor.execute.call_args[0]
+    assert "UPDATE tasks" in query and "RETURNING" in query
+    assert params[-2:] == (TASK_ID, TEST_USER_ID)
+    mock_cursor.connection.commit.assert_not_called()
+
+
+def test_update_task_not_found(update_event, mock_cursor):
+    """No row returned (missing task or another user's task) maps to 404."""
+    mock_cursor.fetchone.return_value = None
+
+    response = lambda_handler(update_event, None)
+
+    assert response["statusCode"] == http_status.NOT_FOUND
+    assert json.loads(response["body"]) == {"error": error_messages.TASK_NOT_FOUND}
+    assert mock_cursor.execute.call_count == 1
+
+
+def test_update_task_invalid_status(update_event, mock_cursor):
+    """An unknown status is rejected before any statement runs."""
+    update_event["body"] = json.dumps({"status": "unknown"})
+
+    response = lambda_handler(update_event, None)
+
+    assert response["statusCode"] == http_status.BAD_REQUEST
+    mock_cursor.execute.assert_not_called()
+
+
+def test_update_task_if_match(update_event, mock_cursor):
+    """A matching If-Match updates under the locked version and returns the next ETag."""
+    update_event["headers"]["If-Match"] = '"tasks.7.0123456789abcdef"'
+    mock_cursor.fetchone.side_effect = [(7,), TASK_ROW]
+
+    response = lambda_handler(update_event, None)
+
+    assert response["statusCode"] == http_status.OK
+    assert response["headers"]["ETag"] == '"tasks.8"'
+    assert "user_data_versions" in mock_cursor.execute.call_args_list[0][0][0]
+    mock_cursor.connection.commit.assert_called_once()
+
+
+def test_update_task_if_match_stale(update_event, mock_cursor):
+    """A stale If-Match is rejected with 412 before the task is touched."""
+    update_event["headers"]["If-Match"] = '"tasks.6"'
+    mock_cursor.fetchone.return_value = (7,)
+
+    response = lambda_handler(update_event, None)
+
+    assert response["statusCode"] == http_status.PRECONDITION_FAILED
+    assert mock_cursor.execute.call_count == 1
+    mock_cursor.connection.commit.assert_not_called()
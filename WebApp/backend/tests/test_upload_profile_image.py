@@ -0,0 +1,163 @@
+import base64
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+from handlers.auth.upload_profile_image import lambda_handler
+from commonUtil.images import LocalImageStore, parse_image_record
+from commonUtil.s3 import upload_stream, iter_base64_chunks, decoded_base64_length
+from commonUtil.constants.http_status import http_status
+from commonUtil.constants.error_messages import error_messages
+from tests.conftest import TEST_USER_ID
+from tests.test_images import make_image
+
+IMAGE_BYTES = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 4
+PNG_BYTES = make_image(image_format="PNG")
+
+
+@pytest.fixture
+def mock_s3():
+    """Patches the shared S3 client."""
+    s3_client = MagicMock()
+    s3_client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+    # Keep a copy of each part; the buffer handed to upload_part is discarded afterwards
+    s3_client.parts = []
+    s3_client.upload_part.side_effect = lambda **kwargs: (
+        s3_client.parts.append(kwargs["Body"].read()) or {"ETag": f"etag-{kwargs['PartNumber']}"}
+    )
+    with patch("commonUtil.s3.get_s3_client", return_value=s3_client), \
+         patch("commonUtil.s3.config.S3_BUCKET_NAME", "bucket"):
+        yield s3_client
+
+
+@pytest.fixture
+def image_store(tmp_path):
+    """Stores processed images on disk and records what the handler saves on the profile."""
+    store = LocalImageStore(str(tmp_path))
+    with patch("handlers.auth.upload_profile_image.get_image_store", return_value=store), \
+         patch("handlers.auth.upload_profile_image.generate_presigned_get_url", side_effect=lambda key: f"https://signed/{key}"), \
+         patch("handlers.auth.upload_profile_image.get_cursor"), \
+         patch("handlers.auth.upload_profile_image.ProfileRepository") as mock_repository:
+        mock_repository.return_value.set_image_url.return_value = True
+        store.saved = mock_repository.return_value.set_image_url
+        yield store
+
+
+def test_raw_binary_body(auth_headers, image_store):
+    """A binary image body is stored with its thumbnails and recorded on the profile."""
+    event = {
+        "headers": {**auth_headers, "content-type": "image/png"},
+        "isBase64Encoded": True,
+        "body": base64.b64encode(PNG_BYTES).decode(),
+    }
+
+    response = lambda_handler(event, None)
+
+    assert response["statusCode"] == http_status.OK
+    user_id, value = image_store.saved.call_args[0]
+    record = parse_image_record(value)
+    assert user_id == TEST_USER_ID
+    assert image_store.get(record["original"]) == PNG_BYTES
+    assert json.loads(response["body"])["profile_image_url"] == f"https://signed/{record['derivatives'][128]}"
+
+
+def test_json_data_url(auth_headers, image_store):
+    """The original JSON data URL format keeps working."""
+    image = "data:image/png;base64," + base64.b64encode(PNG_BYTES).decode()
+    event = {"headers": auth_headers, "body": json.dumps({"image": image})}
+
+    response = lambda_handler(event, None)
+
+    assert response["statusCode"] == http_status.OK
+    record = parse_image_record(image_store.saved.call_args[0][1])
+    assert image_store.get(record["original"]) == PNG_BYTES
+
+
+@pytest.mark.parametrize("image, status, expected_error", [
+    ("data:image/gif;base64,R0lGOD", http_status.UNSUPPORTED_MEDIA_TYPE, error_messages.UNSUPPORTED_IMAGE_TYPE),
+    ("not-a-data-url", http_status.BAD_REQUEST, error_messages.INVALID_IMAGE_DATA),
+    ("data:image/png;base64,!!!!", http_status.BAD_REQUEST, error_messages.INVALID_IMAGE_DATA),
+    ("data:image/png;base64,bm90IGFuIGltYWdl", http_status.BAD_REQUEST, error_messages.INVALID_IMAGE_DATA),
+])
+def test_invalid_images_rejected(auth_headers, image_store, image, status, expected_error):
+    event = {"headers": auth_headers, "body": json.dumps({"image": image})}
+
+    response = lambda_handler(event, None)
+
+    assert response["statusCode"] == status
+    assert json.loads(response["body"]) == {"error": expected_error}
+
+
+def test_oversized_image_rejected_before_decoding(auth_headers, image_store):
+    """The size limit is checked from the base64 length; nothing is decoded or sent."""
+    event = {"headers": auth_headers, "body": json.dumps({"image": "data:image/png;base64," + "A" * 4000})}
+
+    with patch("handlers.auth.upload_profile_image.config.MAX_PROFILE_IMAGE_BYTES", 1000), \
+         patch("handlers.auth.upload_profile_image.iter_base64_chunks") as mock_chunks:
+        response = lambda_handler(event, None)
+
+    assert response["statusCode"] == http_status.PAYLOAD_TOO_LARGE
+    mock_chunks.assert_not_called()
+    image_store.saved.assert_not_called()
+
+
+def test_decoded_length_matches_payload():
+    for size in range(0, 10):
+        encoded = base64.b64encode(b"x" * size).decode()
+        assert decoded_base64_length("prefix," + encoded, 7) == size
+
+
+def test_large_stream_uses_multipart(mock_s3):
+    """Payloads over one part are sent part by part, never joined into one buffer."""
+    data = base64.b64encode(IMAGE_BYTES * 8).decode()
+    with patch("commonUtil.s3.config.S3_MULTIPART_PART_SIZE", 3000):
+        size = upload_stream(iter_base64_chunks(data, 0, 1024), "key", "image/png")
+
+    assert size == len(IMAGE_BYTES) * 8
+    mock_s3.put_object.assert_not_called()
+    parts = mock_s3.parts
+    assert b"".join(parts) == IMAGE_BYTES * 8
+    assert max(len(part) for part in parts) < 3000 + 1024
+    completed = mock_s3.complete_multipart_upload.call_args.kwargs["MultipartUpload"]["Parts"]
+    assert [part["PartNumber"] for part in completed] == list(range(1, len(parts) + 1))
+
+
+def test_failed_stream_aborts_multipart(mock_s3):
+    """A decode error halfway through aborts the multipart upload."""
+    data = base64.b64encode(IMAGE_BYTES * 8).decode() + "!!!!"
+    with patch("commonUtil.s3.config.S3_MULTIPART_PART_SIZE", 3000), pytest.raises(Exception):
+        upload_stream(iter_base64_chunks(data, 0, 1024), "key", "image/png")
+
+    mock_s3.abort_multipart_upload.assert_called_once_with(Bucket="bucket", Key="key", UploadId="upload-1")
+    mock_s3.complete_multipart_upload.assert_not_called()
+
+
+def test_upload_streams_original_to_s3(auth_headers, mock_s3):
+    """The decoded original goes up part by part and is copied under its hash on S3's side."""
+    from botocore.exceptions import ClientError
+
+    mock_s3.head_object.side_effect = ClientError({"Error": {"Code": "404"}}, "HeadObject")
+    image_bytes = make_image(size=(1200, 900), image_format="PNG")
+    event = {
+        "headers": {**auth_headers, "content-type": "image/png"},
+        "isBase64Encoded": True,
+        "body": base64.b64encode(image_bytes).decode(),
+    }
+
+    with patch("commonUtil.images.get_s3_client", return_value=mock_s3), \
+         patch("commonUtil.images.config.S3_BUCKET_NAME", "bucket"), \
+         patch("commonUtil.s3.config.S3_MULTIPART_PART_SIZE", 4096), \
+         patch("handlers.auth.upload_profile_image.app_constants.BASE64_DECODE_CHUNK_SIZE", 1024), \
+         patch("handlers.auth.upload_profile_image.update_profile_image_url") as mock_update, \
+         patch("handlers.auth.upload_profile_image.generate_presigned_get_url", return_value="https://signed"):
+        response = lambda_handler(event, None)
+
+    assert response["statusCode"] == http_status.OK
+    record = mock_update.call_args[0][1]
+    assert len(mock_s3.parts) > 1 and b"".join(mock_s3.parts) == image_bytes
+    staging = mock_s3.create_multipart_upload.call_args.kwargs["Key"]
+    assert staging.startswith("profile_images/staging/")
+    copy = mock_s3.copy_object.call_args.kwargs
+    assert (copy["CopySource"]["Key"], copy["Key"], copy["ContentType"]) == (staging, record["original"], "image/png")
+    mock_s3.delete_object.assert_called_once_with(Bucket="bucket", Key=staging)
+    # Only the thumbnails are sent as whole objects
+    assert sorted(call.kwargs["Key"] for call in mock_s3.put_object.call_args_list) == sorted(record["derivatives"].values())
@@ -0,0 +1,31 @@
+import pytest
+from commonUtil.versions import make_etag, etag_version, if_none_match, if_match_versions
+
+
+def test_etag_depends_on_version_and_variant():
+    assert make_etag("tasks", 3, {"limit": "10"}) == make_etag("tasks", 3, {"limit": "10"})
+    assert make_etag("tasks", 3, {"limit": "10"}) != make_etag("tasks", 4, {"limit": "10"})
+    assert make_etag("tasks", 3, {"limit": "10"}) != make_etag("tasks", 3, {"limit": "20"})
+    assert etag_version(make_etag("tasks", 3, {"limit": "10"})) == 3
+
+
+@pytest.mark.parametrize("header, expected", [
+    ('"tasks.3"', True),
+    ('W/"tasks.3"', True),
+    ('"tasks.2", "tasks.3"', True),
+    ("*", True),
+    ('"tasks.2"', False),
+])
+def test_if_none_match(header, expected):
+    assert if_none_match({"If-None-Match": header}, '"tasks.3"') is expected
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({}, None),
+    ({"If-Match": "*"}, None),
+    ({"if-match": '"tasks.4.abc"'}, {4}),
+    ({"If-Match": '"tasks.4", "tasks.5"'}, {4, 5}),
+    ({"If-Match": '"something-else"'}, set()),
+])
+def test_if_match_versions(headers, expected):
+    assert if_match_versions(headers) == expected
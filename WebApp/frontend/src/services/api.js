@@ -109,8 +109,15 @@ export const logout = async () => {
 
 export const getTasks = async () => {
     try {
-        const response = await api.get('/tasks');
-        return response.data;
+        // The endpoint is paginated; follow next_cursor until every page is loaded
+        const tasks = [];
+        let cursor = null;
+        do {
+            const response = await api.get('/tasks', { params: cursor ? { cursor } : {} });
+            tasks.push(...(response.data.tasks || []));
+            cursor = response.data.next_cursor;
+        } while (cursor);
+        return { tasks };
     } catch (error) {
         console.error('Error fetching tasks:', error);
         if (error.response) {